@@ -0,0 +1,5 @@
+"""
+Benchmarks for the string algorithms.
+
+Run a benchmark as a module, e.g. `python -m bench.construction`.
+"""
@@ -0,0 +1,47 @@
+"""
+Benchmark suffix array and suffix tree construction.
+
+Compares SA-IS and prefix doubling with McCreight's algorithm on
+random strings and on a highly repetitive string.
+"""
+
+import sys
+import time
+from typing import Any, Callable
+
+from stralg.generators import fibonacci_string, random_string
+from stralg.suffix_array import prefix_doubling, sais
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.views import Alphabet, String
+
+ALGOS: list[tuple[str, Callable[[String], Any]]] = [
+    ("sais", sais),
+    ("doubling", prefix_doubling),
+    ("mccreight", mccreight_st_construction),
+]
+
+
+def timed(f: Callable[[String], Any], s: String) -> float:
+    """Time a single construction."""
+    start = time.perf_counter()
+    f(s)
+    return time.perf_counter() - start
+
+
+def main(sizes: list[int]) -> None:
+    """Run the benchmark for each size and print a table."""
+    print(f"{'text':>10} {'n':>10} " + " ".join(f"{name:>10}" for name, _ in ALGOS))
+    for n in sizes:
+        texts = [("dna", random_string(n, alpha="acgt"))]
+        fib = 1
+        while len(fibonacci_string(fib)) < n:
+            fib += 1
+        texts.append(("fibonacci", fibonacci_string(fib)[:n]))
+        for name, x in texts:
+            s = Alphabet.map_string(x)
+            times = " ".join(f"{timed(f, s):10.3f}" for _, f in ALGOS)
+            print(f"{name:>10} {n:>10} {times}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,184 @@
+"""
+Approximate search with a bounded number of mismatches or edits.
+
+The search is a backtracking walk through an index, one text symbol at
+a time, with a dynamic programming column per step: column entry j is
+the number of errors between the text read so far and the first j
+symbols of the pattern. Only cells within k errors matter, and those lie
+in a band of k cells around the diagonal, so we only keep those, and a
+branch is pruned when there are none left, since the column minimum
+never decreases further down. The walk is best-first on that
+minimum, so hits come out in order of increasing errors.
+
+For many patterns, the columns run over a trie of the patterns instead
+of over one pattern, so patterns with common prefixes share the cells
+for those prefixes.
+
+The walk only needs a way to extend a locus by one symbol, so the same
+search runs over suffix trees (see stralg.suffix_tree.approx) and, by
+matching reversed patterns while extending to the left, FM-indexes (see
+stralg.suffix_array.approx).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
+
+from .views import Alphabet
+
+Locus = TypeVar("Locus")
+
+# What letters that are not in the alphabet encode to. Texts are byte
+# strings and sentinel keys are at most 0, so no symbol is ever UNKNOWN.
+UNKNOWN = 256
+
+
+@dataclass
+class PatternTrie:
+    """A trie of encoded patterns in flat lists, with nodes sorted by depth."""
+
+    parent: list[int] = field(default_factory=lambda: [-1])
+    label: list[int] = field(default_factory=lambda: [-1])
+    depth: list[int] = field(default_factory=lambda: [0])
+    ends: list[list[int]] = field(default_factory=lambda: [[]])  # pattern ids
+
+
+def pattern_trie(patterns: Sequence[Sequence[int]]) -> PatternTrie:
+    """Build a trie over encoded patterns."""
+    trie = PatternTrie()
+    children: list[dict[int, int]] = [{}]
+    for pid, p in enumerate(patterns):
+        u = 0
+        for a in p:
+            if a not in children[u]:
+                children[u][a] = len(trie.parent)
+                children.append({})
+                trie.parent.append(u)
+                trie.label.append(a)
+                trie.depth.append(trie.depth[u] + 1)
+                trie.ends.append([])
+            u = children[u][a]
+        trie.ends[u].append(pid)
+    # Renumber by depth, so parents come before their children
+    order = sorted(range(len(trie.parent)), key=trie.depth.__getitem__)
+    new = {u: i for i, u in enumerate(order)}
+    return PatternTrie(
+        parent=[new[trie.parent[u]] if u else -1 for u in order],
+        label=[trie.label[u] for u in order],
+        depth=[trie.depth[u] for u in order],
+        ends=[trie.ends[u] for u in order],
+    )
+
+
+def encode_pattern(alpha: Alphabet, p: str) -> list[int]:
+    """Encode p, mapping letters not in the alphabet to UNKNOWN (never matches)."""
+    return [
+        alpha.encode(a, with_sentinel=False)[0] if a in alpha else UNKNOWN for a in p
+    ]
+
+
+def approximate_matches(
+    trie: PatternTrie,
+    k: int,
+    edits: bool,
+    root: Locus,
+    extend: Callable[[Locus], Iterable[tuple[int, Locus]]],
+) -> Iterator[tuple[int, Locus, int]]:
+    """
+    Find loci that match patterns with at most k errors.
+
+    extend(locus) gives the (symbol, locus) pairs one symbol further
+    down. Yields (pattern id, locus, errors) in order of increasing
+    errors. Occurrences below a hit can also be hits with more errors.
+    With edits, insertions and deletions count as errors, otherwise
+    only mismatches do.
+
+    Columns only hold the cells that are within k errors, keyed by trie
+    node, so a step costs time proportional to those and their children
+    rather than to the size of the trie.
+    """
+    parent, label, depth, ends = trie.parent, trie.label, trie.depth, trie.ends
+    kids: list[list[int]] = [[] for _ in parent]
+    for u in range(1, len(parent)):
+        kids[parent[u]].append(u)
+
+    # Before reading any text, only deleting pattern symbols gets us anywhere
+    first: dict[int, int] = {0: 0}
+    if edits:
+        first = {u: depth[u] for u in range(len(depth)) if depth[u] <= k}
+
+    tick = count()
+    # (bound, tiebreak, depth, locus, column); hits have depth -1
+    heap: list[tuple[int, int, int, Locus, dict[int, int] | int]] = [
+        (0, next(tick), 0, root, first)
+    ]
+    while heap:
+        bound, _, d, locus, col = heappop(heap)
+        if d < 0:
+            assert isinstance(col, int)
+            yield (col, locus, bound)
+            continue
+        assert isinstance(col, dict)
+
+        d += 1
+        for a, next_locus in extend(locus):
+            new = _step(col, a, d, k, edits, kids, label)
+            if not new:
+                continue  # no pattern can be within k errors further down
+            for u, errors in new.items():
+                if u and ends[u]:  # (the root is only the empty pattern)
+                    for pid in ends[u]:
+                        heappush(heap, (errors, next(tick), -1, next_locus, pid))
+            heappush(heap, (min(new.values()), next(tick), d, next_locus, new))
+
+
+def _step(
+    col: dict[int, int],
+    a: int,
+    d: int,
+    k: int,
+    edits: bool,
+    kids: list[list[int]],
+    label: list[int],
+) -> dict[int, int]:
+    """Get the cells within k errors after reading symbol a at text depth d."""
+    new: dict[int, int] = {}
+    if edits and d <= k:
+        new[0] = d  # the text so far against the empty prefix
+    for u, v in col.items():
+        for c in kids[u]:  # match or mismatch
+            w = v + (label[c] != a)
+            if w <= k and w < new.get(c, k + 1):
+                new[c] = w
+        if edits and v < k and v + 1 < new.get(u, k + 1):  # skip a text symbol
+            new[u] = v + 1
+    if edits:
+        # Skip pattern symbols; parents have smaller numbers than their
+        # children, so we settle nodes in order
+        queue = list(new)
+        heapify(queue)
+        while queue:
+            u = heappop(queue)
+            w = new[u] + 1
+            if w <= k:
+                for c in kids[u]:
+                    if w < new.get(c, k + 1):
+                        new[c] = w
+                        heappush(queue, c)
+    return new
+
+
+def report_hits(
+    hits: Iterator[tuple[int, Locus, int]],
+    positions: Callable[[Locus], Iterable[int]],
+) -> Iterator[tuple[int, int, int]]:
+    """Map hits to (pattern id, position, errors), each position once per pattern."""
+    seen: set[tuple[int, int]] = set()
+    for pid, locus, errors in hits:
+        for i in positions(locus):
+            if (pid, i) not in seen:
+                seen.add((pid, i))
+                yield (pid, i, errors)
@@ -0,0 +1,12 @@
+"""Test the shared parts of approximate search."""
+
+from stralg.approx_common import pattern_trie
+
+
+def test_pattern_trie() -> None:
+    """Check that shared prefixes share nodes."""
+    trie = pattern_trie([[1, 2, 3], [1, 2], [1, 3], [1, 2, 3]])
+    assert len(trie.parent) == 5
+    assert trie.depth == sorted(trie.depth)
+    assert all(trie.parent[u] < u for u in range(1, 5))
+    assert sorted(pid for ends in trie.ends for pid in ends) == [0, 1, 2, 3]
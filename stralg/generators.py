@@ -0,0 +1,19 @@
+"""
+Generating strings for tests and benchmarks.
+"""
+
+import random
+import string
+
+
+def random_string(n: int, alpha: str = string.ascii_uppercase) -> str:
+    """Create a random string."""
+    return "".join(random.choices(alpha, k=n))
+
+
+def fibonacci_string(n: int) -> str:
+    """Fibonacci string n; has length Fib(n+2)."""
+    a, b = "a", "ab"
+    for _ in range(n):
+        a, b = b, a + b
+    return b
@@ -0,0 +1,21 @@
+"""
+Suffix arrays.
+
+Construction algorithms for suffix arrays over mapped strings. Arrays
+are returned as compact `array.array` integer arrays.
+"""
+
+from .doubling import prefix_doubling as prefix_doubling
+from .external import external_suffix_array as external_suffix_array
+from .fm_index import FMIndex as FMIndex
+from .fm_index import fm_index as fm_index
+from .lcp import LcpInterval as LcpInterval
+from .lcp import inverse_sa as inverse_sa
+from .lcp import lcp_array as lcp_array
+from .lcp import lcp_intervals as lcp_intervals
+from .parallel import parallel_suffix_array as parallel_suffix_array
+from .sais import sais as sais
+from .search import SuffixArrayIndex as SuffixArrayIndex
+from .search import suffix_array_index as suffix_array_index
+from .sparse import sparse_suffix_array as sparse_suffix_array
+from .sparse import sparse_suffix_array_index as sparse_suffix_array_index
@@ -0,0 +1,57 @@
+"""
+Approximate search in FM-indexes.
+
+Backward search extends a locus one symbol to the left, so we run the
+search in stralg.approx_common over reversed patterns; the number of
+errors is the same for a string and its reversal.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+
+from ..approx_common import (
+    approximate_matches,
+    encode_pattern,
+    pattern_trie,
+    report_hits,
+)
+from .fm_index import FMIndex
+
+
+def fm_approximate_search_many(
+    index: FMIndex, patterns: Sequence[str], k: int, edits: bool = False
+) -> Iterator[tuple[int, int, int]]:
+    """
+    Find approximate occurrences of many patterns in an FM-index.
+
+    Yields (pattern index, position, errors) in order of increasing
+    errors, with the smallest number of errors for each position.
+    """
+    sigma = len(index.c)
+
+    def extend(locus: tuple[int, int]) -> Iterator[tuple[int, tuple[int, int]]]:
+        lo, hi = locus
+        for a in range(1, sigma):  # never the sentinel
+            lo_ = index.c[a] + index.rank(a, lo)
+            hi_ = index.c[a] + index.rank(a, hi)
+            if lo_ < hi_:
+                yield (a, (lo_, hi_))
+
+    def positions(locus: tuple[int, int]) -> Iterator[int]:
+        return (index.locate(i) for i in range(*locus))
+
+    # Backward search reads the text right to left, so we match reversed
+    # patterns; errors are the same for a string and its reversal.
+    reversed_patterns = [encode_pattern(index.alpha, p)[::-1] for p in patterns]
+    trie = pattern_trie(reversed_patterns)
+    hits = approximate_matches(trie, k, edits, (0, len(index)), extend)
+    return report_hits(hits, positions)
+
+
+def fm_approximate_search(
+    index: FMIndex, p: str, k: int, edits: bool = False
+) -> Iterator[tuple[int, int]]:
+    """Find (position, errors) for occurrences of p in an FM-index."""
+    for _, i, errors in fm_approximate_search_many(index, [p], k, edits):
+        yield (i, errors)
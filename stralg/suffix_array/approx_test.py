@@ -0,0 +1,33 @@
+"""Test approximate search."""
+
+from test.helpers import approximate_occurrences, pick_random_patterns, random_string
+
+from stralg.suffix_array.approx import fm_approximate_search, fm_approximate_search_many
+from stralg.suffix_array.fm_index import fm_index
+from stralg.views import Alphabet
+
+
+def test_fm_approximate_search() -> None:
+    """Compare against brute force."""
+    for _ in range(5):
+        x = random_string(100, "acgt")
+        index = fm_index(Alphabet.map_string(x), sa_step=4)
+        for p in [*pick_random_patterns(x, 5), "acgn"]:
+            p = p[:10]
+            for k in range(3):
+                for edits in (False, True):
+                    hits = list(fm_approximate_search(index, p, k, edits))
+                    errors = [e for _, e in hits]
+                    assert errors == sorted(errors)
+                    assert dict(hits) == approximate_occurrences(x, p, k, edits)
+
+
+def test_fm_approximate_search_many() -> None:
+    """Check batch searches."""
+    x = random_string(200, "acgt")
+    index = fm_index(Alphabet.map_string(x))
+    patterns = ["acgta", "ccgta", "gta", "tttt"]
+    hits = list(fm_approximate_search_many(index, patterns, 1, True))
+    for pid, p in enumerate(patterns):
+        mine = {i: e for q, i, e in hits if q == pid}
+        assert mine == approximate_occurrences(x, p, 1, True)
@@ -0,0 +1,38 @@
+"""
+Suffix array construction by prefix doubling.
+
+Sort the suffixes by their first k symbols, then use those ranks to
+sort by the first 2k, until all ranks are distinct. With a comparison
+sort for each round this is O(n log² n), but the sorting is done by
+Python's built-in sort, and unlike SA-IS it does not need a sentinel.
+"""
+
+from array import array
+
+from ..views import String
+from .sais import index_array
+
+
+def prefix_doubling(s: String) -> array:
+    """Build the suffix array of s by prefix doubling."""
+    x = s.x
+    n = len(x)
+    rank = list(x)
+    sa = list(range(n))
+    k = 1
+    while True:
+        # A suffix that ends before i + k sorts before any longer suffix
+        # with the same prefix, so it gets key -1 for the second half.
+        def key(i: int) -> tuple[int, int]:
+            return (rank[i], rank[i + k] if i + k < n else -1)
+
+        sa.sort(key=key)
+        new_rank = [0] * n
+        for j in range(1, n):
+            new_rank[sa[j]] = new_rank[sa[j - 1]] + (key(sa[j - 1]) != key(sa[j]))
+        rank = new_rank
+        if n == 0 or rank[sa[-1]] == n - 1:
+            break
+        k *= 2
+
+    return index_array(n, sa)
@@ -0,0 +1,25 @@
+"""Test prefix-doubling suffix array construction."""
+
+from test.helpers import fibonacci_string, random_string
+
+from stralg.suffix_array.doubling import prefix_doubling
+from stralg.suffix_array.sais import sais
+from stralg.views import Alphabet
+
+
+def test_prefix_doubling() -> None:
+    """Compare prefix doubling with SA-IS."""
+    for x in ["", "a", "aaaaaaa", "mississippi", fibonacci_string(10)]:
+        s = Alphabet.map_string(x)
+        assert prefix_doubling(s) == sais(s)
+    for _ in range(20):
+        s = Alphabet.map_string(random_string(100, alpha="abc"))
+        assert prefix_doubling(s) == sais(s)
+
+
+def test_without_sentinel() -> None:
+    """Prefix doubling also works without a sentinel."""
+    for x in ["", "a", "aaaa", "abab", "mississippi"]:
+        s = Alphabet.map_string(x, with_sentinel=False)
+        expected = sorted(range(len(x)), key=lambda i: x[i:])
+        assert list(prefix_doubling(s)) == expected
@@ -0,0 +1,222 @@
+"""
+External-memory suffix array construction.
+
+For texts where the suffix array does not fit in memory, we split the
+suffixes into runs by their first k symbols, so that each run fits in a
+memory budget, and the runs are ordered by those k-mers. The runs are
+planned from k-mer counts in a sample of the text, and only the k-mers
+where runs start are kept. Passes over the text spill each suffix's
+position to its run's file, for a bounded number of runs per pass; then
+each run is sorted in memory and written back, and the sorted runs
+concatenated in order are the suffix array. The text itself is only
+read, so it can be a memory-mapped file (see map_string_file).
+
+All intermediate files live in a work directory, and every step leaves
+a file behind when it completes, so a build that is interrupted picks up
+where it stopped when it is called again with the same directory.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Callable, Optional
+
+from ..views import Alphabet, String
+from .parallel import sort_bucket
+
+# Rough memory use per suffix while sorting a run: the position, its
+# bucket list entry and its sort key.
+BYTES_PER_SUFFIX = 128
+MAX_K = 16
+MIN_FLUSH = 64  # fewest positions buffered per run before writing them out
+COPY_BLOCK = 1 << 16  # bytes copied at a time when joining the runs
+SAMPLE = 1 << 16  # about how many positions we sample to plan the runs
+MAX_OPEN_RUNS = 64  # run files open at the same time
+
+Progress = Callable[[int, int], None]  # (suffixes sorted, total)
+
+
+def map_string_file(path: str, alpha: Alphabet) -> String:
+    """Memory-map a file holding an encoded string over alpha."""
+    with open(path, "rb") as f:
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return String(alpha, memoryview(m))  # type: ignore
+
+
+def _map_array(path: str) -> memoryview:
+    """Memory-map a file of 64-bit integers."""
+    with open(path, "rb") as f:
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(m).cast("q")
+
+
+def _write_atomic(path: str, data: bytes | array) -> None:
+    """Write a file so it either exists complete or not at all."""
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
+
+
+def _sample_kmers(x: memoryview, k: int, step: int) -> Counter[bytes]:
+    """Count the k-mers (shorter at the end) at every step'th position."""
+    return Counter(bytes(x[i : i + k]) for i in range(0, len(x), step))
+
+
+def _plan(x: memoryview, memory: int, workdir: str) -> tuple[int, list[bytes]]:
+    """
+    Choose k and split the k-mers into runs that fit in memory.
+
+    We estimate k-mer counts from a sample of the text, so memory use is
+    bounded by the sample size, and a run can end up a little larger
+    than the budget. Runs are given by the k-mer each one but the first
+    starts with; the plan is saved so a resumed build uses the same runs.
+    """
+    path = os.path.join(workdir, "plan.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            plan = json.load(f)
+        if plan["n"] != len(x):
+            raise ValueError(f"{workdir} holds a build for a different text")
+        return plan["k"], [bytes.fromhex(key) for key in plan["boundaries"]]
+
+    budget = max(memory // BYTES_PER_SUFFIX, 1)
+    step = max(len(x) // SAMPLE, 1)
+    k = 1
+    counts = _sample_kmers(x, k, step)
+    while max(counts.values(), default=0) * step > budget and k < MAX_K:
+        k += 1
+        counts = _sample_kmers(x, k, step)
+
+    boundaries: list[bytes] = []
+    size = 0
+    for key in sorted(counts):
+        estimate = counts[key] * step
+        if size and size + estimate > budget:
+            boundaries.append(key)
+            size = 0
+        size += estimate
+
+    plan = {"n": len(x), "k": k, "boundaries": [key.hex() for key in boundaries]}
+    _write_atomic(path, json.dumps(plan).encode())
+    return k, boundaries
+
+
+def _flush_size(memory: int, runs: int) -> int:
+    """Get how many positions each of runs buffers can hold within memory."""
+    return max(memory // (8 * runs), MIN_FLUSH)
+
+
+def _distribute(
+    x: memoryview, k: int, boundaries: list[bytes], memory: int, workdir: str
+) -> None:
+    """
+    Spill the position of every suffix to the file of its run.
+
+    To bound the number of open files, we write MAX_OPEN_RUNS runs per
+    pass over the text, and the runs in a pass share the memory budget
+    for buffering positions.
+    """
+    runs = len(boundaries) + 1
+    for first in range(0, runs, MAX_OPEN_RUNS):
+        done = os.path.join(workdir, f"distributed-{first}")
+        if os.path.exists(done):
+            continue
+        last = min(first + MAX_OPEN_RUNS, runs)
+        flush = _flush_size(memory, last - first)
+        buffers = [array("q") for _ in range(first, last)]
+        files = [
+            open(os.path.join(workdir, f"positions-{r}"), "wb")
+            for r in range(first, last)
+        ]
+        try:
+            for i in range(len(x)):
+                r = bisect_right(boundaries, bytes(x[i : i + k])) - first
+                if not 0 <= r < len(buffers):
+                    continue
+                buffers[r].append(i)
+                if len(buffers[r]) >= flush:
+                    buffers[r].tofile(files[r])
+                    del buffers[r][:]
+            for r, buf in enumerate(buffers):
+                buf.tofile(files[r])
+        finally:
+            for f in files:
+                f.close()
+        _write_atomic(done, b"")
+
+
+def _sort_run(x: memoryview, k: int, r: int, workdir: str) -> int:
+    """Sort the suffixes of run r, returning how many there are."""
+    path = os.path.join(workdir, f"run-{r}")
+    positions_path = os.path.join(workdir, f"positions-{r}")
+    if os.path.exists(path):
+        if os.path.exists(positions_path):  # interrupted before removing it
+            os.remove(positions_path)
+        return os.path.getsize(path) // 8
+
+    positions = array("q")
+    with open(positions_path, "rb") as f:
+        positions.frombytes(f.read())
+    buckets: dict[bytes, list[int]] = {}
+    for i in positions:
+        buckets.setdefault(bytes(x[i : i + k]), []).append(i)
+    del positions
+
+    sa = array("q")
+    for key in sorted(buckets):
+        sa.extend(sort_bucket(x, buckets.pop(key), k))
+    _write_atomic(path, sa)
+    os.remove(positions_path)
+    return len(sa)
+
+
+def external_suffix_array(
+    s: String,
+    workdir: str,
+    memory: int = 1 << 30,
+    progress: Optional[Progress] = None,
+) -> memoryview:
+    """
+    Build the suffix array of s using at most about memory bytes.
+
+    The string must end with the sentinel. The suffix array is written
+    to workdir/sa as 64-bit integers and returned memory-mapped, so it
+    can be passed to lcp_array, lcp_st_construction, suffix_array_index
+    or fm_index like any other suffix array. If the array is already in
+    workdir, it is returned right away; if a build was interrupted, it
+    continues. progress, if given, is called after each sorted run.
+    """
+    x = memoryview(s.x)  # type: ignore
+    out = os.path.join(workdir, "sa")
+    if os.path.exists(out):
+        return _map_array(out)
+    os.makedirs(workdir, exist_ok=True)
+
+    k, boundaries = _plan(x, memory, workdir)
+    _distribute(x, k, boundaries, memory, workdir)
+    runs = len(boundaries) + 1
+
+    sorted_suffixes = 0
+    for r in range(runs):
+        sorted_suffixes += _sort_run(x, k, r, workdir)
+        if progress is not None:
+            progress(sorted_suffixes, len(x))
+
+    with open(out + ".tmp", "wb") as f:
+        for r in range(runs):
+            with open(os.path.join(workdir, f"run-{r}"), "rb") as run:
+                while block := run.read(COPY_BLOCK):
+                    f.write(block)
+    os.replace(out + ".tmp", out)
+
+    for r in range(runs):
+        os.remove(os.path.join(workdir, f"run-{r}"))
+    for first in range(0, runs, MAX_OPEN_RUNS):
+        os.remove(os.path.join(workdir, f"distributed-{first}"))
+    os.remove(os.path.join(workdir, "plan.json"))
+    return _map_array(out)
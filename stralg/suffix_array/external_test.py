@@ -0,0 +1,109 @@
+"""Test external-memory suffix array construction."""
+
+import os
+import tempfile
+from test.helpers import fibonacci_string, random_string
+
+import pytest
+
+from stralg.suffix_array import external
+from stralg.suffix_array.external import (
+    BYTES_PER_SUFFIX,
+    MIN_FLUSH,
+    external_suffix_array,
+    map_string_file,
+)
+from stralg.suffix_array.lcp import lcp_array
+from stralg.suffix_array.sais import sais
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.suffix_tree.suffix_tree import lcp_st_construction
+from stralg.views import Alphabet
+
+
+def test_external() -> None:
+    """Compare with SA-IS for different memory budgets."""
+    texts = ["", "mississippi", "a" * 50, fibonacci_string(10)]
+    texts += [random_string(500, alpha="acgt") for _ in range(5)]
+    for x in texts:
+        s = Alphabet.map_string(x)
+        for suffixes in [1, 10, 100, 10_000]:
+            with tempfile.TemporaryDirectory() as d:
+                sa = external_suffix_array(s, d, memory=suffixes * BYTES_PER_SUFFIX)
+                assert list(sa) == list(sais(s))
+                assert os.listdir(d) == ["sa"]
+                del sa
+
+
+def test_mapped_text() -> None:
+    """Build from a memory-mapped text and use it for a suffix tree."""
+    s = Alphabet.map_string(random_string(1000, alpha="acgt"))
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "text")
+        with open(path, "wb") as f:
+            f.write(s.x)
+        mapped = map_string_file(path, s.alpha)
+        sa = external_suffix_array(mapped, os.path.join(d, "work"), memory=10_000)
+        st = lcp_st_construction(mapped, sa, lcp_array(mapped, sa))
+        assert st == mccreight_st_construction(s)
+        del st, sa
+
+
+def test_resume() -> None:
+    """Check that an interrupted build continues where it stopped."""
+    s = Alphabet.map_string(random_string(2000, alpha="acgt"))
+    calls: list[tuple[int, int]] = []
+
+    def stop_after_two(done: int, total: int) -> None:
+        calls.append((done, total))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+
+    with tempfile.TemporaryDirectory() as d:
+        memory = 300 * BYTES_PER_SUFFIX
+        with pytest.raises(KeyboardInterrupt):
+            external_suffix_array(s, d, memory=memory, progress=stop_after_two)
+        # The sorted runs are kept and their positions are gone, so
+        # resuming can only succeed by reusing them
+        assert {"run-0", "run-1"} <= set(os.listdir(d))
+        assert "positions-0" not in os.listdir(d)
+
+        resumed: list[tuple[int, int]] = []
+        sa = external_suffix_array(
+            s, d, memory=memory, progress=lambda *p: resumed.append(p)
+        )
+        assert list(sa) == list(sais(s))
+        assert resumed[:2] == calls
+        assert resumed[-1] == (len(s.x), len(s.x))
+        del sa
+
+        # When the array is there, we just load it
+        sa = external_suffix_array(s, d, progress=stop_after_two)
+        assert list(sa) == list(sais(s))
+        del sa
+
+
+def test_sampled_plan(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check planning from a small sample, with many runs per pass."""
+    monkeypatch.setattr(external, "SAMPLE", 50)
+    monkeypatch.setattr(external, "MAX_OPEN_RUNS", 3)
+    for x in [random_string(2000, alpha="acgt"), "ab" * 500]:
+        s = Alphabet.map_string(x)
+        with tempfile.TemporaryDirectory() as d:
+            sa = external_suffix_array(s, d, memory=20 * BYTES_PER_SUFFIX)
+            assert list(sa) == list(sais(s))
+            assert os.listdir(d) == ["sa"]
+            del sa
+
+
+def test_small_memory() -> None:
+    """Check a tiny budget, which also bounds the position buffers."""
+    s = Alphabet.map_string(random_string(3000, alpha="acgt"))
+    memory = 4 * BYTES_PER_SUFFIX
+    with tempfile.TemporaryDirectory() as d:
+        sa = external_suffix_array(s, d, memory=memory)
+        assert list(sa) == list(sais(s))
+        del sa
+    # Buffers share the budget, down to a floor
+    assert external._flush_size(1 << 20, 2) * 8 * 2 == 1 << 20
+    assert external._flush_size(1 << 20, 64) * 8 * 64 == 1 << 20
+    assert external._flush_size(memory, 64) == MIN_FLUSH
@@ -0,0 +1,157 @@
+"""
+The FM-index.
+
+The FM-index stores the Burrows-Wheeler transform (BWT) of the string
+with occurrence counts sampled every occ_step rows, and the suffix
+array sampled every sa_step text positions. Backward search counts the
+occurrences of a pattern of length m with O(m) rank queries; each hit is
+then located by walking at most sa_step steps back through the text.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Sequence
+
+from ..views import Alphabet, String
+from .sais import index_array, sais
+
+
+class RankBitVector:
+    """A packed bit vector with rank queries."""
+
+    BLOCK = 64  # bytes between rank checkpoints
+
+    bits: bytearray
+    checkpoints: array
+
+    def __init__(self, n: int, ones: Iterable[int]) -> None:
+        """Create a bit vector of length n with the bits in ones set."""
+        self.bits = bytearray((n + 7) // 8)
+        for i in ones:
+            self.bits[i >> 3] |= 1 << (i & 7)
+        self.checkpoints = array("q", [0])
+        for b in range(0, len(self.bits), self.BLOCK):
+            block = self.bits[b : b + self.BLOCK]
+            self.checkpoints.append(
+                self.checkpoints[-1] + int.from_bytes(block, "little").bit_count()
+            )
+
+    def __getitem__(self, i: int) -> bool:
+        """Get bit i."""
+        return bool(self.bits[i >> 3] & (1 << (i & 7)))
+
+    def rank(self, i: int) -> int:
+        """Count the set bits before position i."""
+        byte, bit = i >> 3, i & 7
+        block = byte // self.BLOCK
+        res = self.checkpoints[block]
+        res += int.from_bytes(
+            self.bits[block * self.BLOCK : byte], "little"
+        ).bit_count()
+        if bit:
+            res += (self.bits[byte] & ((1 << bit) - 1)).bit_count()
+        return res
+
+
+@dataclass
+class FMIndex:
+    """An FM-index over a sentinel-terminated string."""
+
+    alpha: Alphabet
+    bwt: bytes
+    c: list[int]  # c[a] is the number of symbols smaller than a
+    # occ[k * sigma + a] is the number of a's in bwt[: k * occ_step]
+    occ: array = field(repr=False)
+    occ_step: int
+    sampled: RankBitVector = field(repr=False)  # rows with a sampled SA value
+    samples: array = field(repr=False)  # SA values of sampled rows, in row order
+
+    def __len__(self) -> int:
+        """Get the length of the indexed string (including sentinel)."""
+        return len(self.bwt)
+
+    def rank(self, a: int, i: int) -> int:
+        """Count the occurrences of a in bwt[:i]."""
+        k = i // self.occ_step
+        start = k * self.occ_step
+        return self.occ[k * len(self.c) + a] + self.bwt.count(a, start, i)
+
+    def lf(self, i: int) -> int:
+        """Map row i to the row of the suffix one position earlier."""
+        a = self.bwt[i]
+        return self.c[a] + self.rank(a, i)
+
+    def interval(self, p: str) -> tuple[int, int]:
+        """Find the rows [lo, hi) whose suffixes start with p."""
+        try:
+            p_ = self.alpha.encode(p, with_sentinel=False)
+        except KeyError:
+            return (0, 0)  # when we can't map, we don't get hits
+        lo, hi = 0, len(self.bwt)
+        for a in reversed(p_):
+            lo = self.c[a] + self.rank(a, lo)
+            hi = self.c[a] + self.rank(a, hi)
+            if lo >= hi:
+                return (0, 0)
+        return (lo, hi)
+
+    def locate(self, i: int) -> int:
+        """Get the suffix array value of row i."""
+        steps = 0
+        while not self.sampled[i]:
+            i = self.lf(i)
+            steps += 1
+        return self.samples[self.sampled.rank(i)] + steps
+
+    def search(self, p: str) -> Iterator[int]:
+        """Find all occurrences of p."""
+        lo, hi = self.interval(p)
+        for i in range(lo, hi):
+            yield self.locate(i)
+
+    def count(self, p: str) -> int:
+        """Count the occurrences of p."""
+        lo, hi = self.interval(p)
+        return hi - lo
+
+    def __contains__(self, p: str) -> bool:
+        """Test if string p occurs in the text."""
+        return self.count(p) > 0
+
+
+def fm_index(
+    s: String,
+    sa: Optional[Sequence[int]] = None,
+    occ_step: int = 64,
+    sa_step: int = 16,
+) -> FMIndex:
+    """
+    Build an FM-index for s.
+
+    The string must end with the sentinel. If the suffix array is not
+    given, we build it with SA-IS; it is only needed during construction.
+    """
+    sa = sais(s) if sa is None else sa
+    x, n, sigma = s.x, len(s), len(s.alpha)
+    bwt = bytes(x[j - 1] for j in sa)  # x[-1] is the sentinel for j == 0
+
+    counts = [0] * sigma
+    occ = index_array(n)
+    for i, a in enumerate(bwt):
+        if i % occ_step == 0:
+            occ.extend(counts)
+        counts[a] += 1
+    if n % occ_step == 0:
+        occ.extend(counts)
+
+    c, total = [0] * sigma, 0
+    for a in range(sigma):
+        c[a], total = total, total + counts[a]
+
+    sampled_rows = [i for i, j in enumerate(sa) if j % sa_step == 0]
+    sampled = RankBitVector(n, sampled_rows)
+    samples = index_array(n, (sa[i] for i in sampled_rows))
+
+    return FMIndex(s.alpha, bwt, c, occ, occ_step, sampled, samples)
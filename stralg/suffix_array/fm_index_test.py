@@ -0,0 +1,55 @@
+"""Test the FM-index."""
+
+from test.helpers import (
+    check_equal_matches,
+    fibonacci_string,
+    pick_random_patterns,
+    random_string,
+)
+from typing import Iterator
+
+from stralg.searching import bmh
+from stralg.suffix_array.fm_index import RankBitVector, fm_index
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.views import Alphabet
+
+
+def test_rank_bit_vector() -> None:
+    """Compare rank queries with counting."""
+    ones = [0, 3, 7, 8, 9, 200, 511, 512, 513, 1000, 1023]
+    bv = RankBitVector(1030, ones)
+    for i in range(1031):
+        assert bv.rank(i) == sum(j < i for j in ones)
+    for i in range(1030):
+        assert bv[i] == (i in ones)
+
+
+def test_mississippi() -> None:
+    """Test the FM-index on a small example."""
+    s = Alphabet.map_string("mississippi")
+    index = fm_index(s, occ_step=4, sa_step=3)
+    st = mccreight_st_construction(s)
+    for p in ["i", "ss", "ssi", "issi", "mississippi", "x", "pp", "ipi", ""]:
+        assert sorted(index.search(p)) == sorted(st.search(p))
+        assert index.count(p) == len(list(st.search(p)))
+        assert (p in index) == (p in st)
+
+
+def test_against_bmh() -> None:
+    """Check that FM-indices find the same matches as BMH."""
+
+    def fm_search(x: str, p: str) -> Iterator[int]:
+        return fm_index(Alphabet.map_string(x), occ_step=8, sa_step=5).search(p)
+
+    for _ in range(10):
+        x = random_string(200, alpha="acgt")
+        for p in pick_random_patterns(x, 10):
+            check_equal_matches(x, p, bmh, fm_search)
+    x = fibonacci_string(12)
+    for p in pick_random_patterns(x, 10):
+        check_equal_matches(x, p, bmh, fm_search)
+    for step in range(1, 10):
+        s = Alphabet.map_string(x)
+        assert sorted(fm_index(s, occ_step=step, sa_step=step).search("")) == list(
+            range(len(s))
+        )
@@ -0,0 +1,89 @@
+"""
+LCP arrays and LCP intervals.
+
+The LCP array holds, for each suffix in the suffix array, the length of
+the longest common prefix with the suffix before it. Together with the
+suffix array, the LCP intervals give us all the inner nodes of the
+suffix tree, without building the tree.
+"""
+
+from array import array
+from typing import Iterator, NamedTuple, Sequence
+
+from ..views import String
+from .sais import index_array
+
+
+def inverse_sa(sa: Sequence[int]) -> array:
+    """Compute the rank of each suffix, i.e., the inverse suffix array."""
+    rank = index_array(len(sa), [0]) * len(sa)
+    for i, j in enumerate(sa):
+        rank[j] = i
+    return rank
+
+
+def lcp_array(s: String, sa: Sequence[int]) -> array:
+    """
+    Compute the LCP array with Kasai et al.'s algorithm.
+
+    We go through the suffixes in text order. If suffix i shares h
+    symbols with the suffix before it in sa, then suffix i + 1 shares at
+    least h - 1 with the suffix before it, so we never compare more than
+    2n symbols in total. lcp[0] is zero.
+    """
+    return lcp_ints(s.x, sa)
+
+
+def lcp_ints(x: Sequence[int], sa: Sequence[int]) -> array:
+    """Compute the LCP array of a sequence of integers; see lcp_array."""
+    n = len(sa)
+    rank = inverse_sa(sa)
+    lcp = index_array(n, [0]) * n
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa[r - 1]
+        while i + h < n and j + h < n and x[i + h] == x[j + h]:
+            h += 1
+        lcp[r] = h
+        h = max(h - 1, 0)
+    return lcp
+
+
+class LcpInterval(NamedTuple):
+    """
+    An LCP interval: the suffixes sa[lo:hi] share a prefix of length lcp.
+
+    The interval corresponds to an inner node in the suffix tree with
+    string depth lcp and hi - lo leaves below it.
+    """
+
+    lcp: int
+    lo: int
+    hi: int
+
+
+def lcp_intervals(lcp: Sequence[int]) -> Iterator[LcpInterval]:
+    """
+    Enumerate the LCP intervals bottom-up.
+
+    This is the bottom-up traversal by Abouelhoda et al. Intervals come
+    in the order the corresponding nodes would be left in a depth-first
+    traversal of the suffix tree, so an interval comes after all the
+    intervals nested within it. The root interval comes last. The only
+    memory used is a stack as deep as the tree.
+    """
+    n = len(lcp)
+    stack = [(0, 0)]  # (lcp, lo) for open intervals
+    for i in range(1, n + 1):
+        h = lcp[i] if i < n else 0
+        lo = i - 1
+        while h < stack[-1][0]:
+            depth, lo = stack.pop()
+            yield LcpInterval(depth, lo, i)
+        if h > stack[-1][0]:
+            stack.append((h, lo))
+    yield LcpInterval(0, 0, n)
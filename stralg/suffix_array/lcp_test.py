@@ -0,0 +1,68 @@
+"""Test LCP arrays and LCP intervals."""
+
+from test.helpers import fibonacci_string, random_string
+
+from stralg.suffix_array.lcp import LcpInterval, inverse_sa, lcp_array, lcp_intervals
+from stralg.suffix_array.sais import sais
+from stralg.views import Alphabet, String
+
+
+def naive_lcp(s: String, sa: list[int]) -> list[int]:
+    """Compute the LCP array by comparing neighbouring suffixes."""
+    lcp = [0] * len(sa)
+    for i in range(1, len(sa)):
+        a, b = s.x[sa[i - 1] :], s.x[sa[i] :]
+        while lcp[i] < min(len(a), len(b)) and a[lcp[i]] == b[lcp[i]]:
+            lcp[i] += 1
+    return lcp
+
+
+def naive_intervals(s: String, sa: list[int]) -> set[LcpInterval]:
+    """Find the LCP intervals from the distinct branching prefixes."""
+    res = set()
+    n, lcp = len(sa), naive_lcp(s, sa)
+    for lo in range(n):
+        for hi in range(lo + 2, n + 1):
+            # sa[lo:hi] is an interval if we cannot extend it
+            # without shortening the shared prefix.
+            ell = min(lcp[lo + 1 : hi])
+            left = lcp[lo] if lo > 0 else -1
+            right = lcp[hi] if hi < n else -1
+            if left < ell and right < ell:
+                res.add(LcpInterval(ell, lo, hi))
+    res.add(LcpInterval(0, 0, n))
+    return res
+
+
+def test_lcp_array() -> None:
+    """Compare Kasai's algorithm with the naive algorithm."""
+    for x in ["", "a", "aaaaa", "mississippi", fibonacci_string(8)]:
+        s = Alphabet.map_string(x)
+        sa = sais(s)
+        assert list(lcp_array(s, sa)) == naive_lcp(s, list(sa))
+        assert [sa[r] for r in inverse_sa(sa)] == list(range(len(s)))
+    for _ in range(10):
+        s = Alphabet.map_string(random_string(50, alpha="ab"))
+        sa = sais(s)
+        assert list(lcp_array(s, sa)) == naive_lcp(s, list(sa))
+
+
+def test_lcp_intervals() -> None:
+    """Check the LCP intervals against brute force."""
+    s = Alphabet.map_string("mississippi")
+    sa = sais(s)
+    intervals = list(lcp_intervals(lcp_array(s, sa)))
+    assert intervals[-1] == LcpInterval(0, 0, 12)
+    assert LcpInterval(4, 3, 5) in intervals  # issi
+    assert set(intervals) == naive_intervals(s, list(sa))
+
+    for _ in range(5):
+        s = Alphabet.map_string(random_string(20, alpha="ab"))
+        sa = sais(s)
+        intervals = list(lcp_intervals(lcp_array(s, sa)))
+        assert set(intervals) == naive_intervals(s, list(sa))
+        assert len(intervals) == len(set(intervals))
+        # Nested intervals come first
+        for i, a in enumerate(intervals):
+            for b in intervals[i + 1 :]:
+                assert not (b.lo >= a.lo and b.hi <= a.hi and b != a)
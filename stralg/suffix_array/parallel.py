@@ -0,0 +1,135 @@
+"""
+Parallel suffix array construction.
+
+The suffixes are put in buckets by their first k symbols, and since the
+buckets are ordered by those k symbols, sorting each bucket on its own
+and concatenating the buckets in order gives the suffix array. The text
+is placed in shared memory, and a process pool sorts groups of buckets
+in parallel.
+
+Within a bucket, suffixes are sorted by windows of the text that double
+in length for suffixes that tie, so the work grows with the length of
+the shared prefixes. That is fast for texts such as genomes, where they
+are short, but for highly repetitive texts SA-IS is the better choice.
+"""
+
+from __future__ import annotations
+
+from array import array
+from itertools import groupby
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterator, Optional
+
+from ..views import String
+from .sais import index_array
+
+WINDOW = 32  # symbols compared in the first round of sorting a bucket
+
+
+def sort_bucket(x: memoryview, bucket: list[int], depth: int) -> list[int]:
+    """Sort suffixes that all start with the same depth symbols."""
+    res: list[int] = []
+    # Groups of tied suffixes, in reverse order so we pop the smallest first
+    stack = [(bucket, depth, WINDOW)]
+    while stack:
+        group, d, w = stack.pop()
+        if len(group) == 1:
+            res.extend(group)
+            continue
+        keyed = sorted((bytes(x[i + d : i + d + w]), i) for i in group)
+        ties = [[i for _, i in g] for _, g in groupby(keyed, key=lambda ki: ki[0])]
+        stack.extend((g, d + w, 2 * w) for g in reversed(ties))
+    return res
+
+
+def _buckets(x: memoryview, k: int) -> dict[bytes, list[int]]:
+    """Put the suffixes in buckets by their first k symbols."""
+    buckets: dict[bytes, list[int]] = {}
+    for i in range(len(x)):
+        buckets.setdefault(bytes(x[i : i + k]), []).append(i)
+    return buckets
+
+
+def _tasks(
+    buckets: dict[bytes, list[int]], k: int, size: int
+) -> Iterator[tuple[list[list[int]], int]]:
+    """Group buckets, in order, into tasks of about size suffixes each."""
+    task: list[list[int]] = []
+    total = 0
+    for key in sorted(buckets):
+        task.append(buckets[key])
+        total += len(buckets[key])
+        if total >= size:
+            yield task, k
+            task, total = [], 0
+    if task:
+        yield task, k
+
+
+def _sort_buckets(x: memoryview, buckets: list[list[int]], k: int) -> array:
+    """Sort each bucket and concatenate them."""
+    # Buckets at the end of the text have fewer than k symbols, but
+    # those only hold one suffix since the sentinel is unique.
+    res = index_array(len(x))
+    for bucket in buckets:
+        res.extend(sort_bucket(x, bucket, k))
+    return res
+
+
+# SECTION Worker processes
+
+# State for worker processes, set up by _attach when the worker starts.
+_worker: dict[str, object] = {}
+
+
+def _attach(name: str, n: int) -> None:
+    """Attach a worker process to the shared text."""
+    shm = SharedMemory(name=name)
+    _worker.update(shm=shm, x=shm.buf[:n])
+
+
+def _sort_task(task: tuple[list[list[int]], int]) -> array:
+    """Sort a group of buckets in a worker process."""
+    buckets, k = task
+    return _sort_buckets(_worker["x"], buckets, k)  # type: ignore
+
+
+# !SECTION
+
+
+def parallel_suffix_array(
+    s: String, workers: int = 1, k: Optional[int] = None
+) -> array:
+    """
+    Build the suffix array of s with a pool of worker processes.
+
+    The string must end with the sentinel. If k is not given, it is
+    chosen so there are a good number of buckets per worker. The result
+    is the same as sais(s).
+    """
+    x, n = s.x, len(s.x)
+    if k is None:
+        k, sigma = 1, max(len(s.alpha), 2)
+        while sigma**k < 64 * workers and k < 8:
+            k += 1
+
+    buckets = _buckets(memoryview(x), k)
+    tasks = _tasks(buckets, k, max(n // (4 * workers), 1))
+    sa = index_array(n)
+
+    if workers <= 1:
+        for task in tasks:
+            sa.extend(_sort_buckets(memoryview(x), *task))
+        return sa
+
+    shm = SharedMemory(create=True, size=max(n, 1))
+    shm.buf[:n] = x
+    try:
+        with Pool(workers, _attach, (shm.name, n)) as pool:
+            for part in pool.imap(_sort_task, tasks):
+                sa.extend(part)
+    finally:
+        shm.close()
+        shm.unlink()
+    return sa
@@ -0,0 +1,35 @@
+"""Test parallel suffix array construction."""
+
+from test.helpers import fibonacci_string, random_string
+
+from stralg.suffix_array.parallel import parallel_suffix_array, sort_bucket
+from stralg.suffix_array.sais import sais
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.suffix_tree.parallel import parallel_st_construction
+from stralg.views import Alphabet
+
+
+def test_sort_bucket() -> None:
+    """Check sorting suffixes with long shared prefixes."""
+    s = Alphabet.map_string("a" * 200 + "b" + "a" * 100)
+    x = memoryview(s.x)
+    bucket = [i for i in range(len(x)) if x[i] == x[0]]
+    assert sort_bucket(x, bucket, 1) == [i for i in sais(s) if x[i] == x[0]]
+
+
+def test_sequential() -> None:
+    """Compare bucket sorting in one process with SA-IS."""
+    texts = ["", "a", "mississippi", "aaaaaaaaaa", fibonacci_string(12)]
+    texts += [random_string(200, alpha="acgt") for _ in range(10)]
+    for x in texts:
+        s = Alphabet.map_string(x)
+        for k in [None, 1, 3, 20]:
+            assert parallel_suffix_array(s, k=k) == sais(s)
+
+
+def test_workers() -> None:
+    """Check that a pool of workers builds the same array and tree."""
+    x = random_string(5000, alpha="acgt") + fibonacci_string(15)
+    s = Alphabet.map_string(x)
+    assert parallel_suffix_array(s, workers=3) == sais(s)
+    assert parallel_st_construction(s, workers=2) == mccreight_st_construction(s)
@@ -0,0 +1,139 @@
+"""
+Suffix array construction with the SA-IS algorithm.
+
+SA-IS (Nong, Zhang & Chan) sorts the left-most S-type (LMS) suffixes
+recursively and induces the order of all other suffixes from them. It
+runs in linear time.
+"""
+
+from array import array
+from typing import Iterable, Sequence
+
+from ..views import String
+
+
+def index_array(n: int, values: Iterable[int] = ()) -> array:
+    """Create an integer array that can hold indices into a string of length n."""
+    return array("i" if n < 2**31 else "q", values)
+
+
+def classify(x: Sequence[int]) -> list[bool]:
+    """Classify suffixes as S-type (True) or L-type (False)."""
+    n = len(x)
+    t = [False] * n
+    t[-1] = True  # the sentinel is S
+    for i in range(n - 2, -1, -1):
+        t[i] = x[i] < x[i + 1] or (x[i] == x[i + 1] and t[i + 1])
+    return t
+
+
+def is_lms(t: list[bool], i: int) -> bool:
+    """Test if position i is a left-most S position."""
+    return i > 0 and t[i] and not t[i - 1]
+
+
+def buckets(x: Sequence[int], sigma: int, *, end: bool) -> list[int]:
+    """Get the start or end of each symbol's bucket in the suffix array."""
+    counts = [0] * sigma
+    for a in x:
+        counts[a] += 1
+    res, total = [0] * sigma, 0
+    for a, c in enumerate(counts):
+        total += c
+        res[a] = total if end else total - c
+    return res
+
+
+def induce(x: Sequence[int], sa: list[int], t: list[bool], sigma: int) -> None:
+    """Induce L-type and then S-type suffixes from the LMS suffixes in sa."""
+    heads = buckets(x, sigma, end=False)
+    for i in range(len(sa)):
+        j = sa[i] - 1
+        if j >= 0 and not t[j]:
+            sa[heads[x[j]]] = j
+            heads[x[j]] += 1
+
+    tails = buckets(x, sigma, end=True)
+    for i in range(len(sa) - 1, -1, -1):
+        j = sa[i] - 1
+        if j >= 0 and t[j]:
+            tails[x[j]] -= 1
+            sa[tails[x[j]]] = j
+
+
+def equal_lms(x: Sequence[int], t: list[bool], i: int, j: int) -> bool:
+    """Test if the LMS substrings at i and j are equal."""
+    if i == len(x) - 1 or j == len(x) - 1:
+        return False  # the sentinel is unique
+    k = 0
+    while True:
+        i_lms, j_lms = is_lms(t, i + k), is_lms(t, j + k)
+        if k > 0 and i_lms and j_lms:
+            return True
+        if i_lms != j_lms or x[i + k] != x[j + k] or t[i + k] != t[j + k]:
+            return False
+        k += 1
+
+
+def sais_ints(x: Sequence[int], sigma: int) -> list[int]:
+    """
+    Build the suffix array of x with SA-IS.
+
+    The symbols in x must be in range(sigma), and the last symbol must
+    be a sentinel that is smaller than all other symbols.
+    """
+    n = len(x)
+    if n == 1:
+        return [0]
+
+    t = classify(x)
+    lms = [i for i in range(1, n) if is_lms(t, i)]
+
+    # Place the LMS suffixes at the end of their buckets and induce,
+    # which sorts the LMS substrings.
+    sa = [-1] * n
+    tails = buckets(x, sigma, end=True)
+    for i in lms:
+        tails[x[i]] -= 1
+        sa[tails[x[i]]] = i
+    induce(x, sa, t, sigma)
+
+    # Name the LMS substrings by their sorted order.
+    names = [-1] * n
+    name, prev = -1, -1
+    for i in sa:
+        if is_lms(t, i):
+            if prev < 0 or not equal_lms(x, t, prev, i):
+                name += 1
+            names[i] = name
+            prev = i
+
+    # Sort the LMS suffixes, recursively if the names are not unique.
+    reduced = [names[i] for i in lms]
+    if name + 1 < len(reduced):
+        sa1 = sais_ints(reduced, name + 1)
+    else:
+        sa1 = [0] * len(reduced)
+        for k, a in enumerate(reduced):
+            sa1[a] = k
+
+    # Place the sorted LMS suffixes and induce the rest from them.
+    sa = [-1] * n
+    tails = buckets(x, sigma, end=True)
+    for k in reversed(sa1):
+        i = lms[k]
+        tails[x[i]] -= 1
+        sa[tails[x[i]]] = i
+    induce(x, sa, t, sigma)
+
+    return sa
+
+
+def sais(s: String) -> array:
+    """
+    Build the suffix array of s with SA-IS.
+
+    The string must end with the sentinel (see Alphabet.map_string).
+    """
+    assert len(s) > 0 and s.x[-1] == 0, "SA-IS needs a sentinel-terminated string"
+    return index_array(len(s), sais_ints(s.x, len(s.alpha)))
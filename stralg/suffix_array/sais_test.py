@@ -0,0 +1,31 @@
+"""Test SA-IS suffix array construction."""
+
+from test.helpers import check_sorted, fibonacci_string, random_string
+
+from stralg.suffix_array.sais import sais
+from stralg.views import Alphabet
+
+
+def naive_sa(x: bytes | bytearray) -> list[int]:
+    """Build a suffix array by sorting the suffixes."""
+    return sorted(range(len(x)), key=lambda i: x[i:])
+
+
+def test_mississippi() -> None:
+    """Test SA-IS on a small example."""
+    s = Alphabet.map_string("mississippi")
+    assert list(sais(s)) == [11, 10, 7, 4, 1, 0, 9, 8, 6, 3, 5, 2]
+
+
+def test_sais() -> None:
+    """Compare SA-IS with sorting the suffixes."""
+    for x in ["a", "ab", "aaaaaaa", "abababab", fibonacci_string(10)]:
+        s = Alphabet.map_string(x)
+        assert list(sais(s)) == naive_sa(s.x)
+    for _ in range(20):
+        x = random_string(100, alpha="abc")
+        s = Alphabet.map_string(x)
+        sa = sais(s)
+        check_sorted(x, list(sa))
+        assert list(sa) == naive_sa(s.x)
+    assert list(sais(Alphabet.map_string(""))) == [0]
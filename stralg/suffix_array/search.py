@@ -0,0 +1,143 @@
+"""
+Searching with suffix arrays.
+
+All the suffixes that start with a pattern sit in one interval of the
+suffix array, so we find it with two binary searches. With the LCP-LR
+arrays from Manber and Myers, each search compares each symbol in the
+pattern at most once, so a search takes O(m + log n) time.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Sequence
+
+from ..views import String
+from .lcp import lcp_array
+from .sais import index_array, sais
+
+
+def lcp_lr(lcp: Sequence[int]) -> tuple[array, array]:
+    """
+    Build the LCP-LR arrays for binary search.
+
+    The binary search always splits (lo, hi) at mid = (lo + hi) // 2,
+    starting from (-1, n), so every mid belongs to exactly one interval.
+    For each, llcp[mid] is the LCP of sa[lo] and sa[mid] and rlcp[mid]
+    the LCP of sa[mid] and sa[hi]; the virtual suffixes at -1 and n share
+    nothing with anything.
+    """
+    n = len(lcp)
+    llcp, rlcp = index_array(n, [0]) * n, index_array(n, [0]) * n
+
+    def build(lo: int, hi: int) -> int:
+        if hi - lo == 1:
+            return lcp[hi] if lo >= 0 and hi < n else 0
+        mid = (lo + hi) // 2
+        llcp[mid] = build(lo, mid)
+        rlcp[mid] = build(mid, hi)
+        return min(llcp[mid], rlcp[mid])
+
+    if n:
+        build(-1, n)
+    return llcp, rlcp
+
+
+@dataclass
+class SuffixArrayIndex:
+    """A text index that only needs the suffix array and LCP-LR arrays."""
+
+    s: String
+    sa: array
+    llcp: array = field(repr=False)
+    rlcp: array = field(repr=False)
+
+    def _bound(self, p: bytearray, upper: bool) -> int:
+        """
+        Find the first suffix that is not smaller than p.
+
+        With upper, suffixes that start with p count as smaller than p,
+        so we find the end of the interval instead of the start.
+        """
+        x, sa, m = self.s.x, self.sa, len(p)
+        lo, hi = -1, len(sa)
+        lo_lcp, hi_lcp = 0, 0  # LCP of p with sa[lo] and sa[hi]
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+
+            # We know more about one end than about the other; if mid shares
+            # more or less with that end than p does, we know where mid is
+            # without looking at the text.
+            if lo_lcp >= hi_lcp:
+                k = self.llcp[mid]
+                if k > lo_lcp:
+                    lo = mid
+                    continue
+                if k < lo_lcp:
+                    hi, hi_lcp = mid, k
+                    continue
+            else:
+                k = self.rlcp[mid]
+                if k > hi_lcp:
+                    hi = mid
+                    continue
+                if k < hi_lcp:
+                    lo, lo_lcp = mid, k
+                    continue
+
+            # Otherwise, compare from where the shared prefix ends.
+            j = sa[mid]
+            while k < m and j + k < len(x) and x[j + k] == p[k]:
+                k += 1
+            if k == m:
+                smaller = upper
+            else:
+                smaller = j + k == len(x) or x[j + k] < p[k]
+            if smaller:
+                lo, lo_lcp = mid, k
+            else:
+                hi, hi_lcp = mid, k
+        return hi
+
+    def interval(self, p: str) -> tuple[int, int]:
+        """Get the interval sa[lo:hi] of suffixes that start with p."""
+        try:
+            p_ = self.s.alpha.encode(p, with_sentinel=False)
+        except KeyError:
+            return (0, 0)  # when we can't map, we don't get hits
+        lo = self._bound(p_, upper=False)
+        return (lo, self._bound(p_, upper=True))
+
+    def search(self, p: str) -> memoryview:
+        """
+        Find all occurrences of p.
+
+        The occurrences are a slice of the suffix array, in the
+        order of the suffixes, returned without copying.
+        """
+        lo, hi = self.interval(p)
+        return memoryview(self.sa)[lo:hi]
+
+    def count(self, p: str) -> int:
+        """Count the occurrences of p."""
+        lo, hi = self.interval(p)
+        return hi - lo
+
+    def __contains__(self, p: str) -> bool:
+        """Test if string p occurs in the text."""
+        return self.count(p) > 0
+
+    def search_many(self, patterns: Iterable[str]) -> Iterator[memoryview]:
+        """Search for each pattern in turn."""
+        for p in patterns:
+            yield self.search(p)
+
+
+def suffix_array_index(
+    s: String, sa: Sequence[int] | None = None, lcp: Sequence[int] | None = None
+) -> SuffixArrayIndex:
+    """Build a suffix array index, constructing sa and lcp if not given."""
+    sa_ = sais(s) if sa is None else index_array(len(sa), sa)
+    lcp = lcp_array(s, sa_) if lcp is None else lcp
+    return SuffixArrayIndex(s, sa_, *lcp_lr(lcp))
@@ -0,0 +1,59 @@
+"""Test searching with suffix arrays."""
+
+from test.helpers import (
+    check_equal_matches,
+    fibonacci_string,
+    pick_random_patterns,
+    pick_random_patterns_len,
+    random_string,
+)
+from typing import Iterator
+
+from stralg.searching import bmh
+from stralg.suffix_array.search import suffix_array_index
+from stralg.views import Alphabet
+
+
+def sa_search(x: str, p: str) -> Iterator[int]:
+    """Search with a suffix array index."""
+    return iter(suffix_array_index(Alphabet.map_string(x)).search(p))
+
+
+def test_mississippi() -> None:
+    """Test searching in a small example."""
+    index = suffix_array_index(Alphabet.map_string("mississippi"))
+    assert sorted(index.search("ssi")) == [2, 5]
+    assert list(index.search("i")) == [10, 7, 4, 1]
+    assert index.count("ss") == 2
+    assert index.count("sss") == 0
+    assert index.count("x") == 0
+    assert index.count("") == 12
+    assert "issip" in index
+    assert "ippi" in index
+    assert "mississippis" not in index
+    assert [len(hits) for hits in index.search_many(["s", "p", "q"])] == [4, 2, 0]
+
+
+def test_against_bmh() -> None:
+    """Check that suffix arrays find the same matches as BMH."""
+    for _ in range(10):
+        x = random_string(100, alpha="abcd")
+        for p in pick_random_patterns(x, 10):
+            check_equal_matches(x, p, bmh, sa_search)
+        for p in pick_random_patterns_len(x, 10, 3):
+            check_equal_matches(x, p, bmh, sa_search)
+    x = fibonacci_string(12)
+    for p in pick_random_patterns(x, 10):
+        check_equal_matches(x, p, bmh, sa_search)
+    for p in ["a", "aa", "aaa", "b", "bb", "ab", "ba"]:
+        check_equal_matches(x, p, bmh, sa_search)
+
+
+def test_all_substrings() -> None:
+    """Count every substring of a small string."""
+    x = "abaababaabaab"
+    index = suffix_array_index(Alphabet.map_string(x))
+    for i in range(len(x)):
+        for j in range(i + 1, len(x) + 1):
+            p = x[i:j]
+            assert index.count(p) == sum(x.startswith(p, k) for k in range(len(x)))
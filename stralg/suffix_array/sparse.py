@@ -0,0 +1,69 @@
+"""
+Sparse suffix arrays.
+
+When we only need occurrences that start at some positions, such as
+word boundaries or every k'th position, we only need to index the
+suffixes that start there. A sparse suffix array holds those suffixes
+in sorted order, and its LCP array the shared prefixes of neighbours,
+so both take space proportional to the number of sampled suffixes
+rather than the length of the text. Searching works as with a full
+suffix array, but only finds occurrences at sampled positions.
+
+We sort the sampled suffixes by comparing windows of the text (as in
+the parallel construction), so the time depends on the length of the
+prefixes they share.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Iterable
+
+from ..views import String, shared_prefix_length
+from .parallel import sort_bucket
+from .sais import index_array
+from .search import SuffixArrayIndex, lcp_lr
+
+Positions = Iterable[int] | Callable[[int], bool]
+
+
+def sample_positions(n: int, positions: Positions) -> array:
+    """
+    Get the sampled positions in a string of length n, sorted.
+
+    Positions are either the positions themselves or a predicate that
+    tells us if a position is sampled.
+    """
+    if callable(positions):
+        return index_array(n, (i for i in range(n) if positions(i)))
+    res = index_array(n, sorted(set(positions)))
+    if res and not (0 <= res[0] and res[-1] < n):
+        raise ValueError(f"Sampled positions must be in the range [0, {n})")
+    return res
+
+
+def sparse_suffix_array(s: String, positions: Positions) -> array:
+    """Sort the suffixes of s that start at the sampled positions."""
+    x = memoryview(s.x)  # type: ignore
+    sampled = sample_positions(len(x), positions)
+    return index_array(len(x), sort_bucket(x, list(sampled), 0))
+
+
+def sparse_lcp_array(s: String, sa: array) -> array:
+    """
+    Get the LCP array of a sparse suffix array.
+
+    Entry i is the length of the prefix sa[i - 1] and sa[i] share, and
+    entry 0 is 0, as for full suffix arrays.
+    """
+    x = memoryview(s.x)  # type: ignore
+    lcp = index_array(len(x), [0] * min(len(sa), 1))
+    for i in range(1, len(sa)):
+        lcp.append(shared_prefix_length(x[sa[i - 1] :], x[sa[i] :]))
+    return lcp
+
+
+def sparse_suffix_array_index(s: String, positions: Positions) -> SuffixArrayIndex:
+    """Build a suffix array index that finds occurrences at sampled positions."""
+    sa = sparse_suffix_array(s, positions)
+    return SuffixArrayIndex(s, sa, *lcp_lr(sparse_lcp_array(s, sa)))
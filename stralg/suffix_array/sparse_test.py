@@ -0,0 +1,51 @@
+"""Test sparse suffix arrays."""
+
+from test.helpers import pick_random_patterns, random_string
+
+import pytest
+
+from stralg.suffix_array.sais import sais
+from stralg.suffix_array.sparse import (
+    sample_positions,
+    sparse_lcp_array,
+    sparse_suffix_array,
+    sparse_suffix_array_index,
+)
+from stralg.views import Alphabet
+
+
+def test_sample_positions() -> None:
+    """Check iterables and predicates."""
+    assert list(sample_positions(10, [7, 1, 3, 1])) == [1, 3, 7]
+    assert list(sample_positions(10, lambda i: i % 3 == 0)) == [0, 3, 6, 9]
+    with pytest.raises(ValueError):
+        sample_positions(10, [10])
+
+
+def test_sparse_suffix_array() -> None:
+    """Compare with the full suffix array restricted to the samples."""
+    for x in ["mississippi", "aaaaaaaa", random_string(500, "ab")]:
+        s = Alphabet.map_string(x)
+        for k in [1, 2, 3, 7]:
+            sa = sparse_suffix_array(s, range(0, len(s), k))
+            assert list(sa) == [i for i in sais(s) if i % k == 0]
+            lcp = sparse_lcp_array(s, sa)
+            assert lcp[0] == 0
+            for i in range(1, len(sa)):
+                a, b = x[sa[i - 1] :], x[sa[i] :]
+                j = 0
+                while j < min(len(a), len(b)) and a[j] == b[j]:
+                    j += 1
+                assert lcp[i] == j
+
+
+def test_sparse_search() -> None:
+    """Check that searches find exactly the sampled occurrences."""
+    x = random_string(1000, "acgt")
+    s = Alphabet.map_string(x)
+    index = sparse_suffix_array_index(s, lambda i: i % 3 == 0)
+    assert len(index.sa) == (len(s) + 2) // 3
+    for p in [*pick_random_patterns(x, 20), "acg", "x"]:
+        expected = [i for i in range(0, len(x), 3) if x.startswith(p, i)]
+        assert sorted(index.search(p)) == expected
+    assert list(sparse_suffix_array_index(s, []).search("a")) == []
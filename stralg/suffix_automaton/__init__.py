@@ -0,0 +1,11 @@
+"""
+Suffix automata.
+
+The suffix automaton (the DAWG of all substrings) of a text is the
+smallest automaton that accepts its substrings. It has fewer than 2n
+states and is built online in linear time.
+"""
+
+from .automaton import SuffixAutomaton as SuffixAutomaton
+from .automaton import online_suffix_automaton as online_suffix_automaton
+from .automaton import suffix_automaton as suffix_automaton
@@ -0,0 +1,180 @@
+"""
+Online construction of suffix automata (Blumer et al.).
+
+States are numbers, and everything about them lives in flat arrays: the
+length of the longest string in the state, its suffix link, the end of
+its first occurrence, and a row of sigma transitions per state in one
+table. Each state is the set of substrings with the same end positions
+in the text (endpos), and the number of end positions is the number of
+occurrences, so counting a pattern is a walk of its length.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..views import Alphabet, String
+
+NO_STATE = -1
+
+
+@dataclass
+class SuffixAutomaton:
+    """A suffix automaton we can extend with more text."""
+
+    alpha: Alphabet
+    x: bytearray = field(default_factory=bytearray, repr=False)  # text so far
+    length: array = field(default_factory=lambda: array("q", [0]), repr=False)
+    link: array = field(default_factory=lambda: array("q", [NO_STATE]), repr=False)
+    first: array = field(default_factory=lambda: array("q", [-1]), repr=False)
+    clone: bytearray = field(default_factory=lambda: bytearray(1), repr=False)
+    trans: array = field(default_factory=lambda: array("q"), repr=False)
+    last: int = 0  # the state of the whole text
+    # endpos sizes and link tree children, computed when needed
+    _counts: Optional[array] = field(default=None, repr=False)
+    _tree: Optional[list[list[int]]] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        """Set up the transitions of the initial state."""
+        if not self.trans:
+            self.trans = array("q", [NO_STATE]) * len(self.alpha)
+
+    @property
+    def states(self) -> int:
+        """Get the number of states."""
+        return len(self.length)
+
+    def _new_state(self, length: int, link: int, first: int, clone: bool) -> int:
+        """Add a state without transitions."""
+        self.length.append(length)
+        self.link.append(link)
+        self.first.append(first)
+        self.clone.append(clone)
+        self.trans.extend(array("q", [NO_STATE]) * len(self.alpha))
+        return len(self.length) - 1
+
+    def _add(self, a: int) -> None:
+        """Update the automaton after the text grew with symbol a."""
+        sigma, trans = len(self.alpha), self.trans
+        n = len(self.x)
+        cur = self._new_state(n, NO_STATE, n - 1, False)
+        p = self.last
+        while p != NO_STATE and trans[p * sigma + a] == NO_STATE:
+            trans[p * sigma + a] = cur
+            p = self.link[p]
+
+        if p == NO_STATE:
+            self.link[cur] = 0
+        else:
+            q = trans[p * sigma + a]
+            if self.length[p] + 1 == self.length[q]:
+                self.link[cur] = q
+            else:
+                # q holds strings that are too long; split off the short ones
+                c = self._new_state(
+                    self.length[p] + 1, self.link[q], self.first[q], True
+                )
+                trans[c * sigma : (c + 1) * sigma] = trans[q * sigma : (q + 1) * sigma]
+                while p != NO_STATE and trans[p * sigma + a] == q:
+                    trans[p * sigma + a] = c
+                    p = self.link[p]
+                self.link[q] = self.link[cur] = c
+        self.last = cur
+
+    def extend(self, chars: str) -> None:
+        """Append chars to the text, updating the automaton."""
+        for a in self.alpha.encode(chars, with_sentinel=False):
+            self.x.append(a)
+            self._add(a)
+        self._counts = self._tree = None
+
+    def _walk(self, p: str) -> int:
+        """Get the state we reach reading p, or NO_STATE."""
+        try:
+            p_ = self.alpha.encode(p, with_sentinel=False)
+        except KeyError:
+            return NO_STATE  # when we can't map, we don't get hits
+        sigma, trans, v = len(self.alpha), self.trans, 0
+        for a in p_:
+            v = trans[v * sigma + a]
+            if v == NO_STATE:
+                break
+        return v
+
+    def __contains__(self, p: str) -> bool:
+        """Test if p is a substring of the text."""
+        return self._walk(p) != NO_STATE
+
+    def _link_tree(self) -> list[list[int]]:
+        """Get the children of each state in the suffix link tree."""
+        if self._tree is None:
+            self._tree = [[] for _ in range(self.states)]
+            for v in range(1, self.states):
+                self._tree[self.link[v]].append(v)
+        return self._tree
+
+    def _endpos_counts(self) -> array:
+        """Count the end positions of each state."""
+        if self._counts is None:
+            counts = array("q", (0 if c else 1 for c in self.clone))
+            counts[0] = 0
+            # Longer states first, so a state is done before its link
+            for v in sorted(range(1, self.states), key=self.length.__getitem__)[::-1]:
+                counts[self.link[v]] += counts[v]
+            counts[0] = len(self.x) + 1  # the empty string is everywhere
+            self._counts = counts
+        return self._counts
+
+    def count(self, p: str) -> int:
+        """Count the occurrences of p in O(|p|) time (after the first call)."""
+        v = self._walk(p)
+        return 0 if v == NO_STATE else self._endpos_counts()[v]
+
+    def first_occurrence(self, p: str) -> int:
+        """Get the position of the first occurrence of p, or -1."""
+        v = self._walk(p)
+        if v == NO_STATE:
+            return -1
+        return self.first[v] - len(p) + 1
+
+    def search(self, p: str) -> list[int]:
+        """Find all occurrences of p, in increasing order."""
+        v = self._walk(p)
+        if v == NO_STATE:
+            return []
+        if v == 0:
+            return list(range(len(self.x) + 1))
+        # The end positions of v are the first occurrences of the
+        # non-clone states below it in the link tree.
+        tree, res, stack = self._link_tree(), [], [v]
+        while stack:
+            u = stack.pop()
+            if not self.clone[u]:
+                res.append(self.first[u] - len(p) + 1)
+            stack.extend(tree[u])
+        return sorted(res)
+
+    def distinct_substrings(self) -> int:
+        """Count the distinct non-empty substrings of the text."""
+        return sum(
+            self.length[v] - self.length[self.link[v]] for v in range(1, self.states)
+        )
+
+
+def online_suffix_automaton(alpha: Alphabet, x: str = "") -> SuffixAutomaton:
+    """Create a suffix automaton over alpha, starting with text x."""
+    sa = SuffixAutomaton(alpha)
+    sa.extend(x)
+    return sa
+
+
+def suffix_automaton(s: String) -> SuffixAutomaton:
+    """Build the suffix automaton of s, leaving out the sentinel, if any."""
+    sa = SuffixAutomaton(s.alpha)
+    x = s.x[:-1] if len(s.x) and s.x[-1] == 0 else s.x
+    for a in x:
+        sa.x.append(a)
+        sa._add(a)
+    return sa
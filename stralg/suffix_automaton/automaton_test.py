@@ -0,0 +1,56 @@
+"""Test suffix automata."""
+
+from test.helpers import fibonacci_string, pick_random_patterns, random_string
+
+from stralg.suffix_automaton.automaton import online_suffix_automaton, suffix_automaton
+from stralg.views import Alphabet
+
+
+def occurrences(x: str, p: str) -> list[int]:
+    """Find the occurrences of p in x the slow way."""
+    return [i for i in range(len(x) - len(p) + 1) if x.startswith(p, i)]
+
+
+def check_automaton(x: str) -> None:
+    """Compare queries against brute force."""
+    sa = suffix_automaton(Alphabet.map_string(x))
+    assert sa.states <= max(2 * len(x) - 1, len(x) + 1)
+    substrings = {x[i:j] for i in range(len(x)) for j in range(i + 1, len(x) + 1)}
+    assert sa.distinct_substrings() == len(substrings)
+    patterns = list(pick_random_patterns(x, 10)) if len(x) > 1 else []
+    patterns += [x, x + x, "ac", "xyz", x[1:4]]
+    for p in patterns:
+        assert (p in sa) == (p in x)
+        assert sa.search(p) == occurrences(x, p)
+        assert sa.count(p) == len(occurrences(x, p))
+        assert sa.first_occurrence(p) == x.find(p)
+
+
+def test_mississippi() -> None:
+    """Check a small example."""
+    sa = suffix_automaton(Alphabet.map_string("mississippi"))
+    assert "ssip" in sa and "sss" not in sa
+    assert sa.count("issi") == 2
+    assert sa.search("ss") == [2, 5]
+    assert sa.first_occurrence("ppi") == 8
+    assert sa.count("x") == 0
+
+
+def test_automaton() -> None:
+    """Check fixed and random strings."""
+    for x in ["", "a", "aaaa", "abcbc", fibonacci_string(8)]:
+        check_automaton(x)
+    for _ in range(10):
+        check_automaton(random_string(60, alpha="acgt"))
+
+
+def test_online() -> None:
+    """Check that we can query as the text grows."""
+    x = random_string(200, alpha="ab")
+    sa = online_suffix_automaton(Alphabet(x))
+    for i in range(0, len(x), 20):
+        sa.extend(x[i : i + 20])
+        seen = x[: i + 20]
+        for p in ["a", "ab", "bba", "abab", seen[-5:]]:
+            assert sa.count(p) == len(occurrences(seen, p))
+            assert sa.search(p) == occurrences(seen, p)
@@ -0,0 +1,211 @@
+"""
+Repeats and common substrings from suffix trees.
+
+Everything here is a bottom-up traversal of a suffix tree over a
+sentinel-terminated string. Each inner node is a right-maximal repeat,
+its string depth is the repeat's length, and its leaf count is the
+number of occurrences; whether the occurrences are preceded by different
+letters (left-diversity) tells us whether the repeat is maximal.
+Results that can be large are generated as we go rather than collected.
+"""
+
+from __future__ import annotations
+
+from itertools import chain
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+from ..suffix_array.sais import index_array
+from ..views import Alphabet
+from .generalized import DocInner, DocLeaf, generalized_suffix_tree
+from .suffix_tree import Node, SuffixTree, is_inner, is_leaf
+
+DIVERSE = -2  # left letter of a node whose leaves have different ones
+AT_START = -1  # left letter of the suffix that starts the string
+
+
+class Repeat(NamedTuple):
+    """A repeat of the given length, occurring count times, once at start."""
+
+    start: int
+    length: int
+    count: int
+
+
+class CommonSubstring(NamedTuple):
+    """A substring of the given length at starts[d] in string d."""
+
+    length: int
+    starts: list[int]
+
+
+def _repeat_nodes(st: SuffixTree) -> Iterator[tuple[Repeat, bool, bool]]:
+    """
+    Go through the inner nodes (but the root) bottom-up.
+
+    For each node we get the repeat it represents, whether it is
+    left-diverse, and whether its children are all leaves with distinct
+    left letters.
+    """
+    x = st.s.x
+    # (left letter, leaf count, an occurrence, is a leaf) per finished node;
+    # the children of a node are the top entries when we finish the node.
+    values: list[tuple[int, int, int, bool]] = []
+    stack: list[tuple[Node, int, bool]] = [(st.root, 0, False)]
+    while stack:
+        n, depth, done = stack.pop()
+        if is_leaf(n):
+            i = n.leaf_label
+            values.append((x[i - 1] if i else AT_START, 1, i, True))
+        elif not done:
+            assert is_inner(n)
+            stack.append((n, depth, True))
+            stack.extend(
+                (c, depth + c.end - c.start, False) for c in n.children.values()
+            )
+        else:
+            assert is_inner(n)
+            k = len(n.children)
+            children = values[-k:]
+            del values[-k:]
+            lefts = {left for left, _, _, _ in children}
+            left = DIVERSE if len(lefts) > 1 or DIVERSE in lefts else min(lefts)
+            count = sum(c for _, c, _, _ in children)
+            start = children[-1][2]
+            values.append((left, count, start, False))
+            if depth:
+                supermaximal = len(lefts) == k and all(leaf for *_, leaf in children)
+                yield Repeat(start, depth, count), left == DIVERSE, supermaximal
+
+
+def longest_repeat(st: SuffixTree) -> Optional[Repeat]:
+    """Find a longest substring that occurs at least twice, if any."""
+    best: Optional[Repeat] = None
+    for r, _, _ in _repeat_nodes(st):
+        if best is None or r.length > best.length:
+            best = r
+    return best
+
+
+def maximal_repeats(st: SuffixTree, min_length: int = 1) -> Iterator[Repeat]:
+    """
+    Generate the maximal repeats of at least min_length.
+
+    A repeat is maximal if it cannot be extended to the left or the
+    right without losing occurrences.
+    """
+    for r, diverse, _ in _repeat_nodes(st):
+        if diverse and r.length >= min_length:
+            yield r
+
+
+def supermaximal_repeats(st: SuffixTree, min_length: int = 1) -> Iterator[Repeat]:
+    """
+    Generate the supermaximal repeats of at least min_length.
+
+    A supermaximal repeat is a maximal repeat that is not a substring of
+    another maximal repeat.
+    """
+    for r, _, supermaximal in _repeat_nodes(st):
+        if supermaximal and r.length >= min_length:
+            yield r
+
+
+def longest_common_substring(
+    texts: Sequence[str], alpha: Optional[Alphabet] = None
+) -> CommonSubstring:
+    """
+    Find a longest substring common to all texts.
+
+    This is the deepest node in the generalized suffix tree whose leaves
+    come from all the texts.
+    """
+    st = generalized_suffix_tree(texts, alpha)
+    best, best_depth = st.root, 0
+    stack: list[tuple[Node, int]] = [(st.root, 0)]
+    while stack:
+        n, depth = stack.pop()
+        if isinstance(n, DocInner) and n.df == len(texts):
+            if depth > best_depth:
+                best, best_depth = n, depth
+            stack.extend((c, depth + c.end - c.start) for c in n.children.values())
+
+    starts = [-1] * len(texts)
+    if best_depth:
+        nodes: list[Node] = [best]
+        while nodes:
+            m = nodes.pop()
+            if isinstance(m, DocLeaf):
+                if starts[m.doc] < 0:
+                    starts[m.doc] = m.leaf_label - st.starts[m.doc]
+            else:
+                assert is_inner(m)
+                nodes.extend(m.children.values())
+    return CommonSubstring(best_depth, starts)
+
+
+def tandem_repeats(
+    st: SuffixTree, branching_only: bool = False
+) -> Iterator[tuple[int, int]]:
+    """
+    Generate all tandem repeats ww as (start, len(w)).
+
+    We use Stoye and Gusfield's algorithm. A tandem repeat at i is
+    branching if x[i] != x[i + 2|w|], and then the suffixes i and i + |w|
+    split at a node of depth |w|. At each node we only look at the
+    leaves that are not below its largest child, checking for a partner
+    |w| before or after, so that part takes O(n log n) time. The other
+    tandem repeats are found by rotating the branching ones to the left.
+    """
+    x = st.s.x
+    n = len(x)
+    rank = index_array(n, [-1]) * n  # position of each suffix in leaves
+    leaves: list[int] = []  # leaf labels in depth-first order
+    sizes: list[int] = []  # leaf counts of finished nodes, as in _repeat_nodes
+    stack: list[tuple[Node, int, int]] = [(st.root, 0, -1)]  # lo < 0: not visited
+    while stack:
+        v, depth, lo = stack.pop()
+        if is_leaf(v):
+            rank[v.leaf_label] = len(leaves)
+            leaves.append(v.leaf_label)
+            sizes.append(1)
+            continue
+        assert is_inner(v)
+        if lo < 0:
+            stack.append((v, depth, len(leaves)))
+            stack.extend((c, depth + c.end - c.start, -1) for c in v.children.values())
+            continue
+
+        hi = len(leaves)
+        k = len(v.children)
+        child_sizes = sizes[-k:]  # in the order we visited them
+        del sizes[-k:]
+        sizes.append(hi - lo)
+        if depth == 0:
+            continue
+
+        # The leaves below the largest child are big_lo:big_hi
+        big_lo, big_hi, end = lo, lo, hi
+        for size in reversed(child_sizes):
+            if size > big_hi - big_lo:
+                big_lo, big_hi = end - size, end
+            end -= size
+
+        for r in chain(range(lo, big_lo), range(big_hi, hi)):
+            i = leaves[r]
+            j = i + depth
+            if j < n and lo <= rank[j] < hi and x[i] != x[i + 2 * depth]:
+                yield from _rotations(x, i, depth, branching_only)
+            j = i - depth
+            if j >= 0 and big_lo <= rank[j] < big_hi and x[j] != x[j + 2 * depth]:
+                yield from _rotations(x, j, depth, branching_only)
+
+
+def _rotations(
+    x: memoryview, i: int, half: int, branching_only: bool
+) -> Iterator[tuple[int, int]]:
+    """Get a branching tandem repeat and the ones we get rotating it left."""
+    yield (i, half)
+    if not branching_only:
+        while i > 0 and x[i - 1] == x[i - 1 + 2 * half]:
+            i -= 1
+            yield (i, half)
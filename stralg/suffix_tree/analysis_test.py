@@ -0,0 +1,112 @@
+"""Test repeat and common substring analysis."""
+
+from collections import Counter
+from test.helpers import random_string
+
+from stralg.suffix_tree.analysis import (
+    longest_common_substring,
+    longest_repeat,
+    maximal_repeats,
+    supermaximal_repeats,
+    tandem_repeats,
+)
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.views import Alphabet
+
+
+def substring_counts(x: str) -> Counter[str]:
+    """Count all non-empty substrings of x."""
+    return Counter(x[i:j] for i in range(len(x)) for j in range(i + 1, len(x) + 1))
+
+
+def brute_maximal(x: str) -> dict[str, int]:
+    """Find maximal repeats and their counts the slow way."""
+    res = {}
+    for a, count in substring_counts(x).items():
+        if count < 2:
+            continue
+        occ = [i for i in range(len(x)) if x.startswith(a, i)]
+        lefts = {x[i - 1] if i else None for i in occ}
+        rights = {x[i + len(a)] if i + len(a) < len(x) else None for i in occ}
+        if len(lefts) > 1 and len(rights) > 1:
+            res[a] = count
+    return res
+
+
+def as_strings(x: str, repeats) -> dict[str, int]:  # type: ignore
+    """Map repeats to their strings, checking the start positions."""
+    res = {}
+    for r in repeats:
+        res[x[r.start : r.start + r.length]] = r.count
+    return res
+
+
+def check_repeats(x: str) -> None:
+    """Compare the repeat analyses against brute force."""
+    st = mccreight_st_construction(Alphabet.map_string(x))
+    maximal = brute_maximal(x)
+    assert as_strings(x, maximal_repeats(st)) == maximal
+    supermaximal = {
+        a: c for a, c in maximal.items() if not any(a != b and a in b for b in maximal)
+    }
+    assert as_strings(x, supermaximal_repeats(st)) == supermaximal
+    long = as_strings(x, maximal_repeats(st, min_length=3))
+    assert long == {a: c for a, c in maximal.items() if len(a) >= 3}
+
+    lrs = longest_repeat(st)
+    repeated = [a for a, c in substring_counts(x).items() if c > 1]
+    if repeated:
+        assert lrs is not None
+        assert lrs.length == max(map(len, repeated))
+        assert x.count(x[lrs.start : lrs.start + lrs.length]) >= 1
+    else:
+        assert lrs is None
+
+    tandem = sorted(
+        (i, h)
+        for i in range(len(x))
+        for h in range(1, (len(x) - i) // 2 + 1)
+        if x[i : i + h] == x[i + h : i + 2 * h]
+    )
+    found = list(tandem_repeats(st))
+    assert len(found) == len(set(found))
+    assert sorted(found) == tandem
+    branching = sorted(
+        (i, h) for i, h in tandem if i + 2 * h == len(x) or x[i] != x[i + 2 * h]
+    )
+    assert sorted(tandem_repeats(st, branching_only=True)) == branching
+
+
+def test_repeats() -> None:
+    """Check repeats in fixed and random strings."""
+    for x in ["", "a", "aaaa", "mississippi", "abcabcabc", "abaababaab"]:
+        check_repeats(x)
+    for _ in range(20):
+        check_repeats(random_string(30, alpha="ab"))
+        check_repeats(random_string(30, alpha="acgt"))
+
+
+def test_longest_repeat() -> None:
+    """Check the longest repeat in mississippi."""
+    st = mccreight_st_construction(Alphabet.map_string("mississippi"))
+    r = longest_repeat(st)
+    assert r is not None
+    assert (r.length, r.count) == (4, 2)
+    assert "mississippi"[r.start : r.start + r.length] == "issi"
+
+
+def test_longest_common_substring() -> None:
+    """Check common substrings against brute force."""
+    lcs = longest_common_substring(["xabcdy", "zzabcdzz", "abcd"])
+    assert lcs.length == 4
+    assert lcs.starts == [1, 2, 0]
+    assert longest_common_substring(["ab", "cd"]).length == 0
+
+    for _ in range(20):
+        texts = [random_string(25, alpha="acgt") for _ in range(2)]
+        common = set(substring_counts(texts[0])) & set(substring_counts(texts[1]))
+        lcs = longest_common_substring(texts)
+        assert lcs.length == max(map(len, common), default=0)
+        if lcs.length:
+            a, b = texts
+            assert a[lcs.starts[0] :][: lcs.length] == b[lcs.starts[1] :][: lcs.length]
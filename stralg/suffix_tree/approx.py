@@ -0,0 +1,93 @@
+"""
+Approximate search in suffix trees.
+
+We walk down the tree from the root, one symbol of the edge labels at a
+time, updating a banded dynamic programming column against the patterns
+as we go and pruning a branch as soon as no pattern can be within k
+errors on it (see stralg.approx_common, which has the search itself).
+When a pattern is within k errors at a point in the tree, all leaves
+below it are occurrences, and we get them as a slice of the finalized
+tree's leaves.
+
+Generalized suffix trees key their sentinel edges on negative numbers,
+one per string, so we never extend along keys below one. Online trees
+are rejected, since not every suffix has a leaf in them.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Sequence
+
+from ..approx_common import (
+    approximate_matches,
+    encode_pattern,
+    pattern_trie,
+    report_hits,
+)
+from .generalized import GeneralizedSuffixTree
+from .suffix_tree import Node, SuffixTree, is_inner
+from .ukkonen import OnlineSuffixTree
+
+Locus = tuple[Node, int]  # a node and how far down its edge we are
+
+
+def approximate_search_many(
+    st: SuffixTree, patterns: Sequence[str], k: int, edits: bool = False
+) -> Iterator[tuple[int, Any, int]]:
+    """
+    Find approximate occurrences of many patterns.
+
+    Yields (pattern index, position, errors) in order of increasing
+    errors, with the smallest number of errors for each position. With
+    edits, insertions and deletions count as errors, otherwise only
+    mismatches do. Patterns with common prefixes share the work of
+    matching those prefixes. The tree must be over a sentinel-terminated
+    string, and occurrences never include the sentinel. In generalized
+    trees, positions are (doc_id, offset) pairs, as in their searches.
+    """
+    if isinstance(st, OnlineSuffixTree):
+        raise TypeError("Approximate search needs a complete suffix tree")
+    if st.leaves is None:
+        st.finalize()
+    leaves = st.leaves
+    assert leaves is not None
+    x = st.s.view
+
+    def extend(locus: Locus) -> Iterator[tuple[int, Locus]]:
+        n, offset = locus
+        if n.start + offset < n.end:
+            if x[n.start + offset]:  # never the sentinel
+                yield (x[n.start + offset], (n, offset + 1))
+        elif is_inner(n):
+            for a, child in n.children.items():
+                if a > 0:  # never a sentinel
+                    yield (a, (child, 1))
+
+    def positions(locus: Locus) -> Sequence[int]:
+        n, _ = locus
+        return leaves[n.lo : n.hi]
+
+    trie = pattern_trie([encode_pattern(st.s.alpha, p) for p in patterns])
+    hits = approximate_matches(trie, k, edits, (st.root, 0), extend)
+    if isinstance(st, GeneralizedSuffixTree):
+        return (
+            (pid, st.doc_offset(i), errors)
+            for pid, i, errors in report_hits(hits, positions)
+        )
+    return report_hits(hits, positions)
+
+
+def approximate_search(
+    st: SuffixTree, p: str, k: int, edits: bool = False
+) -> Iterator[tuple[Any, int]]:
+    """
+    Find (position, errors) for the occurrences of p with at most k errors.
+
+    Occurrences come in order of increasing errors. With k == 0 this is
+    an exact search.
+    """
+    if k == 0 and p:
+        yield from ((i, 0) for i in st.search(p))
+        return
+    for _, i, errors in approximate_search_many(st, [p], k, edits):
+        yield (i, errors)
@@ -0,0 +1,87 @@
+"""Test approximate search in suffix trees."""
+
+from test.helpers import approximate_occurrences, pick_random_patterns, random_string
+
+import pytest
+
+from stralg.suffix_tree.approx import approximate_search, approximate_search_many
+from stralg.suffix_tree.generalized import generalized_suffix_tree
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.suffix_tree.ukkonen import online_suffix_tree
+from stralg.views import Alphabet
+
+
+def check_search(x: str, p: str, k: int, edits: bool) -> None:
+    """Compare against brute force and check the order of the hits."""
+    st = mccreight_st_construction(Alphabet.map_string(x))
+    hits = list(approximate_search(st, p, k, edits))
+    errors = [e for _, e in hits]
+    assert errors == sorted(errors)
+    assert dict(hits) == approximate_occurrences(x, p, k, edits)
+    assert len(hits) == len(dict(hits))
+
+
+def test_mismatches() -> None:
+    """Check searches with mismatches."""
+    check_search("mississippi", "ssi", 0, False)
+    check_search("mississippi", "ssi", 1, False)
+    check_search("mississippi", "sxsi", 2, False)
+    check_search("aaaa", "aaaaa", 1, False)
+    for _ in range(10):
+        x = random_string(100, "acgt")
+        for p in pick_random_patterns(x, 5):
+            for k in range(3):
+                check_search(x, p[:12], k, False)
+        check_search(x, random_string(6, "acgtn"), 2, False)
+
+
+def test_edits() -> None:
+    """Check searches with edits."""
+    check_search("mississippi", "ssi", 1, True)
+    check_search("mississippi", "sxsi", 2, True)
+    check_search("mississippi", "misisipi", 3, True)
+    check_search("aaaa", "aaaaa", 1, True)
+    for _ in range(10):
+        x = random_string(100, "acgt")
+        for p in pick_random_patterns(x, 5):
+            for k in range(3):
+                check_search(x, p[:12], k, True)
+        check_search(x, random_string(6, "acgtn"), 2, True)
+
+
+def test_search_many() -> None:
+    """Check that batch searches give the same as single searches."""
+    x = random_string(200, "acgt")
+    st = mccreight_st_construction(Alphabet.map_string(x))
+    patterns = ["acgta", "acgtt", "acg", "acg", "tttt", "gattaca", "x"]
+    for edits in (False, True):
+        hits = list(approximate_search_many(st, patterns, 2, edits))
+        errors = [e for _, _, e in hits]
+        assert errors == sorted(errors)
+        for pid, p in enumerate(patterns):
+            mine = {i: e for q, i, e in hits if q == pid}
+            assert mine == approximate_occurrences(x, p, 2, edits)
+
+
+def test_generalized() -> None:
+    """Matches never run into a sentinel, and positions are per string."""
+    g = generalized_suffix_tree(["ab", "cab"])
+    assert list(approximate_search(g, "abq", 1)) == []
+    assert list(approximate_search(g, "abc", 1)) == []
+    assert sorted(approximate_search(g, "abq", 1, edits=True)) == [
+        ((0, 0), 1),
+        ((1, 1), 1),
+    ]
+    assert sorted(approximate_search(g, "cb", 1)) == [
+        ((0, 0), 1),
+        ((1, 0), 1),
+        ((1, 1), 1),
+    ]
+    assert sorted(approximate_search(g, "ab", 0)) == [((0, 0), 0), ((1, 1), 0)]
+
+
+def test_online_rejected() -> None:
+    """Online trees do not have leaves for every suffix."""
+    st = online_suffix_tree(Alphabet("ab"), "abab")
+    with pytest.raises(TypeError):
+        list(approximate_search(st, "ab", 1))
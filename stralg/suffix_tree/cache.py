@@ -0,0 +1,258 @@
+"""
+Caching query results.
+
+When the same patterns are searched for again and again, a QueryCache in
+front of an index remembers the results, keyed on the encoded pattern,
+and evicts the least recently used ones when the results take up more
+than a memory budget. It works with any index that has search and count
+methods; the results it keeps are the occurrences and their count.
+
+In front of a suffix tree, a SuffixTreeCache keeps the locus of each
+pattern instead, which is small and gives both the count and the
+occurrences as a slice of the tree's leaves. A pattern that is not in
+the cache continues the search from the locus of its longest cached
+prefix, so patterns that extend each other only walk the tree once.
+
+The cache does not know when its index changes, such as when an online
+suffix tree is extended, so it must then be cleared.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from heapq import nlargest
+from typing import Any, Optional, Sequence
+
+from ..suffix_array.sais import index_array
+from ..views import Alphabet
+from .suffix_tree import Node, SuffixTree, is_inner, shared_prefix_length
+
+# Rough memory use of a cache entry besides its key and occurrences: the
+# dictionary slot, the key object and the entry itself.
+ENTRY_BYTES = 128
+# How many cached prefixes a miss in a SuffixTreeCache looks for, longest
+# first, before it walks from the root. Each probe hashes a prefix, so
+# this keeps a miss on a pattern of length m at O(m).
+RESUME_PROBES = 4
+
+
+@dataclass
+class CacheStats:
+    """Counters for a query cache."""
+
+    hits: int = 0
+    misses: int = 0
+    resumed: int = 0  # misses that continued from a cached prefix
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of lookups that were hits."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class QueryCache:
+    """
+    An LRU cache of query results in front of an index.
+
+    Entries are evicted, least recently used first, when their estimated
+    size goes above max_bytes.
+    """
+
+    index: Any
+    max_bytes: int = 1 << 24
+    stats: CacheStats = field(default_factory=CacheStats)
+    size: int = 0  # estimated bytes used by the entries
+    # Encoded pattern -> (size, result), least recently used first
+    entries: OrderedDict[bytes, tuple[int, Any]] = field(
+        default_factory=OrderedDict, repr=False
+    )
+    # How many cached keys there are of each length
+    lengths: Counter[int] = field(default_factory=Counter, repr=False)
+
+    @property
+    def alpha(self) -> Alphabet:
+        """Get the alphabet of the index."""
+        alpha = getattr(self.index, "alpha", None)
+        return self.index.s.alpha if alpha is None else alpha
+
+    def _key(self, p: str) -> Optional[bytes]:
+        """Encode p, or get None if it has letters the index does not have."""
+        try:
+            return bytes(self.alpha.encode(p, with_sentinel=False))
+        except KeyError:
+            return None
+
+    def _get(self, key: bytes) -> Any:
+        """Look up key, counting the hit or miss; None if it is not cached."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def _put(self, key: bytes, result: Any, size: int) -> None:
+        """Cache a result, evicting old entries to make room."""
+        size += ENTRY_BYTES + len(key)
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= old[0]
+            self._forget_length(key)
+        if size > self.max_bytes:
+            return
+        while self.size + size > self.max_bytes:
+            old_key, (old_size, _) = self.entries.popitem(last=False)
+            self.size -= old_size
+            self._forget_length(old_key)
+            self.stats.evictions += 1
+        self.entries[key] = (size, result)
+        self.size += size
+        self.lengths[len(key)] += 1
+
+    def _forget_length(self, key: bytes) -> None:
+        """Note that a key is no longer cached."""
+        self.lengths[len(key)] -= 1
+        if not self.lengths[len(key)]:
+            del self.lengths[len(key)]
+
+    def clear(self) -> None:
+        """Empty the cache."""
+        self.entries.clear()
+        self.lengths.clear()
+        self.size = 0
+
+    def search(self, p: str) -> Sequence[Any]:
+        """Find all occurrences of p, in the form the index reports them."""
+        key = self._key(p)
+        if key is None:
+            return ()
+        entry = self.entries.get(key)
+        if entry is not None and entry[1][1] is not None:
+            return self._get(key)[1]
+        self.stats.misses += 1  # not cached, or we only know the count
+
+        hits = list(self.index.search(p))
+        res: Sequence[Any]
+        if all(isinstance(i, int) for i in hits):
+            res = index_array(max(hits, default=0) + 1, hits)
+            size = res.itemsize * len(res)
+        else:  # such as (string, offset) pairs from a generalized tree
+            res = tuple(hits)
+            size = sys.getsizeof(res) + sum(sys.getsizeof(i) for i in res)
+        self._put(key, (len(res), res), size)
+        return res
+
+    def count(self, p: str) -> int:
+        """Count the occurrences of p."""
+        key = self._key(p)
+        if key is None:
+            return 0
+        cached = self._get(key)
+        if cached is not None:
+            return cached[0]
+        n = self.index.count(p)
+        self._put(key, (n, None), 0)
+        return n
+
+    def __contains__(self, p: str) -> bool:
+        """Test if p occurs in the text."""
+        return self.count(p) > 0
+
+
+def _descend(n: Node, depth: int, matched: int, p: bytes) -> tuple[Optional[Node], int]:
+    """
+    Find the locus of p and its string depth.
+
+    We start at node n, whose edge ends at string depth depth, with the
+    first matched symbols of p already matched on the path to n.
+    """
+    while True:
+        stop = min(depth, len(p))
+        if matched < stop:
+            start = n.end - (depth - matched)
+            label = n.x[start : start + stop - matched]
+            if shared_prefix_length(label, memoryview(p)[matched:stop]) < len(label):
+                return None, 0
+            matched = stop
+        if matched == len(p):
+            return n, depth
+        if not is_inner(n) or p[matched] not in n.children:
+            return None, 0
+        n = n.children[p[matched]]
+        depth += n.end - n.start
+
+
+@dataclass
+class SuffixTreeCache(QueryCache):
+    """
+    A query cache that keeps the loci of patterns in a suffix tree.
+
+    Occurrences are slices of the finalized tree's leaves, so they take
+    no space in the cache.
+    """
+
+    index: SuffixTree
+
+    def _locus(self, key: bytes) -> Optional[Node]:
+        """Find the locus of an encoded pattern, using and filling the cache."""
+        st = self.index
+        if st.leaves is None:
+            st.finalize()
+
+        cached = self._get(key)
+        if cached is not None:
+            return cached[0]
+
+        # Continue from the longest cached prefix we find, if any, only
+        # looking at lengths that some cached key has.
+        start: tuple[Node, int, int] = (st.root, 0, 0)
+        candidates = (j for j in self.lengths if 0 < j < len(key))
+        for j in nlargest(RESUME_PROBES, candidates):
+            entry = self.entries.get(key[:j])
+            if entry is not None:
+                self.stats.resumed += 1
+                self.entries.move_to_end(key[:j])
+                n, depth = entry[1]
+                if n is None:  # no occurrences of the prefix, so none of key
+                    self._put(key, (None, 0), 0)
+                    return None
+                start = (n, depth, j)
+                break
+
+        n, depth = _descend(*start, key)
+        self._put(key, (n, depth), 0)
+        return n
+
+    def search(self, p: str) -> Sequence[int]:
+        """Find all occurrences of p, as a slice of the tree's leaves."""
+        key = self._key(p)
+        n = None if key is None else self._locus(key)
+        if n is None:
+            return memoryview(index_array(0))
+        assert self.index.leaves is not None
+        return memoryview(self.index.leaves)[n.lo : n.hi]
+
+    def count(self, p: str) -> int:
+        """Count the occurrences of p."""
+        key = self._key(p)
+        n = None if key is None else self._locus(key)
+        return 0 if n is None else n.hi - n.lo
+
+
+def query_cache(index: Any, max_bytes: int = 1 << 24) -> QueryCache:
+    """
+    Put a query cache in front of an index.
+
+    Suffix trees get a SuffixTreeCache, and other indices a QueryCache.
+    That includes lazy trees, whose nodes can be collapsed behind the
+    cache's back, and online trees, where not all suffixes have leaves.
+    """
+    if type(index) is SuffixTree:
+        return SuffixTreeCache(index, max_bytes)
+    return QueryCache(index, max_bytes)
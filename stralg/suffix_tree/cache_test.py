@@ -0,0 +1,88 @@
+"""Test query caches."""
+
+from collections import Counter
+from test.helpers import pick_random_patterns, random_string
+
+from stralg.suffix_array import fm_index
+from stralg.suffix_tree.cache import QueryCache, SuffixTreeCache, query_cache
+from stralg.suffix_tree.generalized import generalized_suffix_tree
+from stralg.suffix_tree.lazy import lazy_suffix_tree
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.suffix_tree.ukkonen import online_suffix_tree
+from stralg.views import Alphabet
+
+
+def test_suffix_tree_cache() -> None:
+    """Compare cached searches with the tree's."""
+    x = random_string(300, "acgt")
+    st = mccreight_st_construction(Alphabet.map_string(x))
+    cache = query_cache(st)
+    assert isinstance(cache, SuffixTreeCache)
+    patterns = [*pick_random_patterns(x, 20), "acgtacgtacgt", "x", "", "a"]
+    for _ in range(2):
+        for p in patterns:
+            assert list(cache.search(p)) == list(st.search(p))
+            assert cache.count(p) == st.count(p)
+            assert (p in cache) == (p in st)
+    assert cache.stats.hits > cache.stats.misses
+
+
+def test_resume_from_prefix() -> None:
+    """Check that extending a cached pattern continues from its locus."""
+    s = Alphabet.map_string("mississippi")
+    st = mccreight_st_construction(s)
+    cache = SuffixTreeCache(st)
+    assert cache.count("ss") == 2
+    for p in ["ssi", "ssis", "ssiss", "ssissippi", "ssip", "ssx"]:
+        assert sorted(cache.search(p)) == sorted(st.search(p))
+    assert cache.stats.resumed == 5  # not "ssx", which we can't encode
+    assert cache.count("mss") == 0
+    assert cache.count("mssi") == 0
+    assert cache.stats.resumed == 6
+
+
+def test_eviction() -> None:
+    """Check that the cache stays within its budget."""
+    x = random_string(500, "ab")
+    index = fm_index(Alphabet.map_string(x))
+    cache = query_cache(index, max_bytes=2000)
+    assert type(cache) is QueryCache
+    for p in pick_random_patterns(x, 50):
+        assert sorted(cache.search(p)) == sorted(index.search(p))
+        assert cache.count(p) == index.count(p)
+        assert cache.size <= 2000
+    assert cache.stats.evictions > 0
+    assert cache.size == sum(size for size, _ in cache.entries.values())
+    assert cache.lengths == Counter(len(key) for key in cache.entries)
+
+
+def test_online_tree() -> None:
+    """Online trees get a plain cache, which we clear when they grow."""
+    st = online_suffix_tree(Alphabet("ab"), "abab")
+    cache = query_cache(st)
+    assert type(cache) is QueryCache
+    assert cache.count("ab") == 2
+    st.extend("ab")
+    cache.clear()
+    assert cache.count("ab") == 3
+    assert sorted(cache.search("ab")) == [0, 2, 4]
+
+
+def test_lazy_tree() -> None:
+    """Lazy trees get a plain cache."""
+    s = Alphabet.map_string("mississippi")
+    cache = query_cache(lazy_suffix_tree(s))
+    assert type(cache) is QueryCache
+    assert sorted(cache.search("ssi")) == [2, 5]
+    assert cache.count("ssi") == 2
+
+
+def test_generalized_tree() -> None:
+    """Check caching (string, offset) hits."""
+    st = generalized_suffix_tree(["banana", "ananas"])
+    cache = query_cache(st)
+    for _ in range(2):
+        assert sorted(cache.search("ana")) == sorted(st.search("ana"))
+        assert cache.count("ana") == 4
+        assert list(cache.search("x")) == []
+    assert cache.stats.hits >= 2
@@ -0,0 +1,192 @@
+"""
+Generalized suffix trees over many strings.
+
+The strings are concatenated, each followed by a sentinel. The alphabet
+only has one sentinel symbol, but for the tree each string's sentinel
+must be distinct, or suffixes would match across string boundaries. We
+get that by sorting the suffixes over integers where string d's sentinel
+is its own symbol, and then building the tree from the suffix and LCP
+arrays. Leaves end at their string's sentinel, and an edge that is only
+a sentinel is keyed on the string instead of the sentinel symbol.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence
+
+from ..suffix_array.lcp import lcp_ints
+from ..suffix_array.sais import sais_ints
+from ..views import Alphabet, String
+from .suffix_tree import Inner, Leaf, Node, SuffixTree, is_inner, search_up
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .persist import FlatSuffixTree
+
+
+class DocInner(Inner):
+    """An inner node that knows how many strings have leaves below it."""
+
+    __slots__ = ("df",)
+
+    df: int
+
+
+class DocLeaf(Leaf):
+    """A leaf for a suffix of one of the strings; its edge ends at the sentinel."""
+
+    __slots__ = ("end", "doc")
+
+    end: int  # type: ignore  # (it is a property in Leaf)
+    doc: int
+
+    def __init__(self, leaf_label: int, x: memoryview, start: int, doc: int, end: int):
+        """Create a leaf with edge label x[start:end] for string doc."""
+        super().__init__(leaf_label, x, start)
+        self.doc = doc
+        self.end = end
+
+
+def _attach(parent: Inner, child: Node) -> None:
+    """Add child to parent, with distinct keys for sentinel edges."""
+    a = child.x[child.start]
+    if a == 0:
+        assert isinstance(child, DocLeaf)
+        a = -1 - child.doc  # sentinels come before all letters
+    parent.children[a] = child
+    child.parent = parent
+
+
+@dataclass(eq=False)
+class GeneralizedSuffixTree(SuffixTree):
+    """
+    A suffix tree over several strings.
+
+    Leaf labels are offsets into the concatenated string; search reports
+    hits as (doc_id, offset) pairs, where doc_id is the index of the string.
+    """
+
+    starts: list[int] = field(default_factory=list)  # where each string starts
+
+    def doc_offset(self, i: int) -> tuple[int, int]:
+        """Map an offset in the concatenation to (doc_id, offset)."""
+        doc = bisect_right(self.starts, i) - 1
+        return (doc, i - self.starts[doc])
+
+    def search(self, p: str) -> Iterator[tuple[int, int]]:  # type: ignore
+        """Find all occurrences of p as (doc_id, offset) pairs."""
+        for i in super().search(p):
+            yield self.doc_offset(i)
+
+    def save(self, path: str) -> None:
+        """Saving is not supported; the file format has no string boundaries."""
+        raise NotImplementedError("Generalized suffix trees cannot be saved")
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> FlatSuffixTree:
+        """Loading is not supported, since saving is not."""
+        raise NotImplementedError("Generalized suffix trees cannot be loaded")
+
+    def document_frequency(self, p: str) -> int:
+        """Count the strings that contain p, in O(|p|) time."""
+        n = self.locus(p)
+        if n is None:
+            return 0
+        return n.df if isinstance(n, DocInner) else 1
+
+    def documents(self, p: str) -> list[int]:
+        """
+        Get the sorted ids of the strings that contain p.
+
+        We stop going through leaves once we have seen as many strings
+        as the document frequency says there are.
+        """
+        n = self.locus(p)
+        if n is None:
+            return []
+        df = n.df if isinstance(n, DocInner) else 1
+        docs: set[int] = set()
+        stack: list[Node] = [n]
+        while len(docs) < df:
+            m = stack.pop()
+            if isinstance(m, DocLeaf):
+                docs.add(m.doc)
+            else:
+                assert is_inner(m)
+                stack.extend(m.children.values())
+        return sorted(docs)
+
+
+def _count_documents(root: DocInner) -> None:
+    """Set df on all inner nodes by merging sets of strings bottom-up."""
+    # Merging the smaller sets into the largest keeps it O(n log n).
+    docs: dict[int, set[int]] = {}
+    stack: list[tuple[Node, bool]] = [(root, False)]
+    while stack:
+        n, done = stack.pop()
+        if isinstance(n, DocLeaf):
+            docs[id(n)] = {n.doc}
+        elif not done:
+            assert is_inner(n)
+            stack.append((n, True))
+            stack.extend((c, False) for c in n.children.values())
+        else:
+            assert isinstance(n, DocInner)
+            child_sets = sorted(
+                (docs.pop(id(c)) for c in n.children.values()), key=len, reverse=True
+            )
+            merged = child_sets[0] if child_sets else set()
+            for other in child_sets[1:]:
+                merged |= other
+            n.df = len(merged)
+            docs[id(n)] = merged
+
+
+def generalized_suffix_tree(
+    docs: Sequence[str], alpha: Optional[Alphabet] = None
+) -> GeneralizedSuffixTree:
+    """Build a generalized suffix tree over docs."""
+    alpha = Alphabet("".join(docs)) if alpha is None else alpha
+    k = len(docs)
+
+    x, starts, ends, doc_of = bytearray(), [], [], []
+    for d, doc in enumerate(docs):
+        starts.append(len(x))
+        x.extend(alpha.encode(doc, with_sentinel=True))
+        ends.append(len(x))
+        doc_of.extend([d] * (len(x) - starts[-1]))
+
+    # String d's sentinel is k - 1 - d, so the last one is the smallest;
+    # letters are moved up above all the sentinels.
+    ints = [a + k - 1 if a else k - 1 - doc_of[i] for i, a in enumerate(x)]
+    sa = sais_ints(ints, len(alpha) + k - 1) if ints else []
+    lcp = lcp_ints(ints, sa)
+
+    xv = memoryview(x)
+    root = DocInner(xv, 0, 0)
+    v: Optional[Node] = None
+    for i, j in enumerate(sa):
+        d = doc_of[j]
+        if v is None:
+            n, depth = root, 0
+        else:
+            prev = sa[i - 1]
+            n, depth = search_up(v, ends[doc_of[prev]] - prev - lcp[i])
+
+        v = DocLeaf(j, xv, j + lcp[i], d, ends[d])
+        if depth == 0:
+            assert is_inner(n)
+            _attach(n, v)
+        else:
+            # Break the edge to n depth symbols down
+            assert n.parent is not None
+            split = DocInner(xv, n.start, n.start + depth)
+            _attach(n.parent, split)
+            n.start += depth
+            _attach(split, n)
+            _attach(split, v)
+
+    _count_documents(root)
+    root.suffix_link = root
+    return GeneralizedSuffixTree(String(alpha, xv), root, starts=starts)
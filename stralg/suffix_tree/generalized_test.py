@@ -0,0 +1,119 @@
+"""Test generalized suffix trees."""
+
+import os
+import tempfile
+from test.helpers import random_string
+
+import pytest
+
+from stralg.suffix_tree.generalized import DocLeaf, generalized_suffix_tree
+from stralg.suffix_tree.matching import matching_statistics
+from stralg.suffix_tree.suffix_tree import is_inner
+
+
+def occurrences(docs: list[str], p: str) -> list[tuple[int, int]]:
+    """Find all occurrences of p in docs the slow way."""
+    return sorted(
+        (d, i)
+        for d, doc in enumerate(docs)
+        for i in range(len(doc) - len(p) + 1)
+        if doc[i : i + len(p)] == p
+    )
+
+
+def check_docs(docs: list[str], patterns: list[str]) -> None:
+    """Compare searches in the tree against brute force."""
+    st = generalized_suffix_tree(docs)
+    for p in patterns:
+        hits = occurrences(docs, p) if p else []
+        if p:
+            assert sorted(st.search(p)) == hits
+        containing = sorted({d for d, _ in hits})
+        if p:
+            assert st.document_frequency(p) == len(containing)
+            assert st.documents(p) == containing
+
+
+def test_small() -> None:
+    """Check a few hand-picked documents."""
+    docs = ["banana", "ananas", "nab"]
+    st = generalized_suffix_tree(docs)
+    assert sorted(st.search("ana")) == [(0, 1), (0, 3), (1, 0), (1, 2)]
+    assert sorted(st.search("nab")) == [(2, 0)]
+    assert st.document_frequency("nan") == 2
+    assert st.document_frequency("a") == 3
+    assert st.documents("b") == [0, 2]
+    assert st.documents("x") == []
+    assert "bananas" not in st  # would cross a sentinel
+    assert "anas" in st
+    # All suffixes of all strings, plus the sentinels, are leaves
+    assert len(list(st.root)) == sum(len(d) + 1 for d in docs)
+
+
+def test_shared_suffixes() -> None:
+    """Identical documents must still get one leaf per suffix each."""
+    docs = ["abab", "abab", "bab"]
+    st = generalized_suffix_tree(docs)
+    assert sorted(st.search("bab")) == [(0, 1), (1, 1), (2, 0)]
+    assert st.document_frequency("aba") == 2
+    assert st.document_frequency("b") == 3
+    check_docs(docs, ["a", "b", "ab", "ba", "abab", "bab"])
+
+
+def test_random() -> None:
+    """Compare random documents against brute force."""
+    for _ in range(10):
+        docs = [random_string(n, alpha="acgt") for n in (0, 5, 20, 40, 40)]
+        text = "".join(docs)
+        patterns = {text[i : i + k] for i in range(0, len(text), 7) for k in (1, 3)}
+        patterns |= {"ac", "gt", "acgt", "tttt"}
+        check_docs(docs, sorted(patterns))
+
+
+def test_leaf_labels() -> None:
+    """Leaf edges end at their own string's sentinel."""
+    docs = ["banana", "ananas", "nab"]
+    st = generalized_suffix_tree(docs)
+    stack = [st.root]
+    while stack:
+        n = stack.pop()
+        if is_inner(n):
+            stack.extend(n.children.values())
+            continue
+        assert isinstance(n, DocLeaf)
+        doc, i = st.doc_offset(n.leaf_label)
+        suffix = st.s.alpha.encode(docs[doc][i:], with_sentinel=True)
+        assert n.edge_label[-1] == 0 and suffix.endswith(n.edge_label)
+    assert "s\u2022nab" not in st.to_dot()
+
+
+def test_equality() -> None:
+    """Trees built from the same strings are equal."""
+    docs = ["banana", "ananas", "nab"]
+    assert generalized_suffix_tree(docs) == generalized_suffix_tree(docs)
+    assert generalized_suffix_tree(docs) != generalized_suffix_tree(docs[:2])
+
+
+def test_matching_statistics() -> None:
+    """Matching statistics report positions as (doc_id, offset) pairs."""
+    docs = ["banana", "ananas", "nab"]
+    q = "nabxanas"
+    stats = list(matching_statistics(generalized_suffix_tree(docs), q))
+    assert [length for length, _ in stats] == [3, 2, 1, 0, 4, 3, 2, 1]
+    for i, (length, pos) in enumerate(stats):
+        if length:
+            d, j = pos
+            assert docs[d][j : j + length] == q[i : i + length]
+        else:
+            assert pos == -1
+
+
+def test_no_persistence() -> None:
+    """Saving would lose the strings, so it is not supported."""
+    st = generalized_suffix_tree(["banana", "nab"])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree")
+        with pytest.raises(NotImplementedError):
+            st.save(path)
+        with pytest.raises(NotImplementedError):
+            st.load(path)
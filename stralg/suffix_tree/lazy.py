@@ -0,0 +1,232 @@
+"""
+Lazy suffix trees.
+
+A lazy suffix tree is built top-down, write-only-top-down (wotd) style,
+but only where we search. An unexpanded node holds the (unsorted)
+suffixes below it, and the first time anything looks at its children it
+partitions them by their next symbol into new children, each with its
+edge label set to the longest prefix its suffixes share. Building the
+tree is just creating the root, and only the parts of the tree that
+queries touch are ever materialized.
+
+To keep memory bounded, the tree can be given a cap on the number of
+materialized nodes. When expanding a node takes us over the cap, the
+least recently used expanded nodes are collapsed back into suffix lists.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..suffix_array.sais import index_array
+from ..views import String
+from .suffix_tree import (
+    Inner,
+    Leaf,
+    Node,
+    SuffixTree,
+    is_leaf,
+    shared_prefix_length,
+)
+
+
+class LazyInner(Inner):
+    """An inner node that creates its children when they are first needed."""
+
+    __slots__ = ("tree", "depth", "suffixes", "kids")
+
+    tree: LazySuffixTree
+    depth: int  # string depth at the end of the edge
+    suffixes: Optional[array]  # the suffixes below, until we expand
+    kids: Optional[dict[int, Node]]  # the children, once we expand
+
+    def __init__(
+        self,
+        tree: LazySuffixTree,
+        x: memoryview,
+        start: int,
+        end: int,
+        depth: int,
+        suffixes: array,
+    ):
+        """Create an unexpanded node with edge label x[start:end]."""
+        super().__init__(x, start, end)
+        self.tree = tree
+        self.depth = depth
+        self.suffixes = suffixes
+        self.kids = None
+
+    @property  # type: ignore
+    def children(self) -> dict[int, Node]:
+        """Get the children, expanding the node if needed."""
+        if self.kids is None:
+            return self.tree._expand(self)
+        self.tree._touch(self)
+        return self.kids
+
+    @children.setter
+    def children(self, kids: dict[int, Node]) -> None:
+        self.kids = kids
+
+    @property
+    def expanded(self) -> bool:
+        """Tell if the node's children exist."""
+        return self.kids is not None
+
+
+def _group_lcp(x: memoryview, group: list[int], depth: int) -> int:
+    """Get the length of the prefix the suffixes share after depth symbols."""
+    first = group[0] + depth
+    k = len(x) - first
+    for i in group[1:]:
+        k = shared_prefix_length(x[first : first + k], x[i + depth : i + depth + k])
+    return k
+
+
+@dataclass(eq=False)
+class LazySuffixTree(SuffixTree):
+    """
+    A suffix tree that only expands the nodes we search through.
+
+    With max_nodes set, at most about that many nodes are kept
+    materialized. Search results are the occurrences in no
+    particular order.
+    """
+
+    max_nodes: Optional[int] = None
+    nodes: int = 1  # materialized nodes, including the root
+    # Expanded nodes, least recently used first
+    lru: OrderedDict[int, LazyInner] = field(default_factory=OrderedDict, repr=False)
+
+    def __post_init__(self) -> None:
+        """Connect the root to the tree."""
+        assert isinstance(self.root, LazyInner)
+        self.root.tree = self
+
+    def _touch(self, n: LazyInner) -> None:
+        """Mark n as recently used."""
+        # A node that is not in the LRU was cut off when an ancestor
+        # collapsed; its subtree is still intact, so it can still be used.
+        if self.max_nodes is not None and id(n) in self.lru:
+            self.lru.move_to_end(id(n))
+
+    def _expand(self, n: LazyInner) -> dict[int, Node]:
+        """Partition n's suffixes into children."""
+        assert n.suffixes is not None
+        x, d = n.x, n.depth
+        groups: dict[int, list[int]] = {}
+        for i in n.suffixes:
+            groups.setdefault(x[i + d], []).append(i)
+
+        kids: dict[int, Node] = {}
+        for a in sorted(groups):
+            g = groups[a]
+            i = g[0]
+            if len(g) == 1:
+                child: Node = Leaf(i, x, i + d)
+            else:
+                k = _group_lcp(x, g, d)
+                child = LazyInner(
+                    self, x, i + d, i + d + k, d + k, index_array(len(x), g)
+                )
+            child.parent = n
+            kids[a] = child
+        n.children = kids
+        n.suffixes = None
+        self.nodes += len(kids)
+
+        if self.max_nodes is not None:
+            self.lru[id(n)] = n
+            self._evict(n, self.max_nodes)
+        return kids
+
+    def _evict(self, n: LazyInner, cap: int) -> None:
+        """Collapse nodes until we are under the cap, except n and its ancestors."""
+        # A search is walking down through n, so the path to it is pinned.
+        pinned: set[int] = set()
+        m: Optional[Inner] = n
+        while m is not None:
+            pinned.add(id(m))
+            m = m.parent
+        while self.nodes > cap and len(self.lru) > len(pinned):
+            key, victim = self.lru.popitem(last=False)
+            if key in pinned:
+                self.lru[key] = victim  # in use, so recently used
+            else:
+                self._collapse(victim)
+
+    def _collapse(self, n: LazyInner) -> None:
+        """Turn n back into an unexpanded node."""
+        suffixes = index_array(len(n.x))
+        stack: list[Node] = list(n.kids.values())
+        while stack:
+            m = stack.pop()
+            self.nodes -= 1
+            if is_leaf(m):
+                suffixes.append(m.leaf_label)
+            elif isinstance(m, LazyInner) and not m.expanded:
+                assert m.suffixes is not None
+                suffixes.extend(m.suffixes)
+            else:
+                assert isinstance(m, LazyInner)
+                self.lru.pop(id(m), None)
+                stack.extend(m.kids.values())
+        n.suffixes = suffixes
+        n.children = None  # type: ignore
+
+    def finalize(self) -> None:
+        """
+        Expand every node and compute the leaf intervals.
+
+        Collapsing nodes would leave the intervals stale, so a tree with
+        a node cap cannot be finalized.
+        """
+        if self.max_nodes is not None:
+            raise ValueError("A lazy suffix tree with max_nodes cannot be finalized")
+        super().finalize()
+
+    def _occurrences(self, n: Optional[Node]) -> array:
+        """Collect the suffixes below n, without expanding anything."""
+        res = index_array(len(self.s.x))
+        stack: list[Node] = [] if n is None else [n]
+        while stack:
+            m = stack.pop()
+            if is_leaf(m):
+                res.append(m.leaf_label)
+            elif isinstance(m, LazyInner) and not m.expanded:
+                assert m.suffixes is not None
+                res.extend(m.suffixes)
+            else:
+                assert isinstance(m, LazyInner) and m.kids is not None
+                stack.extend(m.kids.values())
+        return res
+
+    def search(self, p: str) -> array:  # type: ignore
+        """Find all occurrences of p, without expanding below its locus."""
+        return self._occurrences(self.locus(p))
+
+    def count(self, p: str) -> int:
+        """Count the occurrences of p."""
+        n = self.locus(p)
+        if isinstance(n, LazyInner) and not n.expanded:
+            assert n.suffixes is not None
+            return len(n.suffixes)
+        return len(self._occurrences(n))
+
+
+def lazy_suffix_tree(s: String, max_nodes: Optional[int] = None) -> LazySuffixTree:
+    """
+    Create a lazy suffix tree for s.
+
+    This only creates the root; nodes are expanded by searches. The
+    string must end with the sentinel.
+    """
+    x = s.view
+    # The root gets its tree in LazySuffixTree.__post_init__
+    suffixes = index_array(len(x), range(len(x)))
+    root = LazyInner(None, x, 0, 0, 0, suffixes)  # type: ignore
+    root.suffix_link = root
+    return LazySuffixTree(s, root, max_nodes=max_nodes)
@@ -0,0 +1,86 @@
+"""Test lazy suffix trees."""
+
+from test.helpers import fibonacci_string, pick_random_patterns, random_string
+
+import pytest
+
+from stralg.suffix_tree.approx import approximate_search
+from stralg.suffix_tree.lazy import lazy_suffix_tree
+from stralg.suffix_tree.matching import matching_statistics
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.views import Alphabet
+
+
+def occurrences(x: str, p: str) -> list[int]:
+    """Find the occurrences of p in x the slow way."""
+    return [i for i in range(len(x) - len(p) + 1) if x.startswith(p, i)]
+
+
+def test_lazy_search() -> None:
+    """Check searches and that only the searched part is expanded."""
+    x = "mississippi"
+    st = lazy_suffix_tree(Alphabet.map_string(x))
+    assert st.nodes == 1
+    assert sorted(st.search("ssi")) == [2, 5]
+    assert st.count("i") == 4
+    assert st.count("x") == 0
+    assert "sip" in st and "sss" not in st
+    assert st.nodes < len(mccreight_st_construction(Alphabet.map_string(x)).root.x) * 2
+
+    for x in ["aaaa", fibonacci_string(10), random_string(300, alpha="acgt")]:
+        st = lazy_suffix_tree(Alphabet.map_string(x))
+        for p in list(pick_random_patterns(x, 20)) + ["", "ac", "gggg", x]:
+            assert sorted(st.search(p)) == occurrences(x, p)
+            assert st.count(p) == len(occurrences(x, p))
+
+
+def test_full_expansion() -> None:
+    """Expanding every node gives the usual suffix tree."""
+    for x in ["mississippi", fibonacci_string(8), random_string(200, alpha="ab")]:
+        s = Alphabet.map_string(x)
+        assert lazy_suffix_tree(s) == mccreight_st_construction(s)
+
+        # Equality doesn't depend on what was expanded before
+        searched = lazy_suffix_tree(s)
+        searched.search(x[:3])
+        assert searched == lazy_suffix_tree(s)
+
+
+def test_eviction() -> None:
+    """Check that the node cap holds and searches still work."""
+    x = random_string(2000, alpha="acgt")
+    st = lazy_suffix_tree(Alphabet.map_string(x), max_nodes=50)
+    patterns = list(pick_random_patterns(x, 200))
+    for p in patterns:
+        assert sorted(st.search(p)) == occurrences(x, p)
+        assert st.nodes <= 50 + 5  # one expansion can go over by sigma + 1
+    assert len(st.lru) < 50
+
+
+def test_small_cap() -> None:
+    """Check that eviction never collapses the path a search is on."""
+    x = random_string(3000, alpha="acgt")
+    for cap in [2, 3, 5, 8, 12, 20]:
+        st = lazy_suffix_tree(Alphabet.map_string(x), max_nodes=cap)
+        for p in pick_random_patterns(x, 200):
+            assert sorted(st.search(p)) == occurrences(x, p)
+            assert st.count(p) == len(occurrences(x, p))
+
+
+def test_capped_finalize() -> None:
+    """Finalizing needs stable intervals, so capped trees refuse it."""
+    x = random_string(300, alpha="acgt")
+    q = x[50:70] + "tttt" + x[200:230]
+    st = lazy_suffix_tree(Alphabet.map_string(x), max_nodes=20)
+    with pytest.raises(ValueError):
+        st.finalize()
+    with pytest.raises(ValueError):
+        list(matching_statistics(st, q))
+    with pytest.raises(ValueError):
+        list(approximate_search(st, x[50:60], 1))
+
+    # Without a cap, both see the whole tree
+    st = lazy_suffix_tree(Alphabet.map_string(x))
+    for (length, i), j in zip(matching_statistics(st, q), range(len(q))):
+        assert x[i : i + length] == q[j : j + length]
+    assert (50, 0) in approximate_search(st, x[50:60], 1)
@@ -0,0 +1,103 @@
+"""
+Lowest common ancestors and longest common extensions.
+
+The lowest common ancestor of two leaves is the node with the smallest
+string depth between them in an Euler tour of the tree, so after
+preprocessing the tour into a sparse table of range minima we find it in
+constant time. The string depth of the lowest common ancestor of leaves
+i and j is the length of the longest common extension (LCE) of suffixes
+i and j.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from ..suffix_array.sais import index_array
+from .suffix_tree import Node, SuffixTree, is_inner, is_leaf
+
+
+@dataclass
+class LcaIndex:
+    """Constant-time LCA and LCE queries over a suffix tree's leaves."""
+
+    nodes: list[Node] = field(repr=False)  # nodes in depth-first order
+    tour: array = field(repr=False)  # node numbers in Euler tour order
+    depth: array = field(repr=False)  # string depth per tour entry
+    first: array = field(repr=False)  # first tour entry of each leaf label
+    # sparse[k][i] is the tour entry with the smallest depth in
+    # i .. i + 2**k - 1
+    sparse: list[array] = field(repr=False)
+
+    def _rmq(self, i: int, j: int) -> int:
+        """Get the tour entry between leaves i and j with the smallest depth."""
+        lo, hi = self.first[i], self.first[j]
+        if lo > hi:
+            lo, hi = hi, lo
+        k = (hi - lo + 1).bit_length() - 1
+        a, b = self.sparse[k][lo], self.sparse[k][hi - (1 << k) + 1]
+        return a if self.depth[a] <= self.depth[b] else b
+
+    def lca(self, i: int, j: int) -> Node:
+        """Get the lowest common ancestor of the leaves for suffixes i and j."""
+        return self.nodes[self.tour[self._rmq(i, j)]]
+
+    def lce(self, i: int, j: int) -> int:
+        """Get the length of the longest common prefix of suffixes i and j."""
+        if i == j:
+            return len(self.first) - 1 - i  # the sentinel doesn't count
+        return self.depth[self._rmq(i, j)]
+
+    def lce_many(self, i: Sequence[int], j: Sequence[int]) -> array:
+        """Get the LCE of suffixes i[k] and j[k] for all k."""
+        return index_array(len(self.first), map(self.lce, i, j))
+
+
+def lca_index(st: SuffixTree) -> LcaIndex:
+    """
+    Preprocess a suffix tree for LCA and LCE queries.
+
+    The tree must be over a sentinel-terminated string, so there is a
+    leaf for every suffix. The tour has fewer than 4n entries and the
+    sparse table O(n log n).
+    """
+    n = len(st.s.x)
+    nodes: list[Node] = []
+    tour, depth = index_array(4 * n), index_array(n)
+    first = index_array(4 * n, [0]) * n
+
+    # Entries (node, string depth, node number or -1 if not visited yet).
+    # Between two children we revisit the parent, as the tour does.
+    stack: list[tuple[Node, int, int]] = [(st.root, 0, -1)]
+    while stack:
+        v, d, number = stack.pop()
+        if number < 0:
+            number = len(nodes)
+            nodes.append(v)
+            if is_leaf(v):
+                first[v.leaf_label] = len(tour)
+            else:
+                assert is_inner(v)
+                children = v.children
+                for a in sorted(children, reverse=True):
+                    c = children[a]
+                    stack.append((v, d, number))
+                    stack.append((c, d + c.end - c.start, -1))
+        tour.append(number)
+        depth.append(d)
+
+    sparse = [index_array(len(tour), range(len(tour)))]
+    k = 1
+    while 2 * k <= len(tour):
+        prev = sparse[-1]
+        sparse.append(
+            index_array(
+                len(tour),
+                (a if depth[a] <= depth[b] else b for a, b in zip(prev, prev[k:])),
+            )
+        )
+        k *= 2
+
+    return LcaIndex(nodes, tour, depth, first, sparse)
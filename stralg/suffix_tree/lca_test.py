@@ -0,0 +1,55 @@
+"""Test LCA and LCE queries."""
+
+import random
+from test.helpers import fibonacci_string, random_string
+
+from stralg.suffix_tree.lca import lca_index
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.suffix_tree.suffix_tree import is_inner
+from stralg.views import Alphabet
+
+
+def lce(x: str, i: int, j: int) -> int:
+    """Compute the LCE the slow way."""
+    k = 0
+    while i + k < len(x) and j + k < len(x) and x[i + k] == x[j + k]:
+        k += 1
+    return k
+
+
+def check_lce(x: str) -> None:
+    """Compare all LCE queries against brute force."""
+    st = mccreight_st_construction(Alphabet.map_string(x))
+    index = lca_index(st)
+    n = len(x) + 1  # with the sentinel
+    pairs = [(i, j) for i in range(n) for j in range(n)]
+    for i, j in pairs:
+        assert index.lce(i, j) == lce(x, i, j)
+    i, j = zip(*pairs)
+    assert list(index.lce_many(i, j)) == [lce(x, a, b) for a, b in pairs]
+
+
+def test_lce() -> None:
+    """Check LCE queries in fixed and random strings."""
+    for x in ["", "a", "aaaa", "mississippi", fibonacci_string(8)]:
+        check_lce(x)
+    for _ in range(10):
+        check_lce(random_string(40, alpha="acgt"))
+
+
+def test_lca() -> None:
+    """Check that LCAs are ancestors of both leaves."""
+    x = random_string(200, alpha="ab")
+    st = mccreight_st_construction(Alphabet.map_string(x))
+    index = lca_index(st)
+    for _ in range(100):
+        i, j = random.randrange(len(x)), random.randrange(len(x))
+        v = index.lca(i, j)
+        if i == j:
+            assert list(v) == [i]
+            continue
+        assert is_inner(v)
+        assert {i, j} <= set(v)
+        assert all(
+            set(c) != set(v) and not {i, j} <= set(c) for c in v.children.values()
+        )
@@ -0,0 +1,108 @@
+"""
+Matching statistics.
+
+For each offset i in a query q, the matching statistic is the length of
+the longest prefix of q[i:] that occurs in the text, together with a
+position where it occurs. After matching q[i:i + l] we do not start over
+from the root for i + 1. We follow the suffix link from the deepest node
+on the match, fast scan down to where q[i + 1:i + l] ends, and continue
+matching from there, so the whole query takes linear time (Chang and
+Lawler).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Sequence
+
+from .generalized import GeneralizedSuffixTree
+from .mccreight import tree_fastsearch
+from .suffix_tree import Inner, SuffixTree, edge, is_inner, node, shared_prefix_length
+from .ukkonen import OnlineSuffixTree
+
+
+def matching_statistics(st: SuffixTree, query: str) -> Iterator[tuple[int, Any]]:
+    """
+    Get (length, position) for the longest match at each offset in query.
+
+    The position is where the match starts in the text, or -1 if the
+    length is zero. The tree must be over a sentinel-terminated string.
+    Trees built with McCreight's or Ukkonen's algorithm have suffix
+    links; without them we scan from the root, which is not linear.
+    For generalized trees, positions are (doc_id, offset) pairs, as in
+    their searches.
+
+    Online trees are rejected, since extending them moves the leaf
+    intervals under us and not every suffix has a leaf.
+    """
+    if isinstance(st, OnlineSuffixTree):
+        raise TypeError("Matching statistics need a complete suffix tree")
+    if st.leaves is None:
+        st.finalize()
+    stats = _query_statistics(st, query)
+    if isinstance(st, GeneralizedSuffixTree):
+        return ((length, st.doc_offset(i) if length else i) for length, i in stats)
+    return stats
+
+
+def _query_statistics(st: SuffixTree, query: str) -> Iterator[tuple[int, int]]:
+    """Get matching statistics with positions in the tree's string."""
+    leaves = st.leaves
+    assert leaves is not None
+
+    # Letters that are not in the alphabet never match, so we handle
+    # the query in stretches of letters we can map.
+    alpha, start = st.s.alpha, 0
+    for end in range(len(query) + 1):
+        if end < len(query) and query[end] in alpha:
+            continue
+        q = memoryview(alpha.encode(query[start:end], with_sentinel=False))
+        yield from _matching_statistics(st.root, leaves, q)
+        if end < len(query):
+            yield (0, -1)
+        start = end + 1
+
+
+def _matching_statistics(
+    root: Inner, leaves: Sequence[int], q: memoryview
+) -> Iterator[tuple[int, int]]:
+    """Get matching statistics for an encoded query."""
+    v, depth, length = root, 0, 0  # v is the deepest node on the match
+    for i in range(len(q)):
+        # Match as far as we can from where we are
+        while i + length < len(q):
+            if length == depth:
+                if q[i + length] not in v.children:
+                    break
+                child = v.children[q[i + length]]
+            else:
+                child = v.children[q[i + depth]]
+            label = child.edge_label
+            k = length - depth  # how far down the edge we are
+            matched = shared_prefix_length(label[k:], q[i + length :])
+            length += matched
+            if k + matched < len(label) or not is_inner(child):
+                break
+            v, depth = child, depth + len(label)
+
+        if length == 0:
+            yield (0, -1)
+            continue
+        locus = v if length == depth else v.children[q[i + depth]]
+        yield (length, leaves[locus.lo])
+
+        # Move to the match for i + 1: q[i + 1:i + length] is in the tree
+        length -= 1
+        if v is root or v.suffix_link is None:
+            v, depth = root, 0
+        else:
+            v, depth = v.suffix_link, depth - 1
+        match tree_fastsearch(v, q[i + 1 + depth : i + 1 + length]):
+            case node(n, _):
+                assert is_inner(n)
+                v, depth = n, length
+            case edge(n, z, w, _) if not w:
+                assert is_inner(n)
+                v, depth = n, length
+            case edge(n, z, _, _):
+                assert n.parent is not None
+                v, depth = n.parent, length - len(z)
@@ -0,0 +1,55 @@
+"""Test matching statistics."""
+
+from test.helpers import fibonacci_string, random_string
+
+import pytest
+
+from stralg.suffix_array import lcp_array, sais
+from stralg.suffix_tree.matching import matching_statistics
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.suffix_tree.suffix_tree import SuffixTree, lcp_st_construction
+from stralg.suffix_tree.ukkonen import online_suffix_tree, ukkonen_st_construction
+from stralg.views import Alphabet, String
+
+
+def lcp_construction(s: String) -> SuffixTree:
+    """Build a tree without suffix links."""
+    sa = sais(s)
+    return lcp_st_construction(s, sa, lcp_array(s, sa))
+
+
+def check_statistics(x: str, q: str) -> None:
+    """Compare matching statistics against brute force."""
+    s = Alphabet.map_string(x)
+    for algo in [mccreight_st_construction, ukkonen_st_construction, lcp_construction]:
+        stats = list(matching_statistics(algo(s), q))
+        assert len(stats) == len(q)
+        for i, (length, pos) in enumerate(stats):
+            expected = 0
+            while expected < len(q) - i and q[i : i + expected + 1] in x:
+                expected += 1
+            assert length == expected
+            if length:
+                assert x[pos : pos + length] == q[i : i + length]
+            else:
+                assert pos == -1
+
+
+def test_matching_statistics() -> None:
+    """Check fixed and random queries."""
+    check_statistics("mississippi", "ssissippississ")
+    check_statistics("mississippi", "missxissi\x00ppi")
+    check_statistics("aaaa", "aaaaaaabaa")
+    check_statistics(fibonacci_string(8), fibonacci_string(9)[5:])
+    check_statistics("abc", "")
+    for _ in range(20):
+        x = random_string(100, alpha="acgt")
+        check_statistics(x, random_string(50, alpha="acgtn"))
+        check_statistics(x, x[30:60] + random_string(10, alpha="ac") + x[:20])
+
+
+def test_online_rejected() -> None:
+    """Online trees can change under us, so they are rejected."""
+    st = online_suffix_tree(Alphabet("acgt"), "acgtacg")
+    with pytest.raises(TypeError):
+        list(matching_statistics(st, "gta"))
@@ -20,7 +20,7 @@ def tree_fastsearch(n: Inner, p: memoryview) -> SearchResult:
         assert p[0] in n.children, "With fast scan, there should always be an out-edge"
         child = n.out_child(p)
         # This is the fast scan jump (instead of scanning)
-        i = min(len(child.edge_label), len(p))
+        i = min(child.end - child.start, len(p))
         if i == len(p):
             return edge(child, child.edge_label[:i], child.edge_label[i:], p)
 
@@ -72,7 +72,7 @@ def z_node(root: Inner, x: memoryview, i: int, v: Leaf) -> Leaf | ZLoc:
     match tree_fastsearch(p.parent.suffix_link, z):
         case edge(z_node, match, rest, _) if len(rest) > 0:
             # mismatch on the edge so we can break immidiately
-            v = break_edge(i, z_node, len(match), w)
+            v = break_edge(i, z_node, len(match), len(x) - len(w))
             p.suffix_link = v.parent
             # We have v directly in this case
             return v
@@ -96,9 +96,9 @@ def v_node(root: Inner, x: memoryview, i: int, v: Leaf) -> Leaf:
         case ZLoc(zn, w):
             match tree_search(zn, w):
                 case node(n, y) if y:
-                    n.add_children(v := Leaf(i, y))
+                    n.add_children(v := Leaf(i, x, len(x) - len(y)))
                 case edge(n, z, w, y) if len(z) < len(y):
-                    v = break_edge(i, n, len(z), y[len(z) :])
+                    v = break_edge(i, n, len(z), len(x) - len(y) + len(z))
                 case _:  # pragma: no cover
                     assert False, "We can't match completely here"
 
@@ -114,7 +114,7 @@ def mccreight_st_construction(s: String) -> SuffixTree:
     but exploiting suffix links and fast scan along the way.
     """
     x = s.view
-    root = Inner(x[0:0])
+    root = Inner(x, 0, 0)
     v = Leaf(0, x)
     root.add_children(v)
     root.suffix_link = root
@@ -10,15 +10,15 @@ def naive_st_construction(s: String) -> SuffixTree:
     down to the insertion point for each suffix in `s`.
     """
     x = s.view
-    root = Inner(x[0:0])
+    root = Inner(x, 0, 0)
 
     # Insert suffixes one at a time...
     for i in range(len(x)):
         match tree_search(root, x[i:]):
             case node(n, y) if y:
-                n.add_children(Leaf(i, y))
-            case edge(n, z, w, y) if len(z) < len(y):
-                break_edge(i, n, len(z), w)
+                n.add_children(Leaf(i, x, len(x) - len(y)))
+            case edge(n, z, _, y) if len(z) < len(y):
+                break_edge(i, n, len(z), len(x) - len(y) + len(z))
             case _:  # pragma: no cover
                 assert False, "We can't match completely here"
 
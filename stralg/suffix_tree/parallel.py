@@ -0,0 +1,23 @@
+"""
+Parallel suffix tree construction.
+
+The suffix array is sorted in parallel by leading k-mers (see
+stralg.suffix_array.parallel), and the tree is then built from the
+suffix and LCP arrays. The result is the same tree the sequential
+algorithms build.
+"""
+
+from typing import Optional
+
+from ..suffix_array.lcp import lcp_array
+from ..suffix_array.parallel import parallel_suffix_array
+from ..views import String
+from .suffix_tree import SuffixTree, lcp_st_construction
+
+
+def parallel_st_construction(
+    s: String, workers: int = 1, k: Optional[int] = None
+) -> SuffixTree:
+    """Construct a suffix tree, sorting the suffixes with a pool of workers."""
+    sa = parallel_suffix_array(s, workers, k)
+    return lcp_st_construction(s, sa, lcp_array(s, sa))
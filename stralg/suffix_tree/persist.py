@@ -0,0 +1,229 @@
+"""
+Saving suffix trees to disk and loading them again.
+
+A tree is saved as flat arrays: the nodes are numbered breadth-first,
+so the children of a node are consecutive nodes, and the leaves are
+listed in depth-first (lexicographical) order, so the leaves below a
+node form an interval of that list. Loading maps the file into memory
+and answers queries directly from the arrays, so it is near-instant,
+and processes that load the same file share one copy in the page cache.
+
+File layout (all integers in native byte order, arrays 8-byte aligned):
+
+    header   magic, version, byte order, typecode, n, nodes, letters
+    letters  the alphabet's letters, UTF-8 encoded
+    text     the encoded string, n bytes
+    start    edge label start per node
+    end      edge label end per node
+    first    first child per node (children are first .. first + degree - 1)
+    degree   number of children per node
+    lo, hi   interval of leaves below each node
+    link     suffix link per node, or -1
+    leaves   leaf labels in lexicographical order, n entries
+"""
+
+from __future__ import annotations
+
+import mmap as mmap_
+import struct
+import sys
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterator, Optional
+
+from ..views import Alphabet, String
+from .suffix_tree import Inner, Leaf, Node, SuffixTree, is_inner
+
+MAGIC = b"STRALGST"
+VERSION = 1
+HEADER = struct.Struct("<8sIcc2xqqq")
+ARRAYS = ("start", "end", "first", "degree", "lo", "hi", "link")
+
+
+def _padding(size: int) -> int:
+    """Get the number of bytes needed to align size to 8 bytes."""
+    return -size % 8
+
+
+@dataclass
+class FlatSuffixTree:
+    """
+    A suffix tree represented as flat integer arrays.
+
+    It answers the same queries as SuffixTree, straight from the arrays,
+    which can be memory-mapped from a file.
+    """
+
+    s: String
+    start: Any  # integer sequences: arrays or memoryviews of a mapped file
+    end: Any
+    first: Any
+    degree: Any
+    lo: Any
+    hi: Any
+    link: Any
+    leaves: Any
+    _mmap: Optional[mmap_.mmap] = field(default=None, repr=False)
+
+    def locus(self, p: str) -> Optional[int]:
+        """Find the node at or just below the end of the path p, if any."""
+        try:
+            p_ = self.s.alpha.encode(p, with_sentinel=False)
+        except KeyError:
+            return None  # when we can't map, we don't get hits
+        x, v, i = self.s.x, 0, 0
+        while i < len(p_):
+            for c in range(self.first[v], self.first[v] + self.degree[v]):
+                if x[self.start[c]] == p_[i]:
+                    break
+            else:
+                return None
+            k = min(self.end[c] - self.start[c], len(p_) - i)
+            if x[self.start[c] : self.start[c] + k] != p_[i : i + k]:
+                return None
+            v, i = c, i + k
+        return v
+
+    def search(self, p: str) -> Iterator[int]:
+        """Find all occurences of p in the suffix tree."""
+        v = self.locus(p)
+        if v is not None:
+            yield from self.leaves[self.lo[v] : self.hi[v]]
+
+    def count(self, p: str) -> int:
+        """Count the occurrences of p."""
+        v = self.locus(p)
+        return 0 if v is None else self.hi[v] - self.lo[v]
+
+    def __contains__(self, p: str) -> bool:
+        """Test if string p is in the tree."""
+        return self.locus(p) is not None
+
+    def to_suffix_tree(self) -> SuffixTree:
+        """
+        Rebuild the tree as Inner and Leaf nodes.
+
+        The nodes share the text with this tree, so with a memory-mapped
+        file they are only valid until close is called.
+        """
+        x: Any = self.s.x
+        nodes: list[Node] = []
+        for v in range(len(self.start)):
+            if self.degree[v]:
+                nodes.append(Inner(x, self.start[v], self.end[v]))
+            else:
+                nodes.append(Leaf(self.leaves[self.lo[v]], x, self.start[v]))
+        for v, n in enumerate(nodes):
+            if is_inner(n):
+                first = self.first[v]
+                n.add_children(*nodes[first : first + self.degree[v]])
+                if self.link[v] >= 0:
+                    n.suffix_link = nodes[self.link[v]]  # type: ignore
+        root = nodes[0]
+        assert is_inner(root)
+        return SuffixTree(self.s, root)
+
+    def close(self) -> None:
+        """Release the memory-mapped file, if there is one."""
+        if self._mmap is not None:
+            for name in ARRAYS + ("leaves",):
+                getattr(self, name).release()
+            self.s.x.release()  # type: ignore
+            self._mmap.close()
+            self._mmap = None
+
+
+def flatten(st: SuffixTree) -> FlatSuffixTree:
+    """Flatten a suffix tree into arrays."""
+    # Finalizing sorts the children and gives us the leaf intervals.
+    st.finalize()
+    assert st.leaves is not None
+
+    # Number the nodes breadth-first.
+    nodes: list[Node] = []
+    index: dict[int, int] = {}
+    queue: deque[Node] = deque([st.root])
+    while queue:
+        n = queue.popleft()
+        index[id(n)] = len(nodes)
+        nodes.append(n)
+        if is_inner(n):
+            queue.extend(n.children.values())
+
+    arrays = {name: array("q", [0]) * len(nodes) for name in ARRAYS}
+    for v, n in enumerate(nodes):
+        arrays["start"][v], arrays["end"][v] = n.start, n.end
+        arrays["lo"][v], arrays["hi"][v] = n.lo, n.hi
+        arrays["link"][v] = -1
+        if is_inner(n):
+            arrays["degree"][v] = len(n.children)
+            if n.children:
+                arrays["first"][v] = index[id(next(iter(n.children.values())))]
+            if n.suffix_link is not None:
+                arrays["link"][v] = index[id(n.suffix_link)]
+
+    return FlatSuffixTree(st.s, leaves=array("q", st.leaves), **arrays)
+
+
+def save(st: SuffixTree | FlatSuffixTree, path: str) -> None:
+    """Save a suffix tree to a file."""
+    flat = st if isinstance(st, FlatSuffixTree) else flatten(st)
+    letters = flat.s.alpha.letters.encode("utf-8")
+    text = bytes(flat.s.x)
+    order = b"<" if sys.byteorder == "little" else b">"
+    with open(path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                MAGIC, VERSION, order, b"q", len(text), len(flat.start), len(letters)
+            )
+        )
+        _write_padded(f, letters)
+        _write_padded(f, text)
+        for name in ARRAYS + ("leaves",):
+            f.write(array("q", getattr(flat, name)).tobytes())
+
+
+def _write_padded(f: IO[bytes], data: bytes) -> None:
+    """Write data followed by padding to 8-byte alignment."""
+    f.write(data)
+    f.write(bytes(_padding(len(data))))
+
+
+def load(path: str, mmap: bool = True) -> FlatSuffixTree:
+    """
+    Load a suffix tree saved with save.
+
+    With mmap, the arrays are views into the memory-mapped file, so
+    loading does not read the file, and the pages are shared between
+    processes. Otherwise the file is read into memory.
+    """
+    with open(path, "rb") as f:
+        data: Any = (
+            mmap_.mmap(f.fileno(), 0, access=mmap_.ACCESS_READ) if mmap else f.read()
+        )
+
+    magic, version, order, typecode, n, nodes, nletters = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a suffix tree file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported suffix tree file version {version}")
+    if order != (b"<" if sys.byteorder == "little" else b">"):
+        raise ValueError("The file was written with a different byte order")
+
+    buf = memoryview(data)
+    offset = HEADER.size
+    letters = bytes(buf[offset : offset + nletters]).decode("utf-8")
+    offset += nletters + _padding(nletters)
+    text = buf[offset : offset + n]
+    offset += n + _padding(n)
+
+    arrays: dict[str, Any] = {}
+    itemsize = struct.calcsize(typecode.decode())
+    for name, size in [(name, nodes) for name in ARRAYS] + [("leaves", n)]:
+        arrays[name] = buf[offset : offset + size * itemsize].cast(typecode.decode())
+        offset += size * itemsize
+    buf.release()
+
+    s = String(Alphabet(letters), text)
+    return FlatSuffixTree(s, **arrays, _mmap=data if mmap else None)
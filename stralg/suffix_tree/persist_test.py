@@ -0,0 +1,62 @@
+"""Test saving and loading suffix trees."""
+
+import os
+import tempfile
+from test.helpers import fibonacci_string, pick_random_patterns, random_string
+
+import pytest
+
+from stralg.suffix_tree.mccreight import mccreight_st_construction
+from stralg.suffix_tree.persist import flatten, load
+from stralg.suffix_tree.suffix_tree import SuffixTree
+from stralg.views import Alphabet
+
+
+def check_round_trip(x: str, mmap: bool) -> None:
+    """Save a tree, load it, and compare searches."""
+    st = mccreight_st_construction(Alphabet.map_string(x))
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "tree.st")
+        st.save(path)
+        flat = SuffixTree.load(path, mmap=mmap)
+        assert str(flat.s) == str(st.s)
+        patterns = list(pick_random_patterns(x, 10)) + ["", "x", x[-3:], x]
+        for p in patterns:
+            assert list(flat.search(p)) == list(st.search(p))
+            assert flat.count(p) == len(list(st.search(p)))
+            assert (p in flat) == (p in st)
+
+        rebuilt = flat.to_suffix_tree()
+        assert rebuilt == st
+        for p in patterns:
+            assert list(rebuilt.search(p)) == list(st.search(p))
+        del rebuilt
+        flat.close()
+
+
+def test_round_trip() -> None:
+    """Check that loaded trees answer queries like the originals."""
+    for mmap in [True, False]:
+        check_round_trip("mississippi", mmap)
+        check_round_trip(fibonacci_string(10), mmap)
+        for _ in range(5):
+            check_round_trip(random_string(100, alpha="acgt"), mmap)
+
+
+def test_flatten() -> None:
+    """Check the flat representation directly."""
+    st = mccreight_st_construction(Alphabet.map_string("mississippi"))
+    flat = flatten(st)
+    assert list(flat.leaves) == list(st.root)
+    assert flat.lo[0] == 0 and flat.hi[0] == 12
+    assert flat.link[0] == 0
+
+
+def test_bad_file() -> None:
+    """Loading something that isn't a tree is an error."""
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "tree.st")
+        with open(path, "wb") as f:
+            f.write(bytes(64))
+        with pytest.raises(ValueError):
+            load(path, mmap=False)
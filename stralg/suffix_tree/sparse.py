@@ -0,0 +1,32 @@
+"""
+Sparse suffix trees.
+
+A sparse suffix tree only has leaves for the suffixes that start at
+sampled positions, so it has at most twice as many nodes as there are
+samples. We build it from the sparse suffix and LCP arrays, the same way
+as a full tree is built from the full arrays.
+"""
+
+from __future__ import annotations
+
+from ..suffix_array.sparse import (
+    Positions,
+    sparse_lcp_array,
+    sparse_suffix_array,
+)
+from ..views import String
+from .suffix_tree import Inner, SuffixTree, lcp_st_construction
+
+
+def sparse_suffix_tree(s: String, positions: Positions) -> SuffixTree:
+    """
+    Build a suffix tree over the suffixes starting at sampled positions.
+
+    Positions are either an iterable of positions or a predicate on
+    positions. The string must end with the sentinel. Searches only
+    find occurrences that start at sampled positions.
+    """
+    sa = sparse_suffix_array(s, positions)
+    if not sa:
+        return SuffixTree(s, Inner(s.view, 0, 0))
+    return lcp_st_construction(s, sa, sparse_lcp_array(s, sa))
@@ -0,0 +1,31 @@
+"""Test sparse suffix trees."""
+
+from test.helpers import pick_random_patterns, random_string
+
+from stralg.suffix_tree.sparse import sparse_suffix_tree
+from stralg.views import Alphabet
+
+
+def test_sparse_suffix_tree() -> None:
+    """Check that searches find exactly the sampled occurrences."""
+    x = "the cat sat on the mat with the hat " + random_string(300, "ab ")
+    s = Alphabet.map_string(x)
+    words = {0} | {i + 1 for i, a in enumerate(x) if a == " "}
+    for positions, sampled in [
+        (sorted(words), words.__contains__),
+        (lambda i: i % 4 == 1, lambda i: i % 4 == 1),
+    ]:
+        st = sparse_suffix_tree(s, positions)
+        for p in [*pick_random_patterns(x, 20), "the", "at", "q"]:
+            expected = [i for i in range(len(x)) if sampled(i) and x.startswith(p, i)]
+            assert sorted(st.search(p)) == expected
+            assert st.count(p) == len(expected)
+        assert st.leaves is not None
+        assert len(st.leaves) == sum(map(sampled, range(len(s))))
+
+
+def test_empty() -> None:
+    """A tree with no samples finds nothing."""
+    st = sparse_suffix_tree(Alphabet.map_string("abc"), [])
+    assert list(st.search("a")) == []
+    assert "a" not in st
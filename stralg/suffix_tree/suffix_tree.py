@@ -2,36 +2,70 @@
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
-from typing import Any, Iterator, Optional, TypeGuard
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Sequence, TypeGuard
 
-from ..views import Alphabet, String
+from ..suffix_array.sais import index_array
+from ..views import Alphabet, String, shared_prefix_length
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .persist import FlatSuffixTree
 
 # SECTION Suffix Tree representation
 
 
-@dataclass
 class Inner:
-    """An inner node."""
+    """
+    An inner node.
 
-    edge_label: memoryview  # slice of underlying bytearray
-    parent: Optional[Inner] = field(default=None, init=False, repr=False)
+    Edge labels are not stored as slices but as offsets into the
+    underlying string, x, so the label is x[start:end]. With __slots__
+    that keeps the per-node cost at a handful of pointers.
+    """
 
-    suffix_link: Optional[Inner] = field(default=None, init=False, repr=False)
-    children: dict[int, Node] = field(default_factory=dict, init=False, repr=False)
+    __slots__ = ("x", "start", "end", "parent", "suffix_link", "children", "lo", "hi")
+
+    x: memoryview  # the underlying string
+    start: int
+    end: int
+    parent: Optional[Inner]
+    suffix_link: Optional[Inner]
+    children: dict[int, Node]
+    lo: int  # the leaves below are leaves[lo:hi] in a finalized tree
+    hi: int
+
+    def __init__(self, x: memoryview, start: int = 0, end: Optional[int] = None):
+        """Create an inner node with edge label x[start:end]."""
+        self.x = x
+        self.start = start
+        self.end = len(x) if end is None else end
+        self.parent = None
+        self.suffix_link = None
+        self.children = {}
+        self.lo = self.hi = 0
+
+    def __repr__(self) -> str:
+        """Get a representation of the node (but not its children)."""
+        return f"Inner(start={self.start}, end={self.end})"
+
+    @property
+    def edge_label(self) -> memoryview:
+        """Get the edge label as a slice of the underlying string."""
+        return self.x[self.start : self.end]
 
     def add_children(self, *children: Node) -> None:
         """Add children to this inner node."""
         for child in children:
-            self.children[child.edge_label[0]] = child
+            self.children[child.x[child.start]] = child
             child.parent = self
 
     def out_child(self, edge: memoryview) -> Node:
         """Find the child we go to if we follow the first letter in edge."""
         return self.children[edge[0]]
 
-    def to_dot(self, alpha: Alphabet) -> Iterator[str]:
-        """Get a dot representation for the tree rooted here."""
+    def _dot_node(self, alpha: Alphabet) -> Iterator[str]:
+        """Get the dot representation of this node alone."""
         if self.parent is None:  # Root node
             yield f'{id(self)}[label="", shape=circle, style=filled, fillcolor=grey]'  # noqa: E501
         else:
@@ -40,51 +74,105 @@ class Inner:
             yield f'{id(self.parent)} -> {id(self)}[label="{elab}"]'
         if self.suffix_link:
             yield f"{id(self)} -> {id(self.suffix_link)}[style=dashed, color=red]"  # noqa
-        for child in self.children.values():
-            yield from child.to_dot(alpha)
+
+    def to_dot(self, alpha: Alphabet) -> Iterator[str]:
+        """Get a dot representation for the tree rooted here."""
+        # Traversals use an explicit stack rather than recursion, since
+        # suffix trees can be as deep as the string is long.
+        stack: list[Node] = [self]
+        while stack:
+            n = stack.pop()
+            yield from n._dot_node(alpha)
+            if is_inner(n):
+                stack.extend(reversed(n.children.values()))
 
     def __iter__(self) -> Iterator[int]:
         """Iterate through all leaves in the tree rooted here."""
-        # You could make it more efficient by sorting once
-        # and keeping the table sorted, but for experimenting
-        # this if fine...
-        for x in sorted(self.children):
-            yield from self.children[x]
+        # SuffixTree.search doesn't come here but uses the leaf
+        # intervals from SuffixTree.finalize.
+        stack: list[Node] = [self]
+        while stack:
+            n = stack.pop()
+            if is_leaf(n):
+                yield n.leaf_label
+            else:
+                assert is_inner(n)
+                children = n.children
+                stack.extend(children[a] for a in sorted(children, reverse=True))
 
     def __eq__(self, other: object) -> bool:
         """Test if two nodes are equivalent."""
-        if (
-            not is_inner(other) or self.edge_label != other.edge_label
-        ):  # pragma: no cover
+        if not is_inner(other):  # pragma: no cover
             return False
 
-        # Equal if sorted children are equal.
-        my_children = list(sorted(self.children.items()))
-        others_children = list(sorted(other.children.items()))
-        return len(my_children) == len(others_children) and all(
-            a == b for a, b in zip(my_children, others_children)
-        )
+        # Equal if edge labels are equal and sorted children are equal.
+        stack: list[tuple[Node, Node]] = [(self, other)]
+        while stack:
+            n, m = stack.pop()
+            if is_leaf(n) or is_leaf(m):
+                if n != m:
+                    return False
+                continue
+            assert is_inner(n) and is_inner(m)
+            if n.edge_label != m.edge_label or sorted(n.children) != sorted(m.children):
+                return False
+            stack.extend((n.children[a], m.children[a]) for a in n.children)
+        return True
 
 
 class Leaf:
-    """A leaf in a suffix tree."""
+    """
+    A leaf in a suffix tree.
 
-    edge_label: memoryview  # slice of underlying bytearray
-    parent: Optional[Inner] = field(default=None, init=False, repr=False)
+    A leaf's edge always runs to the end of the string, so we only
+    store where it starts.
+    """
+
+    __slots__ = ("x", "start", "parent", "leaf_label", "lo")
 
+    x: memoryview  # the underlying string
+    start: int
+    parent: Optional[Inner]
     leaf_label: int
+    lo: int  # the leaf's index in leaves in a finalized tree
 
-    def __init__(self, leaf_label: int, edge_label: memoryview):
-        """Create a leaf."""
+    def __init__(self, leaf_label: int, x: memoryview, start: int = 0):
+        """Create a leaf with edge label x[start:]."""
         self.leaf_label = leaf_label
-        self.edge_label = edge_label
-
-    def to_dot(self, alpha: Alphabet) -> Iterator[str]:
+        self.x = x
+        self.start = start
+        self.parent = None
+        self.lo = 0
+
+    def __repr__(self) -> str:
+        """Get a representation of the leaf."""
+        return f"Leaf({self.leaf_label}, start={self.start})"
+
+    @property
+    def end(self) -> int:
+        """Get the end of the edge label; the end of the string."""
+        return len(self.x)
+
+    @property
+    def hi(self) -> int:
+        """Get the end of the leaf's interval in leaves; see Inner.hi."""
+        return self.lo + 1
+
+    @property
+    def edge_label(self) -> memoryview:
+        """Get the edge label as a slice of the underlying string."""
+        return self.x[self.start : self.end]
+
+    def _dot_node(self, alpha: Alphabet) -> Iterator[str]:
         """Get the dot representation of the leaf."""
         lab = alpha.decode(self.edge_label)
         yield f"{id(self)}[label={self.leaf_label}, shape=circle]"
         yield f'{id(self.parent)} -> {id(self)}[label="{lab}"]'
 
+    def to_dot(self, alpha: Alphabet) -> Iterator[str]:
+        """Get the dot representation of the leaf."""
+        return self._dot_node(alpha)
+
     def __iter__(self) -> Iterator[int]:
         """Iterate through all the leaves rooted in this node."""
         yield self.leaf_label
@@ -111,30 +199,81 @@ def is_leaf(n: Any) -> TypeGuard[Leaf]:
 
 @dataclass
 class SuffixTree:
-    """A suffix tree."""
+    """
+    A suffix tree.
+
+    Searches first finalize the tree: children are put in sorted order,
+    the leaf labels are listed in depth-first order in leaves, and each
+    node gets the interval leaves[lo:hi] of the leaves below it. Then
+    reporting occurrences is a slice and counting them is hi - lo.
+    """
 
     s: String
     root: Inner
-
-    def search(self, p: str) -> Iterator[int]:
-        """Find all occurences of p in the suffix tree."""
+    leaves: Optional[array] = field(default=None, repr=False)
+
+    def finalize(self) -> None:
+        """Sort children and compute the leaf intervals."""
+        leaves = index_array(len(self.s.x))
+        stack: list[tuple[Node, bool]] = [(self.root, False)]
+        while stack:
+            n, done = stack.pop()
+            if done:
+                assert is_inner(n)
+                n.hi = len(leaves)
+                continue
+            n.lo = len(leaves)
+            if is_leaf(n):
+                leaves.append(n.leaf_label)
+            else:
+                assert is_inner(n)
+                n.children = {a: n.children[a] for a in sorted(n.children)}
+                stack.append((n, True))
+                stack.extend((c, False) for c in reversed(n.children.values()))
+        self.leaves = leaves
+
+    def locus(self, p: str) -> Optional[Node]:
+        """Find the node at or just below the end of the path p, if any."""
         try:
             p_ = self.s.alpha.as_string(p).view
         except KeyError:
             # when we can't map, we don't get hits
-            return
+            return None
 
         match tree_search(self.root, p_):
             case node(n, y) if not y:
-                yield from iter(n)
+                return n
             case edge(n, z, _, y) if len(z) == len(y):
-                yield from iter(n)
+                return n
             case _:
-                pass
+                return None
+
+    def interval(self, p: str) -> tuple[int, int]:
+        """Get the interval leaves[lo:hi] of the occurrences of p."""
+        if self.leaves is None:
+            self.finalize()
+        n = self.locus(p)
+        return (0, 0) if n is None else (n.lo, n.hi)
+
+    def search(self, p: str) -> Sequence[int]:
+        """
+        Find all occurences of p in the suffix tree.
+
+        The occurrences are a slice of leaves, in lexicographical order
+        of the suffixes, returned without copying.
+        """
+        lo, hi = self.interval(p)
+        assert self.leaves is not None
+        return memoryview(self.leaves)[lo:hi]
+
+    def count(self, p: str) -> int:
+        """Count the occurrences of p."""
+        lo, hi = self.interval(p)
+        return hi - lo
 
     def __contains__(self, p: str) -> bool:
         """Test if string p is in the tree."""
-        return next(self.search(p), -1) != -1
+        return self.locus(p) is not None
 
     def to_dot(self) -> str:
         """Get a dot representation of a tree."""
@@ -142,6 +281,24 @@ class SuffixTree:
             'digraph { rankdir="LR" ' + "\n".join(self.root.to_dot(self.s.alpha)) + "}"
         )  # noqa
 
+    def save(self, path: str) -> None:
+        """Save the tree to a file in the format described in persist.py."""
+        from .persist import save
+
+        save(self, path)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> FlatSuffixTree:
+        """
+        Load a tree saved with save.
+
+        The result is a FlatSuffixTree that answers the same queries as a
+        SuffixTree directly from the (memory-mapped) arrays in the file.
+        """
+        from .persist import load
+
+        return load(path, mmap=mmap)
+
     def __eq__(self, other: object) -> bool:
         """Test if two trees are equivalent."""
         if not isinstance(other, SuffixTree):  # pragma: no cover
@@ -158,12 +315,7 @@ def shared_prefix(x: memoryview, y: memoryview) -> memoryview:
     """
     Return the shared prefix of x and y.
     """
-    for i, (a, b) in enumerate(zip(x, y)):
-        if a != b:
-            return x[:i]
-    else:
-        # matched all the way through. Return the shortest string
-        return x if len(x) < len(y) else y
+    return x[: shared_prefix_length(x, y)]
 
 
 @dataclass
@@ -187,9 +339,13 @@ def tree_search(n: Inner, p: memoryview) -> SearchResult:
     """Search for p down the tree rooted in n."""
     while p and p[0] in n.children:
         child = n.out_child(p)
-        z: memoryview = shared_prefix(child.edge_label, p)
-        if len(z) == len(p) or len(z) < len(child.edge_label):
-            w = child.edge_label[len(z) :]  # the edge is z + w
+        label = child.edge_label
+        z = label[: shared_prefix_length(label, p)]
+        # We stop at a mismatch, at the end of p, or at a leaf; the last
+        # case can only happen if p runs past the end of a string without
+        # a sentinel.
+        if len(z) == len(p) or len(z) < len(label) or is_leaf(child):
+            w = label[len(z) :]  # the edge is z + w
             return edge(child, z, w, p)
 
         assert is_inner(child)
@@ -198,16 +354,16 @@ def tree_search(n: Inner, p: memoryview) -> SearchResult:
     return node(n, p)
 
 
-def break_edge(leaf_label: int, n: Node, k: int, z: memoryview) -> Leaf:
+def break_edge(leaf_label: int, n: Node, k: int, z: int) -> Leaf:
     """
     Break an edge in two.
 
     Break the edge to node `n`, `k` characters down, adding a new leaf
-    with label `label` with edge `z`. Returns the new leaf.
+    with label `label` with edge `x[z:]`. Returns the new leaf.
     """
-    new_n = Inner(n.edge_label[:k])  # The node that splits the edge
-    new_leaf = Leaf(leaf_label, z)  # Remaining bit of other path
-    n.edge_label = n.edge_label[k:]  # Move start of n forward
+    new_n = Inner(n.x, n.start, n.start + k)  # The node that splits the edge
+    new_leaf = Leaf(leaf_label, n.x, z)  # Remaining bit of other path
+    n.start += k  # Move start of n forward
 
     assert n.parent is not None  # n must have a parent (n != root)
     n.parent.add_children(new_n)  # New node replaces n in n's parent
@@ -223,20 +379,20 @@ def break_edge(leaf_label: int, n: Node, k: int, z: memoryview) -> Leaf:
 
 def search_up(n: Node, length: int) -> tuple[Node, int]:
     """Move length up the tree starting at node n."""
-    while length and len(n.edge_label) <= length:
+    while length and n.end - n.start <= length:
         assert n.parent is not None  # This is mostly for the type checker...
-        length -= len(n.edge_label)
+        length -= n.end - n.start
         n = n.parent
     # Depth down the edge depends on whether we reached
-    depth = 0 if length == 0 else len(n.edge_label) - length
+    depth = 0 if length == 0 else n.end - n.start - length
     return n, depth
 
 
-def lcp_st_construction(s: String, sa: list[int], lcp: list[int]) -> SuffixTree:
+def lcp_st_construction(s: String, sa: Sequence[int], lcp: Sequence[int]) -> SuffixTree:
     """Construct a suffix tree from the suffix and lcp arrays."""
     x = s.view
-    root = Inner(x[0:0])
-    v = Leaf(sa[0], x[sa[0] :])
+    root = Inner(x, 0, 0)
+    v = Leaf(sa[0], x, sa[0])
     root.add_children(v)
 
     for i in range(1, len(sa)):
@@ -245,10 +401,10 @@ def lcp_st_construction(s: String, sa: list[int], lcp: list[int]) -> SuffixTree:
             # It is, but the type checker doesn't know yet...
             assert isinstance(n, Inner)
 
-            v = Leaf(sa[i], x[sa[i] + lcp[i] :])
+            v = Leaf(sa[i], x, sa[i] + lcp[i])
             n.add_children(v)
         else:
-            v = break_edge(sa[i], n, depth, x[sa[i] + lcp[i] :])
+            v = break_edge(sa[i], n, depth, sa[i] + lcp[i])
 
     return SuffixTree(s, root)
 
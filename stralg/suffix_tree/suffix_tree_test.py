@@ -16,32 +16,36 @@ from typing import Callable as Fn
 from typing import Iterator
 
 from stralg.searching import bmh
+from stralg.suffix_array import lcp_array, sais
 from stralg.suffix_tree.mccreight import mccreight_st_construction
 from stralg.suffix_tree.naive import naive_st_construction
-
-# from pystr.lcp import lcp_from_sa
-# from pystr.sais import sais
-from stralg.suffix_tree.suffix_tree import (  # lcp_st_construction,
+from stralg.suffix_tree.parallel import parallel_st_construction
+from stralg.suffix_tree.suffix_tree import (
     Inner,
     Leaf,
     SuffixTree,
+    is_inner,
+    lcp_st_construction,
+    shared_prefix_length,
 )
+from stralg.suffix_tree.ukkonen import online_suffix_tree, ukkonen_st_construction
 from stralg.views import Alphabet, String
 
 STConstructor = Fn[[String], SuffixTree]
 
 
-# def lcp_construction_wrapper(x: str) -> SuffixTree:
-#     """Construct lcp from suffix tree."""
-#     sa = sais(x)
-#     lcp = lcp_from_sa(x, sa)
-#     return lcp_st_construction(x, sa, lcp)
+def lcp_construction_wrapper(s: String) -> SuffixTree:
+    """Construct suffix tree from the suffix and lcp arrays."""
+    sa = sais(s)
+    return lcp_st_construction(s, sa, lcp_array(s, sa))
 
 
 ALGOS: list[STConstructor] = [
     naive_st_construction,
     mccreight_st_construction,
-    # lcp_construction_wrapper,
+    ukkonen_st_construction,
+    lcp_construction_wrapper,
+    parallel_st_construction,
 ]
 
 
@@ -195,3 +199,104 @@ def check_against_bmh(algo: STConstructor) -> Fn[[], None]:
 TestAgainstBMH = collect_tests(
     (strip_algo_name(algo.__name__), check_against_bmh(algo)) for algo in ALGOS
 )
+
+
+def test_deep_tree() -> None:
+    """Check that traversals of deep trees don't hit the recursion limit."""
+    s = Alphabet.map_string("a" * 5000)
+    st = mccreight_st_construction(s)
+    assert st == mccreight_st_construction(s)
+    assert list(st.root) == list(range(5000, -1, -1))
+    assert list(st.search("a" * 4999)) == [1, 0]
+    assert len(st.to_dot()) > 0
+
+
+def path_label(n: Inner) -> bytes:
+    """Get the path label of a node. Slow, but only for testing."""
+    res = b""
+    while n.parent is not None:
+        res = bytes(n.edge_label) + res
+        n = n.parent
+    return res
+
+
+def check_suffix_links(st: SuffixTree) -> None:
+    """Check that all inner nodes have correct suffix links."""
+    stack = [st.root]
+    while stack:
+        n = stack.pop()
+        if n.parent is not None:
+            assert n.suffix_link is not None
+            assert path_label(n.suffix_link) == path_label(n)[1:]
+        stack.extend(c for c in n.children.values() if is_inner(c))
+
+
+def test_ukkonen_suffix_links() -> None:
+    """Check suffix links set by Ukkonen's algorithm."""
+    for _ in range(10):
+        s = Alphabet.map_string(random_string(50, alpha="abc"))
+        check_suffix_links(ukkonen_st_construction(s))
+    check_suffix_links(ukkonen_st_construction(Alphabet.map_string("mississippi")))
+
+
+def test_online_suffix_tree() -> None:
+    """Check that we can search in an online tree as it grows."""
+    for _ in range(10):
+        x = random_string(60, alpha="abc")
+        st = online_suffix_tree(Alphabet(x), x[:5])
+        for i in range(5, len(x), 7):
+            st.extend(x[i : i + 7])
+            seen = x[: i + 7]
+            for p in ["a", "ab", "bca", "cc", "abcabc", seen[-3:], seen[:4], "d"]:
+                expected = [j for j in range(len(seen)) if seen.startswith(p, j)]
+                assert sorted(st.search(p)) == expected
+                assert st.count(p) == len(expected)
+            assert st.leaves is None  # searches don't finalize the tree
+        assert ("a" in st) == ("a" in x)
+
+        # Adding the sentinel gives us the full suffix tree
+        st.extend(chr(0))
+        assert st.remainder == 0
+        assert st == mccreight_st_construction(Alphabet.map_string(x))
+
+        # Trees built from the same text in different steps are equal
+        other = online_suffix_tree(Alphabet(x), x)
+        other.extend(chr(0))
+        assert st == other
+
+
+def test_finalize() -> None:
+    """Check leaf intervals and slices after finalizing."""
+    x = "mississippi"
+    for algo in ALGOS:
+        st = algo(Alphabet.map_string(x))
+        assert st.leaves is None
+        assert list(st.search("ssi")) == [5, 2]
+        assert st.leaves is not None
+        assert list(st.leaves) == list(sais(Alphabet.map_string(x)))
+        assert list(st.search("i")) == [10, 7, 4, 1]
+        assert st.count("ss") == 2
+        assert st.count("x") == st.count("sss") == 0
+        assert list(st.search("")) == list(st.leaves)
+
+        # Children are in sorted order and intervals nest
+        stack: list[Inner | Leaf] = [st.root]
+        while stack:
+            n = stack.pop()
+            assert list(st.leaves[n.lo : n.hi]) == list(n)
+            if is_inner(n):
+                assert list(n.children) == sorted(n.children)
+                stack.extend(n.children.values())
+
+
+def test_shared_prefix_length() -> None:
+    """Compare the block-wise shared prefix against a plain loop."""
+    for n in [0, 1, 2, 7, 8, 9, 100, 1000]:
+        x = memoryview(bytes(n))
+        assert shared_prefix_length(x, x) == n
+        assert shared_prefix_length(x, x[: n // 2]) == n // 2
+        for i in range(0, n, max(1, n // 20)):
+            y = bytearray(x)
+            y[i] = 1
+            assert shared_prefix_length(x, memoryview(y)) == i
+            assert shared_prefix_length(memoryview(y), x[: i + 1]) == i
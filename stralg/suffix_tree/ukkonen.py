@@ -0,0 +1,200 @@
+"""
+Ukkonen's online suffix tree construction.
+
+Ukkonen's algorithm adds one character at a time to the tree, so the
+tree can be queried while the text is still arriving. Between
+characters the tree is an implicit suffix tree: suffixes that are
+prefixes of other suffixes do not have leaves of their own yet. Leaves
+never need updating when the text grows because a leaf's edge always
+runs to the end of the string.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from ..views import Alphabet, String
+from .suffix_tree import (
+    Inner,
+    Leaf,
+    Node,
+    SuffixTree,
+    break_edge,
+    is_inner,
+    is_leaf,
+)
+
+
+@dataclass(eq=False)
+class OnlineSuffixTree(SuffixTree):
+    """
+    A suffix tree we can extend with more text.
+
+    The tree is searchable after every extension. Add the sentinel
+    (chr(0)) at the end of the text to turn it into a proper suffix tree
+    where every suffix has a leaf.
+    """
+
+    # Active point: we are active_length down the edge out of active_node
+    # that starts with x[active_edge].
+    active_node: Inner = field(init=False, repr=False)
+    active_edge: int = field(default=0, init=False, repr=False)
+    active_length: int = field(default=0, init=False, repr=False)
+
+    # Number of suffixes that do not have a leaf yet.
+    remainder: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Set up the active point and insert any text we already have."""
+        self.active_node = self.root
+        for i in range(len(self.s.x)):
+            self._add(i)
+
+    def _add(self, i: int) -> None:
+        """Update the tree after the string grew with x[i]."""
+        x, root = self.s.x, self.root
+        a = x[i]
+        need_link: Inner | None = None  # new inner node without a suffix link
+
+        self.remainder += 1
+        while self.remainder:
+            if self.active_length == 0:
+                self.active_edge = i
+
+            n = self.active_node
+            if x[self.active_edge] not in n.children:
+                # No edge to follow, so the suffix gets a leaf here
+                n.add_children(Leaf(i - self.remainder + 1, x, i))
+                if need_link is not None:
+                    need_link.suffix_link = n
+                need_link = None
+
+            else:
+                child = n.children[x[self.active_edge]]
+                k = child.end - child.start
+                if self.active_length >= k:
+                    # Skip to the next node and try again from there
+                    assert is_inner(child)
+                    self.active_node = child
+                    self.active_edge += k
+                    self.active_length -= k
+                    continue
+
+                if x[child.start + self.active_length] == a:
+                    # The suffix is already there, and so are all shorter
+                    # ones, so we are done for this character
+                    if need_link is not None:
+                        need_link.suffix_link = n
+                    self.active_length += 1
+                    break
+
+                leaf = break_edge(i - self.remainder + 1, child, self.active_length, i)
+                assert leaf.parent is not None
+                if need_link is not None:
+                    need_link.suffix_link = leaf.parent
+                need_link = leaf.parent
+
+            self.remainder -= 1
+            if n is root and self.active_length > 0:
+                self.active_length -= 1
+                self.active_edge = i - self.remainder + 1
+            elif n is not root:
+                assert n.suffix_link is not None
+                self.active_node = n.suffix_link
+
+    def extend(self, chars: str) -> None:
+        """Append chars to the text, updating the tree."""
+        x = self.s.x
+        assert isinstance(x, bytearray), "Online trees need a growable string"
+        start = len(x)
+        x.extend(self.s.alpha.encode(chars, with_sentinel=False))
+        for i in range(start, len(x)):
+            self._add(i)
+        self.leaves = None  # the leaf intervals are out of date
+
+    def _locus(self, p: bytes) -> Optional[Node]:
+        """Find the node at or just below the end of the path p, if any."""
+        # Edge labels would be copies of the growing bytearray, and a
+        # leaf's runs to the end of the text, so we compare in place
+        # and only as far as p goes.
+        x = memoryview(self.s.x)
+        try:
+            n: Node = self.root
+            i = 0
+            while i < len(p):
+                if not is_inner(n) or p[i] not in n.children:
+                    return None
+                n = n.children[p[i]]
+                k = min(n.end - n.start, len(p) - i)
+                if x[n.start : n.start + k] != p[i : i + k]:
+                    return None
+                i += k
+            return n
+        finally:
+            x.release()  # so the text can grow again
+
+    def search(self, p: str) -> Iterator[int]:  # type: ignore
+        """
+        Find all occurences of p in the text seen so far.
+
+        We collect the leaves below p's locus instead of finalizing the
+        tree, which would take time proportional to the text after every
+        extension. The occurrences are in no particular order.
+        """
+        try:
+            p_ = bytes(self.s.alpha.encode(p, with_sentinel=False))
+        except KeyError:
+            return
+        n = self._locus(p_)
+        stack = [] if n is None else [n]
+        while stack:
+            m = stack.pop()
+            if is_leaf(m):
+                yield m.leaf_label
+            else:
+                assert is_inner(m)
+                stack.extend(m.children.values())
+
+        # The suffixes that don't have leaves yet are not covered
+        # by the search in the tree, so we check those directly.
+        x = self.s.x
+        for j in range(len(x) - self.remainder, len(x)):
+            if x[j : j + len(p_)] == p_:
+                yield j
+
+    def count(self, p: str) -> int:
+        """Count the occurrences of p in the text seen so far."""
+        return sum(1 for _ in self.search(p))
+
+    def __contains__(self, p: str) -> bool:
+        """Test if p occurs in the text seen so far."""
+        # Every substring is a path in the tree, leaf or not
+        try:
+            p_ = bytes(self.s.alpha.encode(p, with_sentinel=False))
+        except KeyError:
+            return False
+        return self._locus(p_) is not None
+
+
+def online_suffix_tree(alpha: Alphabet, x: str = "") -> OnlineSuffixTree:
+    """Create an online suffix tree over alpha, starting with text x."""
+    s = String(alpha, alpha.encode(x, with_sentinel=False))
+    root = Inner(s.x, 0, 0)  # type: ignore
+    root.suffix_link = root
+    return OnlineSuffixTree(s, root)
+
+
+def ukkonen_st_construction(s: String) -> SuffixTree:
+    """
+    Construct a suffix tree with Ukkonen's algorithm.
+
+    We don't need a growable string when we have all of it up front.
+    Leaves' edges run to the end of the full string from the start,
+    but the algorithm never looks past the current character.
+    """
+    x = s.view
+    root = Inner(x, 0, 0)
+    root.suffix_link = root
+    tree = OnlineSuffixTree(String(s.alpha, x), root)
+    return SuffixTree(s, tree.root)
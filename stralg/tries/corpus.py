@@ -0,0 +1,221 @@
+"""
+Scanning many documents with one Aho-Corasick automaton.
+
+The automaton is flattened into integer tables (a full goto/DFA table,
+labels and out-lists) so it can be placed in shared memory and read by
+a pool of worker processes without copying or pickling any trie nodes.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, Sequence
+
+from .aho_corasick import annotate_trie
+from .trie import Trie, TrieNode, depth_first_trie
+
+NO_STATE = -1  # Marks a missing label or the end of an out-list.
+
+
+@dataclass
+class FlatAutomaton:
+    """
+    An Aho-Corasick automaton as flat integer tables.
+
+    States are numbered breadth-first with the root as state 0. Column 0
+    of the goto table is used for characters that are not in any pattern;
+    those always take us back to the root.
+    """
+
+    cmap: dict[str, int]  # character -> column in the goto table
+    sigma: int  # number of columns in the goto table
+    delta: array  # delta[state * sigma + column] -> next state
+    label: array  # label[state] -> pattern label or NO_STATE
+    out: array  # out[state] -> next labelled state in out-list or NO_STATE
+    lengths: array  # lengths[label] -> length of pattern
+
+    @property
+    def states(self) -> int:
+        """Return the number of states in the automaton."""
+        return len(self.label)
+
+    def scan(self, x: str) -> Iterator[tuple[int, int]]:
+        """Scan x and report (label, position) like aho_corasick does."""
+        return _scan(
+            x, self.cmap, self.sigma, self.delta, self.label, self.out, self.lengths
+        )
+
+
+def flatten(trie: Trie) -> FlatAutomaton:
+    """Flatten a trie annotated with suffix links and out-lists."""
+    # Number nodes breadth-first, so suffix links always point
+    # to a node with a smaller number than the node itself.
+    order: list[TrieNode] = []
+    depth: list[int] = []
+    index: dict[int, int] = {}
+    queue = deque([(trie.root, 0)])
+    while queue:
+        n, d = queue.popleft()
+        index[id(n)] = len(order)
+        order.append(n)
+        depth.append(d)
+        queue.extend((child, d + 1) for child in n.children.values())
+
+    letters = sorted({a for n in order for a in n.children})
+    cmap = {a: i + 1 for i, a in enumerate(letters)}
+    sigma = len(cmap) + 1
+
+    delta = array("i", [0]) * (len(order) * sigma)
+    for s, n in enumerate(order):
+        row = s * sigma
+        if n.suffix_link is not None and not n.is_root:
+            # Missing edges go where the suffix link would take us.
+            fail = index[id(n.suffix_link)] * sigma
+            delta[row : row + sigma] = delta[fail : fail + sigma]
+        for a, child in n.children.items():
+            delta[row + cmap[a]] = index[id(child)]
+
+    label = array("i", (NO_STATE if n.label is None else n.label for n in order))
+    out = array(
+        "i", (NO_STATE if n.out_list is None else index[id(n.out_list)] for n in order)
+    )
+    # The length of a pattern is the depth of the node that holds its label.
+    lengths = array("i", [0]) * (max(label, default=NO_STATE) + 1)
+    for s, lab in enumerate(label):
+        if lab != NO_STATE:
+            lengths[lab] = depth[s]
+
+    return FlatAutomaton(cmap, sigma, delta, label, out, lengths)
+
+
+def flat_automaton(*p: str) -> FlatAutomaton:
+    """Build a flat Aho-Corasick automaton for the patterns p."""
+    return flatten(annotate_trie(depth_first_trie(*p)))
+
+
+def _scan(
+    x: str,
+    cmap: dict[str, int],
+    sigma: int,
+    delta: Sequence[int],
+    label: Sequence[int],
+    out: Sequence[int],
+    lengths: Sequence[int],
+) -> Iterator[tuple[int, int]]:
+    """Run the flat automaton over x."""
+    if label[0] != NO_STATE:
+        # The empty string is in the pattern set
+        yield (label[0], 0)
+
+    state = 0
+    for i, a in enumerate(x):
+        state = delta[state * sigma + cmap.get(a, 0)]
+        s = state if label[state] != NO_STATE else out[state]
+        while s != NO_STATE:
+            yield (label[s], i - lengths[label[s]] + 1)
+            s = out[s]
+
+
+# SECTION Worker processes
+
+# State for worker processes, set up by _attach when the worker starts.
+_worker: dict[str, object] = {}
+
+
+def _attach(name: str, cmap: dict[str, int], sizes: tuple[int, int, int]) -> None:
+    """Attach a worker process to the shared automaton tables."""
+    shm = SharedMemory(name=name)
+    ints = shm.buf.cast("i")
+    sigma, states, patterns = sizes
+    delta_end = states * sigma
+    _worker.update(
+        shm=shm,  # keep the segment alive for as long as the worker lives
+        cmap=cmap,
+        sigma=sigma,
+        delta=ints[:delta_end],
+        label=ints[delta_end : delta_end + states],
+        out=ints[delta_end + states : delta_end + 2 * states],
+        lengths=ints[delta_end + 2 * states : delta_end + 2 * states + patterns],
+    )
+
+
+def _scan_batch(batch: tuple[int, list[str]]) -> list[tuple[int, int, int]]:
+    """Scan a batch of documents in a worker process."""
+    first, docs = batch
+    w = _worker
+    return [
+        (doc_id, lab, pos)
+        for doc_id, x in enumerate(docs, start=first)
+        for lab, pos in _scan(
+            x,
+            w["cmap"],  # type: ignore
+            w["sigma"],  # type: ignore
+            w["delta"],  # type: ignore
+            w["label"],  # type: ignore
+            w["out"],  # type: ignore
+            w["lengths"],  # type: ignore
+        )
+    ]
+
+
+def _batches(docs: Iterable[str], batch_size: int) -> Iterator[tuple[int, list[str]]]:
+    """Split docs into batches, each tagged with the id of its first document."""
+    it, first = iter(docs), 0
+    while batch := list(islice(it, batch_size)):
+        yield first, batch
+        first += len(batch)
+
+
+def _share(automaton: FlatAutomaton) -> SharedMemory:
+    """Copy the automaton tables into a new shared memory segment."""
+    tables = (automaton.delta, automaton.label, automaton.out, automaton.lengths)
+    size = sum(len(t) for t in tables) * automaton.delta.itemsize
+    shm = SharedMemory(create=True, size=max(size, 1))
+    offset = 0
+    for t in tables:
+        data = t.tobytes()
+        shm.buf[offset : offset + len(data)] = data
+        offset += len(data)
+    return shm
+
+
+# !SECTION
+
+
+def scan_corpus(
+    docs: Iterable[str],
+    automaton: FlatAutomaton,
+    workers: int = 1,
+    batch_size: int = 256,
+) -> Iterator[tuple[int, int, int]]:
+    """
+    Scan a corpus of documents for all patterns in the automaton.
+
+    Yields (doc_id, label, pos) for every occurrence, where doc_id is the
+    index of the document in docs. Results come in document order, and
+    within a document in the order aho_corasick would report them.
+
+    With more than one worker, the automaton tables are placed in shared
+    memory and batches of batch_size documents are scanned by a process
+    pool; results are streamed back as the batches finish.
+    """
+    if workers <= 1:
+        for doc_id, x in enumerate(docs):
+            for lab, pos in automaton.scan(x):
+                yield (doc_id, lab, pos)
+        return
+
+    shm = _share(automaton)
+    sizes = (automaton.sigma, automaton.states, len(automaton.lengths))
+    try:
+        with Pool(workers, _attach, (shm.name, automaton.cmap, sizes)) as pool:
+            for hits in pool.imap(_scan_batch, _batches(docs, batch_size)):
+                yield from hits
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,42 @@
+"""Test scanning corpora with a flat Aho-Corasick automaton."""
+
+from test.helpers import pick_random_patterns, random_string
+
+from stralg.tries.aho_corasick import aho_corasick
+from stralg.tries.corpus import flat_automaton, scan_corpus
+
+
+def expected_hits(docs: list[str], pats: list[str]) -> list[tuple[int, int, int]]:
+    """Get the hits by running aho_corasick on each document."""
+    return [
+        (doc_id, label, pos)
+        for doc_id, x in enumerate(docs)
+        for label, pos in aho_corasick(x, *pats)
+    ]
+
+
+def test_flat_scan() -> None:
+    """Check that the flat automaton reports what aho_corasick reports."""
+    x = "abcabcab"
+    pats = ["abc", "a", "b", "", "cab"]
+    automaton = flat_automaton(*pats)
+    assert list(automaton.scan(x)) == list(aho_corasick(x, *pats))
+    assert list(automaton.scan("xyz")) == list(aho_corasick("xyz", *pats))
+
+    for _ in range(10):
+        x = random_string(100, alpha="abcd")
+        pats = list(set(pick_random_patterns(x, 10)))
+        automaton = flat_automaton(*pats)
+        assert list(automaton.scan(x)) == list(aho_corasick(x, *pats))
+
+
+def test_scan_corpus() -> None:
+    """Check that sequential and parallel scans agree with aho_corasick."""
+    docs = [random_string(50, alpha="abcd") for _ in range(40)]
+    pats = list(set(pick_random_patterns("".join(docs), 10)))
+    automaton = flat_automaton(*pats)
+    expected = expected_hits(docs, pats)
+
+    assert list(scan_corpus(docs, automaton)) == expected
+    assert list(scan_corpus(iter(docs), automaton, workers=2, batch_size=7)) == expected
+    assert list(scan_corpus([], automaton, workers=2)) == []
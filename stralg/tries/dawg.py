@@ -0,0 +1,216 @@
+"""
+Minimized tries (DAWGs, or acyclic minimal automata).
+
+A trie shares prefixes but not suffixes. Merging all equivalent
+sub-tries, i.e., nodes from which we can spell the same set of strings,
+gives the smallest automaton that recognises the same set of strings.
+
+Since nodes are shared, they cannot hold labels. Instead, each node
+counts the strings we can spell from it, and with those counts we can
+map each string to its rank in the sorted set of strings (a minimal
+perfect hash) and back again.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .trie import Trie
+
+Signature = tuple[bool, tuple[tuple[str, int], ...]]
+
+
+@dataclass(eq=False, slots=True)
+class DawgNode:
+    """A node in a DAWG. Children are kept in sorted order."""
+
+    final: bool = False
+    children: dict[str, DawgNode] = field(default_factory=dict)
+
+    # Number of strings we can spell from this node.
+    count: int = 0
+
+    def signature(self) -> Signature:
+        """
+        Get a key that identifies the strings we can spell from here.
+
+        This only works when all children are already minimized, since
+        we use the identity of children in the key.
+        """
+        return (self.final, tuple((a, id(n)) for a, n in self.children.items()))
+
+
+@dataclass(eq=False)
+class Dawg:
+    """A minimized trie with minimal perfect hashing of its strings."""
+
+    root: DawgNode
+
+    # labels[i] is the label of the string with rank i. If None, the label
+    # of a string is its rank.
+    labels: Optional[array] = None
+
+    def __len__(self) -> int:
+        """Return the number of strings in the DAWG."""
+        return self.root.count
+
+    def __contains__(self, x: str) -> bool:
+        """Test if x is in the DAWG."""
+        n: Optional[DawgNode] = self.root
+        for a in x:
+            n = n.children.get(a)  # type: ignore
+            if n is None:
+                return False
+        return n.final  # type: ignore
+
+    def index(self, x: str) -> int:
+        """
+        Get the rank of x among the strings in the DAWG.
+
+        Raises a KeyError if x is not in the DAWG.
+        """
+        n, rank = self.root, 0
+        for a in x:
+            # Count the strings that end here or go through a smaller letter
+            rank += n.final
+            for b, child in n.children.items():
+                if b == a:
+                    n = child
+                    break
+                rank += child.count
+            else:
+                raise KeyError(x)
+        if not n.final:
+            raise KeyError(x)
+        return rank
+
+    def key(self, rank: int) -> str:
+        """Get the string with the given rank. This is the inverse of index."""
+        if not 0 <= rank < len(self):
+            raise IndexError(rank)
+        n, res = self.root, []
+        while not (n.final and rank == 0):
+            rank -= n.final
+            for a, child in n.children.items():
+                if rank < child.count:
+                    res.append(a)
+                    n = child
+                    break
+                rank -= child.count
+        return "".join(res)
+
+    def label(self, x: str) -> int:
+        """Get the label of x. Raises a KeyError if x is not in the DAWG."""
+        rank = self.index(x)
+        return rank if self.labels is None else self.labels[rank]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate through the strings in sorted order."""
+        stack = [(self.root, "")]
+        while stack:
+            n, x = stack.pop()
+            if n.final:
+                yield x
+            for a, child in reversed(n.children.items()):
+                stack.append((child, x + a))
+
+    def nodes(self) -> int:
+        """Count the distinct nodes in the DAWG."""
+        seen, stack = {id(self.root)}, [self.root]
+        while stack:
+            for child in stack.pop().children.values():
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append(child)
+        return len(seen)
+
+
+def _register(register: dict[Signature, DawgNode], n: DawgNode) -> DawgNode:
+    """Get the representative of n's equivalence class, setting n's count."""
+    n.count = int(n.final) + sum(c.count for c in n.children.values())
+    return register.setdefault(n.signature(), n)
+
+
+def minimize_trie(trie: Trie) -> Dawg:
+    """Build the DAWG with the same strings as trie."""
+    register: dict[Signature, DawgNode] = {}
+    labels = array("q")
+
+    # Depth-first traversal in sorted order. We build a DawgNode
+    # when we first see a trie node, and replace it with its
+    # representative when we are done with its children.
+    root = DawgNode()
+    stack = [(trie.root, root, "", False)]
+    parents: list[DawgNode] = []
+    while stack:
+        tn, dn, a, done = stack.pop()
+        if done:
+            parents.pop()
+            rep = _register(register, dn)
+            if parents:
+                parents[-1].children[a] = rep
+            continue
+
+        if tn.label is not None:
+            dn.final = True
+            labels.append(tn.label)
+        if parents:
+            parents[-1].children[a] = dn
+        parents.append(dn)
+        stack.append((tn, dn, a, True))
+        for b in sorted(tn.children, reverse=True):
+            stack.append((tn[b], DawgNode(), b, False))
+
+    return Dawg(root, labels)
+
+
+def dawg_from_sorted(strings: Iterable[str]) -> Dawg:
+    """
+    Build a DAWG directly from sorted strings.
+
+    This is the incremental algorithm by Daciuk et al. It works like
+    trie_from_sorted, but when a node leaves the path to the previous
+    string, its sub-trie is complete and we replace it by an equivalent
+    node if we have seen one before. Only the path to the previous
+    string is ever not minimized, so memory is proportional to the size
+    of the DAWG, not the trie.
+
+    The label of a string is its rank among the distinct input strings.
+    """
+    register: dict[Signature, DawgNode] = {}
+    root = DawgNode()
+    path: list[tuple[str, DawgNode]] = [("", root)]
+    prev = None
+    for x in strings:
+        if prev is not None and x <= prev:
+            if x == prev:
+                continue  # duplicates are just ignored
+            raise ValueError(f"Input is not sorted: {x!r} comes after {prev!r}")
+
+        lcp = 0
+        for a, b in zip(x, prev or ""):
+            if a != b:
+                break
+            lcp += 1
+
+        while len(path) > lcp + 1:
+            a, n = path.pop()
+            path[-1][1].children[a] = _register(register, n)
+
+        n = path[-1][1]
+        for a in x[lcp:]:
+            n.children[a] = child = DawgNode()
+            path.append((a, child))
+            n = child
+        n.final = True
+        prev = x
+
+    while len(path) > 1:
+        a, n = path.pop()
+        path[-1][1].children[a] = _register(register, n)
+    _register(register, root)
+
+    return Dawg(root)
@@ -0,0 +1,58 @@
+"""Test minimized tries."""
+
+from test.helpers import random_string
+
+import pytest
+
+from stralg.tries.dawg import dawg_from_sorted
+from stralg.tries.trie import depth_first_trie
+
+
+def check_dawg(words: list[str]) -> None:
+    """Check a DAWG built from words against the trie it came from."""
+    trie = depth_first_trie(*words)
+    dawg = trie.minimize()
+    keys = sorted(set(words))
+
+    assert len(dawg) == len(keys)
+    assert list(dawg) == keys
+    for i, w in enumerate(keys):
+        assert w in dawg
+        assert dawg.index(w) == i
+        assert dawg.key(i) == w
+        assert dawg.label(w) == trie.find(w).label  # type: ignore
+    for w in ["x", "abx", "abcabcabc"]:
+        if w not in keys:
+            assert w not in dawg
+            with pytest.raises(KeyError):
+                dawg.index(w)
+
+    streamed = dawg_from_sorted(iter(keys))
+    assert list(streamed) == keys
+    assert streamed.nodes() == dawg.nodes()  # the minimal DAWG is unique
+    for i, w in enumerate(keys):
+        assert streamed.label(w) == i
+
+
+def test_dawg() -> None:
+    """Test DAWGs on small examples."""
+    check_dawg(["tap", "taps", "top", "tops"])
+    check_dawg(["", "a", "ab", "b"])
+    check_dawg(["foo", "bar", "foobar", "baz", "foo"])
+
+    dawg = depth_first_trie("tap", "taps", "top", "tops").minimize()
+    assert dawg.nodes() == 5  # root, t, a and o merged, p, and s
+    with pytest.raises(IndexError):
+        dawg.key(4)
+
+
+def test_dawg_random() -> None:
+    """Test DAWGs on random sets of strings."""
+    for _ in range(10):
+        check_dawg([random_string(6, alpha="abc") for _ in range(50)])
+
+
+def test_dawg_from_unsorted() -> None:
+    """Unsorted input is an error."""
+    with pytest.raises(ValueError):
+        dawg_from_sorted(["b", "a"])
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
 from dataclasses import dataclass, field
-from typing import NamedTuple, Optional
+from math import inf
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from .dawg import Dawg, minimize_trie
 
 LS = NamedTuple("LS", [("label", int), ("x", memoryview)])
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class TrieNode:
     """Representation of a node in a trie."""
 
@@ -21,6 +26,13 @@ class TrieNode:
     suffix_link: Optional[TrieNode] = field(default=None, repr=False)
     out_list: Optional[TrieNode] = field(default=None, repr=False)
 
+    # Annotations for prefix queries: the weight of the string that ends
+    # here (if label is not None), the number of strings in the sub-trie
+    # rooted here, and the largest weight of any string in it.
+    weight: float = field(default=0.0, repr=False)
+    count: int = field(default=0, repr=False)
+    max_weight: float = field(default=-inf, repr=False)
+
     @property
     def is_root(self) -> bool:
         """Tell if this node is the root of its trie."""
@@ -42,28 +54,33 @@ class TrieNode:
 
     def to_dot(self, res: list[str]) -> list[str]:
         """Make a dot representation of the trie."""
-        if self.label is None:
-            res.append(f'{id(self)}[label="", shape=point]')
-        else:
-            res.append(f'{id(self)}[label="{self.label}", shape=circle]')
+        # Explicit stack rather than recursion, so deep tries
+        # don't exceed the recursion limit.
+        stack = [self]
+        while stack:
+            n = stack.pop()
+            if n.label is None:
+                res.append(f'{id(n)}[label="", shape=point]')
+            else:
+                res.append(f'{id(n)}[label="{n.label}", shape=circle]')
 
-        if self.suffix_link is not None and not self.suffix_link.is_root:
-            res.append(
-                f"{id(self)} -> {id(self.suffix_link)}[style=dotted, color=red]"
-            )  # noqa: E501 pylint:disable=line-too-long
-        if self.out_list is not None:
+            if n.suffix_link is not None and not n.suffix_link.is_root:
+                res.append(
+                    f"{id(n)} -> {id(n.suffix_link)}[style=dotted, color=red]"
+                )  # noqa: E501 pylint:disable=line-too-long
+            if n.out_list is not None:
+                res.append(
+                    f"{id(n)} -> {id(n.out_list)}[style=dotted, color=green]"
+                )  # noqa: E501 pylint:disable=line-too-long
+
+            for k, child in n.children.items():
+                res.append(f'{id(n)} -> {id(child)}[label="{k}"]')
             res.append(
-                f"{id(self)} -> {id(self.out_list)}[style=dotted, color=green]"
-            )  # noqa: E501 pylint:disable=line-too-long
-
-        for k, n in self.children.items():
-            res.append(f'{id(self)} -> {id(n)}[label="{k}"]')
-            n.to_dot(res)
-        res.append(
-            "{ rank = same;"
-            + ";".join(str(id(n)) for n in self.children.values())
-            + "}"
-        )
+                "{ rank = same;"
+                + ";".join(str(id(child)) for child in n.children.values())
+                + "}"
+            )
+            stack.extend(reversed(n.children.values()))
 
         return res
 
@@ -71,9 +88,13 @@ class TrieNode:
         """Test of self is equivalent to other."""
         if not isinstance(other, TrieNode):  # pragma: no cover
             raise NotImplementedError()
-        return sorted(self.children) == sorted(other.children) and all(
-            self[k] == other[k] for k in self.children
-        )
+        stack = [(self, other)]
+        while stack:
+            n, m = stack.pop()
+            if sorted(n.children) != sorted(m.children):
+                return False
+            stack.extend((n[k], m[k]) for k in n.children)
+        return True
 
 
 @dataclass(eq=False)
@@ -82,23 +103,133 @@ class Trie:
 
     root: TrieNode = field(default_factory=TrieNode)
 
-    def insert(self, x: str, label: int) -> None:
-        """Insert a new string x, with label, into the trie."""
+    def insert(self, x: str, label: int, weight: float = 0.0) -> None:
+        """Insert a new string x, with label and weight, into the trie."""
         n = self.root
         for a in x:
             if a not in n:
                 n[a] = TrieNode(parent=n)
             n = n[a]
-        n.label = label
+
+        is_new, old_weight = n.label is None, n.weight
+        n.label, n.weight = label, weight
+
+        # Update the annotations on the path back to the root.
+        m: Optional[TrieNode] = n
+        while m is not None:
+            if is_new:
+                m.count += 1
+            if is_new or weight >= old_weight:
+                m.max_weight = max(m.max_weight, weight)
+            else:
+                # The weight went down, so we must recompute the maximum.
+                m.max_weight = max(
+                    (c.max_weight for c in m.children.values()),
+                    default=-inf,
+                )
+                if m.label is not None:
+                    m.max_weight = max(m.max_weight, m.weight)
+            m = m.parent
+
+    def find(self, prefix: str) -> Optional[TrieNode]:
+        """Find the node at the end of the path prefix, if there is one."""
+        n = self.root
+        for a in prefix:
+            if a not in n:
+                return None
+            n = n[a]
+        return n
 
     def __contains__(self, x: str) -> bool:
         """Test if x is in the trie."""
-        n = self.root
-        for a in x:
+        n = self.find(x)
+        return n is not None and n.label is not None
+
+    def count_prefix(self, prefix: str) -> int:
+        """Count the strings that have prefix as a prefix in O(|prefix|)."""
+        n = self.find(prefix)
+        return 0 if n is None else n.count
+
+    def keys_with_prefix(
+        self, prefix: str, limit: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Iterate through the strings that start with prefix.
+
+        The strings are reported in lexicographical order, and at most
+        limit strings are reported if limit is given.
+        """
+        n = self.find(prefix)
+        if n is None or limit == 0:
+            return
+        reported = 0
+        stack = [(n, prefix)]
+        while stack:
+            n, x = stack.pop()
+            if n.label is not None:
+                yield x
+                reported += 1
+                if reported == limit:
+                    return
+            # Push in reverse order so the smallest letter is popped first
+            for a in sorted(n.children, reverse=True):
+                stack.append((n[a], x + a))
+
+    def longest_prefix_of(self, text: str) -> Optional[str]:
+        """Find the longest string in the trie that is a prefix of text."""
+        n, longest = self.root, None
+        if n.label is not None:
+            longest = 0
+        for i, a in enumerate(text):
             if a not in n:
-                return False
+                break
             n = n[a]
-        return n.label is not None
+            if n.label is not None:
+                longest = i + 1
+        return None if longest is None else text[:longest]
+
+    def autocomplete(self, prefix: str, k: int) -> Iterator[tuple[str, float]]:
+        """
+        Report the k heaviest strings that start with prefix.
+
+        The strings are reported as (string, weight) pairs in decreasing
+        order of weight. The search is best-first on the max_weight
+        annotations, so it only explores the parts of the trie that can
+        contain one of the k heaviest strings.
+        """
+        n = self.find(prefix)
+        if n is None or n.count == 0 or k <= 0:
+            return
+
+        # Entries are (-weight, tie-breaker, node, path, is_string). An
+        # entry for a sub-trie has the best weight found below it, so when
+        # a string entry is popped, no heavier string remains.
+        tie = itertools.count()
+        heap = [(-n.max_weight, next(tie), n, prefix, False)]
+        while heap:
+            w, _, n, x, is_string = heapq.heappop(heap)
+            if is_string:
+                yield (x, -w)
+                k -= 1
+                if k == 0:
+                    return
+                continue
+            if n.label is not None:
+                heapq.heappush(heap, (-n.weight, next(tie), n, x, True))
+            for a, child in n.children.items():
+                if child.count:
+                    entry = (-child.max_weight, next(tie), child, x + a, False)
+                    heapq.heappush(heap, entry)
+
+    def minimize(self) -> Dawg:
+        """
+        Merge equivalent sub-tries into a DAWG.
+
+        The DAWG recognises the same strings as the trie, and
+        Dawg.label gives the same labels, but all shared suffixes
+        are stored only once.
+        """
+        return minimize_trie(self)
 
     def to_dot(self) -> str:
         """Create a dot representation of the trie."""
@@ -119,3 +250,54 @@ def depth_first_trie(*strings: str) -> Trie:
         trie.insert(x, i)
 
     return trie
+
+
+def _annotate(n: TrieNode) -> None:
+    """Set the count and max_weight of n from its (complete) children."""
+    weights = [c.max_weight for c in n.children.values()]
+    if n.label is not None:
+        weights.append(n.weight)
+    n.count = int(n.label is not None) + sum(c.count for c in n.children.values())
+    n.max_weight = max(weights, default=-inf)
+
+
+def trie_from_sorted(strings: Iterable[str]) -> Trie:
+    """
+    Build a trie from strings in sorted order.
+
+    Labels are the positions of the strings in the input, as with
+    depth_first_trie. Since the input is sorted, each string shares as
+    much as possible with the one before it, so we keep the path to the
+    previous string on a stack and only add the new suffix. The nodes
+    we pop off the stack are complete, so that is also where we set the
+    count and max_weight annotations. The construction is linear in the
+    total length of the input and reads it as a stream.
+    """
+    trie = Trie()
+    path, prev = [trie.root], ""
+    for i, x in enumerate(strings):
+        if x < prev:
+            raise ValueError(f"Input is not sorted: {x!r} comes after {prev!r}")
+
+        # Length of the prefix x shares with the previous string.
+        lcp = 0
+        for a, b in zip(x, prev):
+            if a != b:
+                break
+            lcp += 1
+
+        while len(path) > lcp + 1:
+            _annotate(path.pop())
+
+        n = path[-1]
+        for a in x[lcp:]:
+            n[a] = TrieNode(parent=n)
+            n = n[a]
+            path.append(n)
+        n.label = i
+        prev = x
+
+    while path:
+        _annotate(path.pop())
+
+    return trie
@@ -3,7 +3,9 @@
 from test.helpers import random_string
 from typing import Callable as Fn
 
-from stralg.tries.trie import Trie, TrieNode, depth_first_trie
+import pytest
+
+from stralg.tries.trie import Trie, TrieNode, depth_first_trie, trie_from_sorted
 
 # FIXME: make ... a variadic tuple of strings...
 TrieConstructor = Fn[..., Trie]
@@ -135,3 +137,92 @@ def check_suffix_links_random(constr: TrieConstructor) -> None:
 def test_suffix_links_random() -> None:
     """Check suffix links on random tries, depth-first."""
     check_suffix_links_random(depth_first_trie)
+
+
+def test_prefix_queries() -> None:
+    """Test counting, listing and longest prefixes."""
+    words = ["foo", "bar", "foobar", "fob", "baz", "f", "foo"]
+    trie = depth_first_trie(*words)
+    assert trie.count_prefix("") == 6
+    assert trie.count_prefix("f") == 4
+    assert trie.count_prefix("foo") == 2
+    assert trie.count_prefix("x") == 0
+
+    assert list(trie.keys_with_prefix("fo")) == ["fob", "foo", "foobar"]
+    assert list(trie.keys_with_prefix("f", limit=2)) == ["f", "fob"]
+    assert list(trie.keys_with_prefix("f", limit=0)) == []
+    assert list(trie.keys_with_prefix("x")) == []
+
+    assert trie.longest_prefix_of("foobaz") == "foo"
+    assert trie.longest_prefix_of("foobarbaz") == "foobar"
+    assert trie.longest_prefix_of("fx") == "f"
+    assert trie.longest_prefix_of("x") is None
+    trie.insert("", 7)
+    assert trie.longest_prefix_of("x") == ""
+
+
+def test_prefix_queries_random() -> None:
+    """Compare prefix queries against brute force."""
+    for _ in range(10):
+        words = sorted({random_string(5, alpha="abc") for _ in range(30)})
+        trie = depth_first_trie(*words)
+        for p in ["", "a", "ab", "ba", "ccc", "abcab"]:
+            expected = [w for w in words if w.startswith(p)]
+            assert trie.count_prefix(p) == len(expected)
+            assert list(trie.keys_with_prefix(p)) == expected
+            assert list(trie.keys_with_prefix(p, limit=3)) == expected[:3]
+
+
+def test_autocomplete() -> None:
+    """Test top-k autocompletion by weight."""
+    trie = Trie()
+    weights = {"car": 5.0, "cart": 9.0, "carbon": 1.0, "cat": 7.0, "dog": 10.0}
+    for i, (w, weight) in enumerate(weights.items()):
+        trie.insert(w, i, weight)
+
+    assert list(trie.autocomplete("ca", 2)) == [("cart", 9.0), ("cat", 7.0)]
+    assert list(trie.autocomplete("", 1)) == [("dog", 10.0)]
+    assert [w for w, _ in trie.autocomplete("car", 10)] == ["cart", "car", "carbon"]
+    assert list(trie.autocomplete("x", 3)) == []
+    assert trie.root.max_weight == 10.0
+
+    # Lowering a weight must update the annotations on the path.
+    trie.insert("cart", 1, 0.0)
+    assert trie.root["c"].max_weight == 7.0
+    assert list(trie.autocomplete("car", 2)) == [("car", 5.0), ("carbon", 1.0)]
+    assert trie.count_prefix("car") == 3
+
+
+def test_trie_from_sorted() -> None:
+    """Check that building from sorted input gives the same trie."""
+    for _ in range(10):
+        words = sorted(random_string(6, alpha="abc") for _ in range(40))
+        trie = trie_from_sorted(iter(words))
+        expected = depth_first_trie(*words)
+        assert trie == expected
+        check_suffix_links(trie.root)  # checks parent pointers too
+        for w in words:
+            assert w in trie
+            n = trie.find(w)
+            assert n is not None and n.label == expected.find(w).label  # type: ignore
+        for p in ["", "a", "ab", "cc"]:
+            assert trie.count_prefix(p) == expected.count_prefix(p)
+            assert list(trie.keys_with_prefix(p)) == list(expected.keys_with_prefix(p))
+
+    assert trie_from_sorted([]) == Trie()
+    assert "" in trie_from_sorted(["", "a"])
+
+
+def test_trie_from_unsorted() -> None:
+    """Unsorted input is an error."""
+    with pytest.raises(ValueError):
+        trie_from_sorted(["b", "a"])
+
+
+def test_deep_trie() -> None:
+    """Check that deep tries don't hit the recursion limit."""
+    x = "ab" * 5000
+    trie = depth_first_trie(x, x[:100])
+    assert trie == trie_from_sorted([x[:100], x])
+    assert trie != depth_first_trie(x[:-1])
+    assert len(trie.to_dot()) > 0
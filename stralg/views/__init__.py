@@ -6,3 +6,4 @@ Mapping strings to arrays of bytes with control over the alphabet.
 
 from .alphabet import Alphabet as Alphabet
 from .alphabet import String as String
+from .compare import shared_prefix_length as shared_prefix_length
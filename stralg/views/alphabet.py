@@ -71,6 +71,19 @@ class Alphabet:
         """Return the number of letters in the alphabet."""
         return len(self._map)
 
+    def __contains__(self, a: str) -> bool:
+        """Tell if a is a letter in the alphabet (the sentinel isn't)."""
+        return a != chr(0) and a in self._map
+
+    @property
+    def letters(self) -> str:
+        """
+        Return the letters in the alphabet, excluding the sentinel.
+
+        Alphabet(alpha.letters) recreates the alphabet.
+        """
+        return "".join(self._revmap[i] for i in range(1, len(self._revmap)))
+
     def encode(self, x: str, *, with_sentinel: bool) -> bytearray:
         """
         Map the characters in x to their corresponding letters in the alphabet.
@@ -14,3 +14,20 @@ def test_alphabet() -> None:
         assert len(y.alpha) == len(set(x)) + 1
         assert str(y[:-1]) == x
         assert str(y[0]) == x[0]
+
+
+def test_letters() -> None:
+    """Test that we can recreate an alphabet from its letters."""
+    alpha = Alphabet("mississippi")
+    assert alpha.letters == "imps"
+    assert Alphabet(alpha.letters).encode("sip", with_sentinel=True) == alpha.encode(
+        "sip", with_sentinel=True
+    )
+
+
+def test_contains() -> None:
+    """Test letter membership."""
+    alpha = Alphabet("mississippi")
+    assert "s" in alpha
+    assert "x" not in alpha
+    assert chr(0) not in alpha
@@ -0,0 +1,35 @@
+"""
+Comparing strings.
+"""
+
+
+def shared_prefix_length(x: memoryview, y: memoryview) -> int:
+    """
+    Get the length of the longest shared prefix of x and y.
+
+    Comparing slices runs in C, so rather than comparing one symbol at a
+    time in Python we compare blocks of doubling length until one
+    differs and then binary search for the mismatch inside it. The
+    first symbols are checked on their own since many edges are a single
+    symbol long, and most searches leave an edge at its first symbol.
+    """
+    n = min(len(x), len(y))
+    if n == 0 or x[0] != y[0]:
+        return 0
+    if n == 1:
+        return 1
+    i, block = 1, 8
+    while i < n:
+        k = min(block, n - i)
+        if x[i : i + k] == y[i : i + k]:
+            i, block = i + k, 2 * block
+            continue
+        # The mismatch is in x[i:i + k]
+        while k > 1:
+            half = k // 2
+            if x[i : i + half] == y[i : i + half]:
+                i, k = i + half, k - half
+            else:
+                k = half
+        return i
+    return n
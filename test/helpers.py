@@ -1,10 +1,12 @@
 """Helper functions for testing."""
 
 import random
-import string
 from collections.abc import Callable as Fn
 from collections.abc import Iterable, Iterator
 
+from stralg.generators import fibonacci_string as fibonacci_string
+from stralg.generators import random_string as random_string
+
 
 def collect_tests(tests: Iterable[tuple[str, Fn[..., None]]]) -> type:
     """Wrap a list of tests into a class that contains them."""
@@ -15,19 +17,6 @@ def collect_tests(tests: Iterable[tuple[str, Fn[..., None]]]) -> type:
     )
 
 
-def random_string(n: int, alpha: str = string.ascii_uppercase) -> str:
-    """Create a random string."""
-    return "".join(random.choices(alpha, k=n))
-
-
-def fibonacci_string(n: int) -> str:
-    """Fibonacci string n; has length Fib(n+2)."""
-    a, b = "a", "ab"
-    for _ in range(n):
-        a, b = b, a + b
-    return b
-
-
 def pick_random_patterns(x: str, n: int) -> Iterator[str]:
     """Pick a random pattern from a string."""
     for _ in range(n):
@@ -92,3 +81,27 @@ def check_equal_matches(x: str, p: str, *algos: Fn[[str, str], Iterator[int]]) -
     print("Iters:", iters)
     for res in zip(*iters, strict=True):  # type: ignore
         assert all(res[i] == res[0] for i in range(1, len(res)))
+
+
+def approximate_occurrences(x: str, p: str, k: int, edits: bool) -> dict[int, int]:
+    """Get the fewest errors for each position where p occurs with at most k."""
+    res: dict[int, int] = {}
+    for i in range(len(x)):
+        if not edits:
+            if i + len(p) <= len(x):
+                errors = sum(a != b for a, b in zip(p, x[i : i + len(p)]))
+                if errors <= k:
+                    res[i] = errors
+            continue
+        # Edit distance between prefixes of p and non-empty prefixes of x[i:]
+        col = list(range(len(p) + 1))
+        best = k + 1
+        for a in x[i : i + len(p) + k]:
+            new = [col[0] + 1]
+            for j, b in enumerate(p, 1):
+                new.append(min(col[j - 1] + (a != b), col[j] + 1, new[j - 1] + 1))
+            col = new
+            best = min(best, col[-1])
+        if best <= k:
+            res[i] = best
+    return res